@@ -1,22 +1,31 @@
 import streamlit as st
 import os
-import re
+import uuid
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, AIMessage
-from src.graph import app as graph_app
+load_dotenv()  # Antes do src.config, que lê as variáveis no import
 
-# ... imports ...
-import os
-import pandas as pd
+from src import config
+from src.config import BANCO_API_URL
+from src.inicializacao import inicializacao
+from src.logs import obter_logger
+from src.metricas import iniciar_servidor_metricas
+
+# Primeiro comando do Streamlit no script (antes de qualquer outro st.*)
+st.set_page_config(page_title="Banco Ágil - Atendimento IA", page_icon="🏦")
+
+log = obter_logger("app")
+iniciar_servidor_metricas()
 
 # --- [SOLUÇÃO] GARANTIR DADOS NO DEPLOY ---
 def garantir_dados():
-    if not os.path.exists("data"):
-        os.makedirs("data")
+    import pandas as pd
+
+    # Mesmos caminhos que o grafo lê (src/config.py, respeita BANCO_DATA_DIR)
+    os.makedirs(config.DATA_DIR, exist_ok=True)
     
     # Se o cliente.csv não existe, cria ele agora
-    if not os.path.exists("data/clientes.csv"):
-        print("⚠️ CSVs não encontrados. Criando base de dados inicial...")
+    if not os.path.exists(config.CLIENTES_CSV):
+        log.warning("CSVs não encontrados. Criando base de dados inicial...")
         
         # 1. Clientes
         data_clientes = {
@@ -27,7 +36,7 @@ def garantir_dados():
             "renda_mensal": [3000.0, 8000.0, 1500.0],
             "limite_atual": [1000.0, 5000.0, 200.0]
         }
-        pd.DataFrame(data_clientes).to_csv("data/clientes.csv", index=False)
+        pd.DataFrame(data_clientes).to_csv(config.CLIENTES_CSV, index=False)
 
         # 2. Score
         data_score = {
@@ -35,103 +44,96 @@ def garantir_dados():
             "score_max": [299, 499, 699, 899, 1000],
             "limite_maximo": [0.0, 500.0, 2000.0, 10000.0, 50000.0]
         }
-        pd.DataFrame(data_score).to_csv("data/score_limite.csv", index=False)
+        pd.DataFrame(data_score).to_csv(config.SCORE_CSV, index=False)
 
         # 3. Solicitações
         cols = ["cpf_cliente", "data_hora_solicitacao", "limite_atual", "novo_limite_solicitado", "status_pedido"]
-        pd.DataFrame(columns=cols).to_csv("data/solicitacoes_aumento_limite.csv", index=False)
+        pd.DataFrame(columns=cols).to_csv(config.SOLICITACOES_CSV, index=False)
         
-        print("✅ Base de dados recriada com sucesso!")
+        log.info("Base de dados recriada com sucesso")
+
+    # Cotações locais do Agente de Câmbio
+    if not os.path.exists(config.COTACOES_CSV):
+        data_cotacoes = {
+            "moeda": ["USD", "EUR", "GBP", "JPY", "ARS", "CAD", "CHF", "BTC"],
+            "base": ["BRL"] * 8,
+            "compra": [5.42, 5.89, 6.91, 0.0362, 0.0056, 3.93, 6.28, 352000.0],
+            "venda": [5.43, 5.90, 6.93, 0.0363, 0.0057, 3.94, 6.30, 354000.0],
+            "atualizado_em": ["2025-01-02 17:00:00"] * 8,
+        }
+        pd.DataFrame(data_cotacoes).to_csv(config.COTACOES_CSV, index=False)
 
-# Chama a função antes de qualquer coisa
-garantir_dados()
+    # Snapshot colunar dos clientes (refeito se o CSV for mais novo)
+    from src.snapshot_clientes import garantir_snapshot
+    garantir_snapshot(config.CLIENTES_CSV, config.CLIENTES_SNAPSHOT)
 
-load_dotenv()
+# Uma vez por processo (não a cada rerun do Streamlit): dados no lugar e aquecimento em background
+# (grafo, índice de clientes, tabela de score e clientes do LLM) enquanto a página já desenha.
+# No modo API os dados e o grafo ficam do lado do servidor.
+@st.cache_resource(show_spinner=False)
+def iniciar_processo():
+    if not BANCO_API_URL:
+        garantir_dados()
+        inicializacao.aquecer()
+    return inicializacao
+
+iniciar_processo()
 
-st.set_page_config(page_title="Banco Ágil - Atendimento IA", page_icon="🏦")
 st.title("🏦 Banco Ágil - Atendimento Inteligente")
 st.markdown("---")
 
-# --- MEMÓRIA DO STREAMLIT ---
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
-if "autenticado" not in st.session_state:
-    st.session_state.autenticado = False
-
-if "cpf" not in st.session_state:
-    st.session_state.cpf = None
+# --- SESSÃO (thread_id do checkpointer) ---
+# O estado da conversa fica no checkpointer do grafo (SQLite), não na memória do Streamlit.
+# O id da sessão vai na URL (?sessao=...), então a conversa sobrevive a um restart do servidor.
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = st.query_params.get("sessao") or uuid.uuid4().hex
+    st.query_params["sessao"] = st.session_state.thread_id
 
-if "ultimo_agente" not in st.session_state:
-    st.session_state.ultimo_agente = None
+# Com BANCO_API_URL o Streamlit é só interface: o grafo roda na API (src/servico.py)
+@st.cache_resource
+def obter_atendimento():
+    from src.atendimento import AtendimentoLocal, AtendimentoRemoto
+    return AtendimentoRemoto(BANCO_API_URL) if BANCO_API_URL else AtendimentoLocal()
 
-if "tentativas" not in st.session_state:
-    st.session_state.tentativas = 0
+atendimento = obter_atendimento()
+sessao = st.session_state.thread_id
 
-# Mostra histórico
-for msg in st.session_state.messages:
-    if isinstance(msg, HumanMessage):
-        with st.chat_message("user"):
-            st.markdown(msg.content)
-    elif isinstance(msg, AIMessage):
-        with st.chat_message("assistant"):
-            st.markdown(msg.content)
+# Mostra histórico (só falas do usuário e respostas finais do robô)
+for msg in atendimento.historico(sessao):
+    with st.chat_message(msg["papel"]):
+        st.markdown(msg["conteudo"].replace("$", " "))
 
 # Input do usuário
 if prompt := st.chat_input("Digite sua mensagem..."):
+    inicio_turno = inicializacao.relogio()
     st.chat_message("user").markdown(prompt)
-    st.session_state.messages.append(HumanMessage(content=prompt))
-    
-    # --- [LÓGICA NOVA] CAPTURAR CPF ---
-    # Se ainda não logou e o usuário digitou 11 números, assumimos que é o CPF.
-    if not st.session_state.autenticado:
-        # Remove tudo que não é número
-        apenas_numeros = re.sub(r'\D', '', prompt)
-        if len(apenas_numeros) == 11:
-            st.session_state.cpf = apenas_numeros
-            # Dica: Em um app real, validaríamos mais coisas, mas aqui serve!
 
     with st.chat_message("assistant"):
+        status = st.status("⏳ Processando...", expanded=False)
         message_placeholder = st.empty()
-        message_placeholder.markdown("⏳ *Processando...*")
         full_response = ""
         
-        # PREPARA O INPUT PARA O GRAFO
-        inputs = {
-            "messages": st.session_state.messages,
-            "autenticado": st.session_state.autenticado,
-            "cpf": st.session_state.cpf ,
-            "ultimo_agente": st.session_state.ultimo_agente,
-            "tentativas_falhas": st.session_state.tentativas #Envia contagem atual
-        }
-        
         try:
-            output = graph_app.invoke(inputs, config={"recursion_limit": 50})
-            
-            if "ultimo_agente" in output:
-                novo_agente = output["ultimo_agente"]
-                # Só atualizamos se vier algo válido (não vazio)
-                if novo_agente:
-                    st.session_state.ultimo_agente = novo_agente
-                    print(f"MEMÓRIA ATUALIZADA: Fixado em -> {novo_agente}")
-
-                # [NOVO] Pega a contagem atualizada do robô
-                if "tentativas_falhas" in output:
-                    st.session_state.tentativas = output["tentativas_falhas"]
-
-            ultima_msg = output["messages"][-1]
-            full_response = ultima_msg.content
+            # Tokens chegam enquanto o LLM escreve; "etapa" avisa de tools e troca de agente
+            for evento in atendimento.turno(sessao, prompt):
+                if evento["tipo"] == "token":
+                    full_response = evento["conteudo"] if evento["reiniciar"] else full_response + evento["conteudo"]
+                    message_placeholder.markdown(full_response.replace("$", " ") + "▌")
+                elif evento["tipo"] == "etapa":
+                    status.update(label=evento["rotulo"])
+                elif evento["tipo"] == "erro":
+                    raise RuntimeError(evento["msg"])
+                elif evento["tipo"] == "fim":
+                    full_response = evento["resposta"]
+                    inicializacao.registrar_primeira_resposta(inicio_turno)
+                    if evento.get("ultimo_agente"):
+                        log.info("Memória atualizada", extra={"campos": {"ultimo_agente": evento["ultimo_agente"]}})
 
             full_response = full_response.replace("$", " ")
-            
-            # Verifica se autenticou
-            if "autenticado" in full_response.lower() or "bem-vindo" in full_response.lower() or "prazer" in full_response.lower():
-                 st.session_state.autenticado = True
-            
             message_placeholder.markdown(full_response)
+            status.update(label="✅ Concluído", state="complete")
             
         except Exception as e:
+            status.update(label="❌ Erro", state="error")
             st.error(f"Erro no sistema: {e}")
             full_response = "Desculpe, tive um erro interno."
-
-    st.session_state.messages.append(AIMessage(content=full_response))
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Carga HTTP na API (src/servico.py): reproduz bench/conversas.json com várias sessões
+simultâneas e mede latência por turno e vazão, sem a interface.
+
+    BANCO_DATA_DIR=/tmp/dados_bench uvicorn bench.servico_falso:api --port 8000 --workers 4
+    python -m bench.api --url http://localhost:8000 --clientes-csv /tmp/dados_bench/clientes.csv --conversas 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+import httpx
+import pandas as pd
+
+from bench.medicao import percentis
+
+PASTA_BENCH = os.path.dirname(os.path.abspath(__file__))
+
+
+async def aexecutar_conversa(cliente_http, conversa, cliente, tempos, erros, semaforo):
+    async with semaforo:
+        sessao = uuid.uuid4().hex
+        for modelo in conversa["turnos"]:
+            inicio = time.perf_counter()
+            try:
+                resposta = await cliente_http.post(f"/sessoes/{sessao}/mensagens", json={"texto": modelo.format(**cliente)})
+                resposta.raise_for_status()
+            except httpx.HTTPError as e:
+                erros.append(f"{conversa['nome']}: {e}")
+                return
+            tempos.append(time.perf_counter() - inicio)
+
+
+async def rodar(args, plano):
+    tempos, erros = [], []
+    semaforo = asyncio.Semaphore(args.concorrencia)
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    async with httpx.AsyncClient(base_url=args.url, timeout=120, limits=limites) as cliente_http:
+        inicio = time.perf_counter()
+        await asyncio.gather(*(aexecutar_conversa(cliente_http, c, cli, tempos, erros, semaforo) for c, cli in plano))
+        segundos = time.perf_counter() - inicio
+    return {
+        "turnos": len(tempos),
+        "erros": len(erros),
+        "segundos": round(segundos, 3),
+        "turnos_por_segundo": round(len(tempos) / segundos, 2) if segundos else 0.0,
+        "latencia_turno": percentis(tempos),
+    }, erros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga HTTP da API do Banco Ágil.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clientes-csv", default=os.path.join(os.path.dirname(PASTA_BENCH), "data", "clientes.csv"),
+                        help="O mesmo clientes.csv que a API usa (de onde saem os CPFs das conversas).")
+    parser.add_argument("--conversas", type=int, default=100)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--roteiro", default=os.path.join(PASTA_BENCH, "conversas.json"))
+    parser.add_argument("--json", help="Grava o resumo em JSON nesse caminho.")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(args.roteiro, encoding="utf-8") as f:
+        conversas = json.load(f)
+    df = pd.read_csv(args.clientes_csv, dtype=str, nrows=1000)
+    clientes = [{"cpf": linha.cpf, "nascimento": linha.data_nascimento} for linha in df.itertuples(index=False)]
+    rng = random.Random(args.semente)
+    plano = [(conversas[i % len(conversas)], rng.choice(clientes)) for i in range(args.conversas)]
+
+    resumo, erros = asyncio.run(rodar(args, plano))
+    for erro in erros[:5]:
+        print(f"❌ {erro}")
+    lat = resumo["latencia_turno"]
+    print(f"\n📊 {resumo['turnos']} turnos em {resumo['segundos']}s -> {resumo['turnos_por_segundo']} turnos/s "
+          f"({resumo['erros']} erros)")
+    if lat.get("n"):
+        print(f"   Turno: p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**resumo, "parametros": vars(args)}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Teste de carga do grafo inteiro com LLM e câmbio falsos (não chama a OpenAI).
+Reproduz as conversas de bench/conversas.json em paralelo e mede latência por nó,
+hops por turno, tempo das tools e vazão.
+
+    python -m bench.carga --conversas 200 --concorrencia 16 --latencia-llm 0.05
+    python -m bench.carga --modo async --concorrencia 64 --json resultado.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from bench.gerar_clientes import garantir_fixture
+from bench.medicao import ColetorTurno, Relatorio, imprimir_resumo
+
+PASTA_BENCH = os.path.dirname(os.path.abspath(__file__))
+PASTA_DADOS_REPO = os.path.join(os.path.dirname(PASTA_BENCH), "data")
+
+
+def preparar_dados(pasta: str, linhas_clientes: int, pasta_fixtures: str) -> str:
+    """Pasta de dados isolada: fixture de clientes + política e cotações do repositório."""
+    os.makedirs(pasta, exist_ok=True)
+    shutil.copy(garantir_fixture(pasta_fixtures, linhas_clientes), os.path.join(pasta, "clientes.csv"))
+    for arquivo in ("score_limite.csv", "cotacoes.csv"):
+        shutil.copy(os.path.join(PASTA_DADOS_REPO, arquivo), os.path.join(pasta, arquivo))
+    return pasta
+
+
+def carregar_clientes(pasta: str, quantidade: int = 1000):
+    df = pd.read_csv(os.path.join(pasta, "clientes.csv"), dtype=str, nrows=quantidade)
+    return [{"cpf": linha.cpf, "nascimento": linha.data_nascimento} for linha in df.itertuples(index=False)]
+
+
+def entrada_do_turno(texto: str) -> dict:
+    """Mesma entrada que o app.py monta (o login é gravado pelo próprio grafo)."""
+    from src.atendimento import montar_entrada
+    return montar_entrada(texto)
+
+
+# --- Execução síncrona (um thread por conversa simultânea) ---
+def executar_conversa(app, config_sessao, conversa, cliente, relatorio):
+    config = config_sessao(uuid.uuid4().hex, recursion_limit=50)
+    for modelo in conversa["turnos"]:
+        coletor = ColetorTurno()
+        inicio = time.perf_counter()
+        try:
+            app.invoke(entrada_do_turno(modelo.format(**cliente)), config={**config, "callbacks": [coletor]})
+        except Exception as e:
+            relatorio.registrar_erro()
+            print(f"❌ {conversa['nome']}: {e}")
+            return
+        relatorio.registrar_turno(time.perf_counter() - inicio, coletor)
+
+
+def rodar_sync(app, config_sessao, plano, concorrencia, relatorio):
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        futuros = [executor.submit(executar_conversa, app, config_sessao, c, cli, relatorio) for c, cli in plano]
+        for futuro in futuros:
+            futuro.result()
+
+
+# --- Execução assíncrona (um event loop, várias conversas ao mesmo tempo) ---
+async def aexecutar_conversa(app, config_sessao, conversa, cliente, relatorio, semaforo):
+    async with semaforo:
+        config = config_sessao(uuid.uuid4().hex, recursion_limit=50)
+        for modelo in conversa["turnos"]:
+            coletor = ColetorTurno()
+            inicio = time.perf_counter()
+            try:
+                await app.ainvoke(entrada_do_turno(modelo.format(**cliente)), config={**config, "callbacks": [coletor]})
+            except Exception as e:
+                relatorio.registrar_erro()
+                print(f"❌ {conversa['nome']}: {e}")
+                return
+            relatorio.registrar_turno(time.perf_counter() - inicio, coletor)
+
+
+async def rodar_async(grafo, plano, concorrencia, relatorio):
+    app = await grafo.obter_app_async()
+    semaforo = asyncio.Semaphore(concorrencia)
+    try:
+        await asyncio.gather(*(aexecutar_conversa(app, grafo.config_sessao, c, cli, relatorio, semaforo) for c, cli in plano))
+    finally:
+        await grafo.fechar_app_async()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do grafo com LLM falso.")
+    parser.add_argument("--conversas", type=int, default=100, help="Quantas conversas reproduzir no total.")
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--modo", choices=["sync", "async"], default="sync")
+    parser.add_argument("--latencia-llm", type=float, default=0.0, help="Segundos simulados por chamada ao LLM.")
+    parser.add_argument("--latencia-cambio", type=float, default=0.0, help="Segundos simulados por consulta de câmbio.")
+    parser.add_argument("--clientes", type=int, default=1000, help="Linhas da fixture clientes.csv.")
+    parser.add_argument("--roteiro", default=os.path.join(PASTA_BENCH, "conversas.json"))
+    parser.add_argument("--fixtures", default=os.path.join(PASTA_BENCH, "fixtures"))
+    parser.add_argument("--sem-cache", action="store_true", help="Desliga o cache de respostas do LLM.")
+    parser.add_argument("--json", help="Grava o resumo em JSON nesse caminho.")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--verboso", action="store_true", help="Mantém os logs dos nós durante a carga.")
+    args = parser.parse_args()
+
+    # O src lê a configuração no import: pasta de dados isolada antes de importar o grafo
+    pasta_dados = preparar_dados(tempfile.mkdtemp(prefix="banco_bench_"), args.clientes, args.fixtures)
+    os.environ["BANCO_DATA_DIR"] = pasta_dados
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("COTACOES_PROVEDOR", "arquivo")
+    if args.sem_cache:
+        os.environ["CACHE_LLM_ATIVO"] = "0"
+    if not args.verboso:
+        os.environ["LOG_NIVEL"] = "WARNING"
+
+    import src.graph as grafo
+    import src.nodes as nodes
+    from bench.llm_falso import ChatFalso, ProvedorCotacoesFalso
+    from src.cambio import cache_cotacoes
+
+    nodes.runnables.configurar(ChatFalso(latencia=args.latencia_llm), ChatFalso(latencia=args.latencia_llm))
+    cache_cotacoes.provedor = ProvedorCotacoesFalso(args.latencia_cambio)
+
+    with open(args.roteiro, encoding="utf-8") as f:
+        conversas = json.load(f)
+    rng = random.Random(args.semente)
+    clientes = carregar_clientes(pasta_dados)
+    plano = [(conversas[i % len(conversas)], rng.choice(clientes)) for i in range(args.conversas)]
+
+    relatorio = Relatorio()
+    saida = contextlib.nullcontext() if args.verboso else contextlib.redirect_stdout(io.StringIO())
+    inicio = time.perf_counter()
+    with saida:
+        if args.modo == "async":
+            asyncio.run(rodar_async(grafo, plano, args.concorrencia, relatorio))
+        else:
+            rodar_sync(grafo.obter_app(), grafo.config_sessao, plano, args.concorrencia, relatorio)
+    resumo = relatorio.resumo(time.perf_counter() - inicio)
+    resumo["parametros"] = vars(args)
+
+    imprimir_resumo(resumo)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resumo, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(pasta_dados, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Bench dos caminhos de dados das tools por tamanho de base (clientes.csv de 1k a 10M linhas):
+carga + indexação, buscas/autenticações e as tools de crédito de ponta a ponta, lendo o CSV
+ou o snapshot colunar com mmap (src/snapshot_clientes.py).
+
+    python -m bench.dados --linhas 1000 100000 1000000
+    python -m bench.dados --linhas 10000000 --operacoes 20000 --formatos snapshot
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from bench.gerar_clientes import garantir_fixture
+from bench.medicao import percentis
+
+PASTA_BENCH = os.path.dirname(os.path.abspath(__file__))
+PASTA_DADOS_REPO = os.path.join(os.path.dirname(PASTA_BENCH), "data")
+
+
+def _cronometrar(funcao, argumentos):
+    tempos = []
+    for args in argumentos:
+        inicio = time.perf_counter()
+        funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return percentis(tempos)
+
+
+def medir_tamanho(caminho: str, operacoes: int, rng: random.Random, formato: str = "csv") -> dict:
+    from src import tools
+    from src.armazenamento import ArmazemClientes
+    from src.config import DATA_DIR
+    from src.repositorio import RepositorioClientes
+    from src.snapshot_clientes import exportar_snapshot
+
+    armazem = ArmazemClientes(os.path.join(DATA_DIR, f"alteracoes_{os.path.basename(caminho)}.db"))
+    exportacao = None
+    pasta = None
+    if formato == "snapshot":
+        pasta = os.path.join(DATA_DIR, f"snapshot_{os.path.basename(caminho)}")
+        inicio = time.perf_counter()
+        exportar_snapshot(caminho, pasta)
+        exportacao = round(time.perf_counter() - inicio, 3)
+    repositorio = RepositorioClientes(caminho, armazem=armazem, pasta_snapshot=pasta)
+
+    inicio = time.perf_counter()
+    indice = repositorio.obter()
+    carga = time.perf_counter() - inicio
+
+    amostra = pd.read_csv(caminho, dtype=str, usecols=["cpf", "data_nascimento"],
+                          skiprows=lambda i: i > 0 and rng.random() > min(1.0, 5 * operacoes / len(indice)))
+    clientes = list(amostra.itertuples(index=False))
+    sorteados = [rng.choice(clientes) for _ in range(operacoes)]
+
+    # As tools usam o repositório e o armazém do módulo: aponta para a base deste tamanho
+    tools.repositorio_clientes, tools.armazem_clientes = repositorio, armazem
+    resultado = {
+        "formato": formato,
+        "linhas": len(indice),
+        "exportacao_s": exportacao,
+        "carga_s": round(carga, 3),
+        "buscar": _cronometrar(repositorio.buscar, [(c.cpf,) for c in sorteados]),
+        "buscar_inexistente": _cronometrar(repositorio.buscar, [("00000000000",)] * operacoes),
+        "autenticar": _cronometrar(repositorio.autenticar, [(c.cpf, c.data_nascimento) for c in sorteados]),
+        "tool_validar_cpf": _cronometrar(tools.validar_cpf.invoke,
+                                         [({"cpf": c.cpf, "data_nascimento": c.data_nascimento},) for c in sorteados]),
+        "tool_consultar_limite": _cronometrar(tools.consultar_limite.invoke, [({"cpf": c.cpf},) for c in sorteados]),
+        "tool_solicitar_aumento": _cronometrar(tools.solicitar_aumento_limite.invoke,
+                                               [({"cpf": c.cpf, "novo_limite": 3000.0},) for c in sorteados]),
+    }
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bench dos caminhos de CSV das tools por tamanho de base.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--operacoes", type=int, default=2000, help="Chamadas medidas por operação.")
+    parser.add_argument("--fixtures", default=os.path.join(PASTA_BENCH, "fixtures"))
+    parser.add_argument("--json", help="Grava os resultados em JSON nesse caminho.")
+    parser.add_argument("--formatos", nargs="+", choices=["csv", "snapshot"], default=["csv", "snapshot"])
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    # Log de solicitações e SQLite vão para uma pasta temporária, nunca para data/
+    pasta_dados = tempfile.mkdtemp(prefix="banco_bench_dados_")
+    shutil.copy(os.path.join(PASTA_DADOS_REPO, "score_limite.csv"), pasta_dados)
+    os.environ["BANCO_DATA_DIR"] = pasta_dados
+
+    rng = random.Random(args.semente)
+    resultados = []
+    for linhas in args.linhas:
+        inicio = time.perf_counter()
+        caminho = garantir_fixture(args.fixtures, linhas)
+        print(f"📁 {caminho} pronto em {time.perf_counter() - inicio:.1f}s")
+        for formato in args.formatos:
+            r = medir_tamanho(caminho, args.operacoes, rng, formato)
+            resultados.append(r)
+            exportacao = f" (exportação {r['exportacao_s']}s)" if r["exportacao_s"] is not None else ""
+            print(f"   [{formato}] carga+índice: {r['carga_s']}s{exportacao}")
+            for chave in ("buscar", "buscar_inexistente", "autenticar", "tool_validar_cpf",
+                          "tool_consultar_limite", "tool_solicitar_aumento"):
+                p = r[chave]
+                print(f"   [{formato}] {chave:<24} p50={p['p50_ms']}ms p99={p['p99_ms']}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    shutil.rmtree(pasta_dados, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Gera bases sintéticas de clientes (mesmas colunas do data/clientes.csv) para o bench.
+
+    python -m bench.gerar_clientes --linhas 1000 100000 1000000 --saida bench/fixtures
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+NOMES = np.array(["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique",
+                  "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael"])
+SOBRENOMES = np.array(["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Ferreira",
+                       "Almeida", "Ribeiro", "Carvalho", "Gomes", "Martins", "Rocha", "Barbosa", "Dias"])
+
+# Passo coprimo com 10^9: a sequência (inicio + i * passo) % 10^9 não repete nos primeiros 10^9 valores
+PASSO_CPF = 387_420_489  # 3^18
+INICIO_CPF = 123_456_789  # Evita começar em 000.000.000-00
+LINHAS_POR_BLOCO = 1_000_000
+
+
+def cpfs_validos(inicio: int, quantidade: int, semente: int = 0) -> np.ndarray:
+    """CPFs únicos e com dígitos verificadores corretos, gerados de forma vetorizada."""
+    posicoes = np.arange(inicio, inicio + quantidade, dtype=np.int64)
+    base = (INICIO_CPF + semente + posicoes * PASSO_CPF) % 1_000_000_000
+
+    digitos = np.zeros((quantidade, 11), dtype=np.int64)
+    for i in range(9):
+        digitos[:, 8 - i] = (base // 10 ** i) % 10
+    for posicao in (9, 10):
+        pesos = np.arange(posicao + 1, 1, -1)
+        resto = (digitos[:, :posicao] * pesos).sum(axis=1) * 10 % 11
+        digitos[:, posicao] = np.where(resto == 10, 0, resto)
+
+    numero = base * 100 + digitos[:, 9] * 10 + digitos[:, 10]
+    return pd.Series(numero).astype(str).str.zfill(11).to_numpy()
+
+
+def gerar_bloco(inicio: int, quantidade: int, semente: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(semente + inicio)
+    nascimento = np.datetime64("1950-01-01") + rng.integers(0, 55 * 365, quantidade).astype("timedelta64[D]")
+    score = rng.integers(0, 1001, quantidade)
+    renda = np.round(rng.lognormal(8.3, 0.6, quantidade), 2)
+    return pd.DataFrame({
+        "cpf": cpfs_validos(inicio, quantidade, semente),
+        "nome": np.char.add(np.char.add(rng.choice(NOMES, quantidade), " "), rng.choice(SOBRENOMES, quantidade)),
+        "data_nascimento": np.datetime_as_string(nascimento, unit="D"),
+        "score_atual": score,
+        "renda_mensal": renda,
+        "limite_atual": np.round(renda * rng.uniform(0.1, 1.5, quantidade), 0),
+    })
+
+
+def gerar_clientes(caminho: str, linhas: int, semente: int = 0) -> str:
+    """Grava o CSV em blocos (10M linhas sem estourar memória)."""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temporario = caminho + ".tmp"
+    for inicio in range(0, linhas, LINHAS_POR_BLOCO):
+        bloco = gerar_bloco(inicio, min(LINHAS_POR_BLOCO, linhas - inicio), semente)
+        bloco.to_csv(temporario, mode="w" if inicio == 0 else "a", header=inicio == 0, index=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def caminho_fixture(pasta: str, linhas: int) -> str:
+    return os.path.join(pasta, f"clientes_{linhas}.csv")
+
+
+def garantir_fixture(pasta: str, linhas: int, semente: int = 0) -> str:
+    """Reaproveita a fixture se ela já existe (gerar 10M linhas leva um tempo)."""
+    caminho = caminho_fixture(pasta, linhas)
+    if not os.path.exists(caminho):
+        gerar_clientes(caminho, linhas, semente)
+    return caminho
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera clientes.csv sintéticos para o bench.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--saida", default=os.path.join(os.path.dirname(__file__), "fixtures"))
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    for linhas in args.linhas:
+        inicio = time.perf_counter()
+        caminho = gerar_clientes(caminho_fixture(args.saida, linhas), linhas, args.semente)
+        print(f"✅ {caminho}: {linhas} linhas em {time.perf_counter() - inicio:.1f}s")
@@ -0,0 +1,121 @@
+"""
+Modelo de chat falso para o bench: responde por regras (sem rede) imitando o que o
+gpt-4.1-mini faz em cada nó, com latência simulada configurável.
+"""
+import asyncio
+import itertools
+import json
+import re
+import time
+from typing import List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.cambio import APELIDOS_MOEDA, Cotacao, ProvedorCotacoes
+from src.roteador import classificar_intencao, normalizar_texto
+
+_PADRAO_CPF = re.compile(r"\d{3}\.?\d{3}\.?\d{3}-?\d{2}")
+_PADRAO_DATA = re.compile(r"\d{4}-\d{2}-\d{2}")
+_PADRAO_VALOR = re.compile(r"\d+(?:[.,]\d+)?")
+_ids = itertools.count()
+
+
+def _nome_ferramenta(ferramenta) -> str:
+    return getattr(ferramenta, "name", None) or ferramenta.__name__
+
+
+def _resumo_tool(conteudo) -> str:
+    """Resultado de tool em uma frase (as tools de dict trazem a frase em 'msg')."""
+    try:
+        dados = json.loads(conteudo)
+    except (TypeError, ValueError):
+        return str(conteudo)[:200]
+    if isinstance(dados, dict) and "msg" in dados:
+        return str(dados["msg"])
+    return str(conteudo)[:200]
+
+
+class ChatFalso(BaseChatModel):
+    """
+    Decide a resposta olhando o prompt de sistema, as tools vinculadas e a última mensagem:
+    - depois de um ToolMessage responde em texto;
+    - com tools vinculadas, chama a tool que o agente de verdade chamaria;
+    - sem prompt de sistema (classificador), devolve a intenção em uma palavra.
+    """
+
+    latencia: float = 0.0
+    ferramentas: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "chat-falso"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"ferramentas": [_nome_ferramenta(t) for t in tools]})
+
+    def _chamada(self, nome, args) -> AIMessage:
+        return AIMessage(content="", tool_calls=[{"name": nome, "args": args, "id": f"falso_{next(_ids)}"}])
+
+    def _responder(self, mensagens) -> AIMessage:
+        sistema = mensagens[0].content if isinstance(mensagens[0], SystemMessage) else ""
+        ultima = mensagens[-1]
+
+        if not sistema:
+            achado = re.search(r'USUÁRIO disse: "(.*)"', ultima.content)
+            decisao = classificar_intencao(achado.group(1) if achado else ultima.content)
+            return AIMessage(content=(decisao.intencao if decisao else "credito").upper())
+
+        if isinstance(ultima, ToolMessage):
+            return AIMessage(content=f"Prontinho! {_resumo_tool(ultima.content)}")
+
+        texto = str(ultima.content)
+        normalizado = normalizar_texto(texto)
+
+        if "validar_cpf" in self.ferramentas:
+            cpf, data = _PADRAO_CPF.search(texto), _PADRAO_DATA.search(texto)
+            if cpf and data:
+                return self._chamada("validar_cpf", {"cpf": cpf.group(), "data_nascimento": data.group()})
+            return AIMessage(content="Para validar, preciso do seu CPF e da data de nascimento (AAAA-MM-DD).")
+
+        cpf_sessao = re.search(r"CPF: (\d+)", sistema)
+        if "solicitar_aumento_limite" in self.ferramentas and cpf_sessao:
+            valor = _PADRAO_VALOR.search(texto)
+            if "aumento" in normalizado and valor:
+                return self._chamada("solicitar_aumento_limite",
+                                     {"cpf": cpf_sessao.group(1), "novo_limite": float(valor.group().replace(",", "."))})
+            if "pedido" in normalizado or "historico" in normalizado:
+                return self._chamada("consultar_historico_solicitacoes", {"cpf": cpf_sessao.group(1)})
+            if "limite" in normalizado or "score" in normalizado:
+                return self._chamada("consultar_limite", {"cpf": cpf_sessao.group(1)})
+
+        if "consultar_cotacao" in self.ferramentas:
+            moeda = next((m for apelido, m in APELIDOS_MOEDA.items() if apelido in normalizado), "USD")
+            return self._chamada("consultar_cotacao", {"moeda": moeda})
+
+        return AIMessage(content="Olá! Sou a Bia do Banco Ágil. Como posso ajudar?")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latencia:
+            time.sleep(self.latencia)
+        return ChatResult(generations=[ChatGeneration(message=self._responder(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+        return ChatResult(generations=[ChatGeneration(message=self._responder(messages))])
+
+
+class ProvedorCotacoesFalso(ProvedorCotacoes):
+    """Substitui a consulta de câmbio ao vivo: cotação fixa com latência simulada."""
+
+    nome = "falso"
+
+    def __init__(self, latencia: float = 0.0):
+        self.latencia = latencia
+
+    def cotar(self, moeda, base):
+        if self.latencia:
+            time.sleep(self.latencia)
+        return Cotacao(moeda, base, 5.0, 5.01, "2025-01-02 17:00:00", self.nome)
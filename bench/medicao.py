@@ -0,0 +1,142 @@
+"""Coleta de tempos do grafo (via callbacks do LangChain) e resumo em percentis."""
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def percentis(valores) -> dict:
+    if not valores:
+        return {"n": 0}
+    ms = np.asarray(valores) * 1000
+    return {
+        "n": len(ms),
+        "media_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+class ColetorTurno(BaseCallbackHandler):
+    """
+    Um coletor por turno: duração de cada nó (hops), de cada tool e de cada chamada ao LLM.
+    run_inline=True para medir também no grafo async sem mandar os callbacks para outra thread.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self._abertos = {}
+        self.nos = []     # (nó, segundos)
+        self.tools = []   # (tool, segundos)
+        self.llm = []     # (nó, segundos)
+
+    def _abrir(self, run_id, tipo, nome):
+        self._abertos[run_id] = (tipo, nome, time.perf_counter())
+
+    def _fechar(self, run_id):
+        aberto = self._abertos.pop(run_id, None)
+        if aberto is None:
+            return
+        tipo, nome, inicio = aberto
+        getattr(self, tipo).append((nome, time.perf_counter() - inicio))
+
+    # Só o runnable do próprio nó (name == langgraph_node); roteadores e sub-runnables ficam de fora
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        no = (metadata or {}).get("langgraph_node")
+        pai = self._abertos.get(parent_run_id)
+        # O LangGraph embrulha o nó numa sequência de mesmo nome: conta só a execução mais externa
+        if no and kwargs.get("name") == no and not (pai and pai[0] == "nos"):
+            self._abrir(run_id, "nos", no)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._abrir(run_id, "tools", kwargs.get("name") or (serialized or {}).get("name", "?"))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._abrir(run_id, "llm", (metadata or {}).get("langgraph_node", "?"))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._fechar(run_id)
+
+
+class Relatorio:
+    """Junta os coletores de todos os turnos (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turnos = []
+        self.hops = []
+        self.chamadas_llm = []
+        self.erros = 0
+        self.por_no = defaultdict(list)
+        self.por_tool = defaultdict(list)
+        self.llm_por_no = defaultdict(list)
+
+    def registrar_turno(self, segundos: float, coletor: ColetorTurno):
+        with self._lock:
+            self.turnos.append(segundos)
+            self.hops.append(len(coletor.nos))
+            self.chamadas_llm.append(len(coletor.llm))
+            for no, duracao in coletor.nos:
+                self.por_no[no].append(duracao)
+            for tool, duracao in coletor.tools:
+                self.por_tool[tool].append(duracao)
+            for no, duracao in coletor.llm:
+                self.llm_por_no[no].append(duracao)
+
+    def registrar_erro(self):
+        with self._lock:
+            self.erros += 1
+
+    def resumo(self, segundos_totais: float) -> dict:
+        with self._lock:
+            return {
+                "turnos": len(self.turnos),
+                "erros": self.erros,
+                "segundos": round(segundos_totais, 3),
+                "turnos_por_segundo": round(len(self.turnos) / segundos_totais, 2) if segundos_totais else 0.0,
+                "latencia_turno": percentis(self.turnos),
+                "hops_por_turno": {
+                    "media": round(float(np.mean(self.hops)), 2) if self.hops else 0.0,
+                    "max": int(max(self.hops, default=0)),
+                },
+                "llm_por_turno": round(float(np.mean(self.chamadas_llm)), 2) if self.chamadas_llm else 0.0,
+                "nos": {no: percentis(v) for no, v in sorted(self.por_no.items())},
+                "tools": {tool: percentis(v) for tool, v in sorted(self.por_tool.items())},
+                "llm": {no: percentis(v) for no, v in sorted(self.llm_por_no.items())},
+            }
+
+
+def imprimir_resumo(resumo: dict):
+    print(f"\n📊 {resumo['turnos']} turnos em {resumo['segundos']}s "
+          f"-> {resumo['turnos_por_segundo']} turnos/s ({resumo['erros']} erros)")
+    lat = resumo["latencia_turno"]
+    if lat.get("n"):
+        print(f"   Turno: p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms")
+    print(f"   Hops por turno: média {resumo['hops_por_turno']['media']} (máx {resumo['hops_por_turno']['max']}), "
+          f"chamadas ao LLM por turno: {resumo['llm_por_turno']}")
+    for titulo, chave in (("Nós", "nos"), ("Tools (I/O)", "tools"), ("LLM por nó", "llm")):
+        if not resumo[chave]:
+            continue
+        print(f"   {titulo}:")
+        for nome, p in resumo[chave].items():
+            print(f"     {nome:<28} n={p['n']:<6} p50={p['p50_ms']:<9} p95={p['p95_ms']:<9} p99={p['p99_ms']}")
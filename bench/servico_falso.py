@@ -0,0 +1,19 @@
+"""
+A API de src/servico.py com o LLM e o câmbio falsos, para medir a vazão do serviço sem a OpenAI:
+
+    BANCO_DATA_DIR=/tmp/dados_bench uvicorn bench.servico_falso:api --port 8000 --workers 4
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("COTACOES_PROVEDOR", "arquivo")
+
+from bench.llm_falso import ChatFalso, ProvedorCotacoesFalso
+from src import nodes
+from src.cambio import cache_cotacoes
+from src.servico import api  # noqa: F401  (reexportado para o uvicorn)
+
+LATENCIA_LLM = float(os.getenv("BENCH_LATENCIA_LLM", "0"))
+
+nodes.runnables.configurar(ChatFalso(latencia=LATENCIA_LLM), ChatFalso(latencia=LATENCIA_LLM))
+cache_cotacoes.provedor = ProvedorCotacoesFalso(float(os.getenv("BENCH_LATENCIA_CAMBIO", "0")))
@@ -18,6 +18,11 @@ df_clientes = pd.DataFrame(data_clientes)
 df_clientes.to_csv("data/clientes.csv", index=False)
 print("✅ data/clientes.csv criado.")
 
+# Snapshot colunar (mmap) que as tools leem no lugar do CSV
+from src.snapshot_clientes import exportar_snapshot
+exportar_snapshot("data/clientes.csv", "data/clientes_snapshot")
+print("✅ data/clientes_snapshot/ criado.")
+
 # 2. Criar score_limite.csv
 # Tabela para definir se o score permite X limite
 data_score = {
@@ -33,4 +38,16 @@ print("✅ data/score_limite.csv criado.")
 colunas_solicitacao = ["cpf_cliente", "data_hora_solicitacao", "limite_atual", "novo_limite_solicitado", "status_pedido"]
 df_solicitacoes = pd.DataFrame(columns=colunas_solicitacao)
 df_solicitacoes.to_csv("data/solicitacoes_aumento_limite.csv", index=False)
-print("✅ data/solicitacoes_aumento_limite.csv criado.")
\ No newline at end of file
+print("✅ data/solicitacoes_aumento_limite.csv criado.")
+
+# 4. Criar cotacoes.csv (fonte local do Agente de Câmbio)
+data_cotacoes = {
+    "moeda": ["USD", "EUR", "GBP", "JPY", "ARS", "CAD", "CHF", "BTC"],
+    "base": ["BRL"] * 8,
+    "compra": [5.42, 5.89, 6.91, 0.0362, 0.0056, 3.93, 6.28, 352000.0],
+    "venda": [5.43, 5.90, 6.93, 0.0363, 0.0057, 3.94, 6.30, 354000.0],
+    "atualizado_em": ["2025-01-02 17:00:00"] * 8,
+}
+df_cotacoes = pd.DataFrame(data_cotacoes)
+df_cotacoes.to_csv("data/cotacoes.csv", index=False)
+print("✅ data/cotacoes.csv criado.")
@@ -0,0 +1,200 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from src.config import CLIENTES_CSV, CLIENTES_DB, CLIENTES_SNAPSHOT
+
+
+def normalizar_cpf(cpf) -> str:
+    return str(cpf).replace(".", "").replace("-", "").strip()
+
+
+class ArmazemClientes:
+    """
+    Alterações pontuais dos clientes (score e limite) gravadas em SQLite modo WAL.
+    O `clientes.csv` continua sendo a carga base; aqui ficam só as linhas alteradas,
+    então atualizar um score custa O(1) de I/O, independente do tamanho da base.
+    Cada alteração incrementa `versao`, o que permite invalidar caches por cliente.
+    A chave é sempre o CPF normalizado (só dígitos), na leitura e na escrita.
+    """
+
+    CAMPOS = ("score_atual", "limite_atual")
+
+    def __init__(self, caminho_db: str):
+        self.caminho_db = caminho_db
+        self._local = threading.local()
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.caminho_db) or ".", exist_ok=True)
+            # isolation_level=None: controlamos as transações na mão (BEGIN IMMEDIATE)
+            conn = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._criar_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    def _criar_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS clientes_alteracoes (
+                cpf TEXT PRIMARY KEY,
+                score_atual INTEGER,
+                limite_atual REAL,
+                versao INTEGER NOT NULL DEFAULT 1,
+                atualizado_em TEXT NOT NULL
+            )
+        """)
+
+    def _atualizar_campo(self, cpf: str, campo: str, valor) -> int:
+        if campo not in self.CAMPOS:
+            raise ValueError(f"Campo não atualizável: {campo}")
+        conn = self._conexao()
+        agora = datetime.datetime.now().isoformat()
+        # BEGIN IMMEDIATE pega o lock de escrita já no início: duas entrevistas
+        # simultâneas são serializadas pelo SQLite, nenhuma sobrescreve a outra.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"""
+                INSERT INTO clientes_alteracoes (cpf, {campo}, versao, atualizado_em)
+                VALUES (?, ?, 1, ?)
+                ON CONFLICT(cpf) DO UPDATE SET
+                    {campo} = excluded.{campo},
+                    versao = clientes_alteracoes.versao + 1,
+                    atualizado_em = excluded.atualizado_em
+                """,
+                (normalizar_cpf(cpf), valor, agora),
+            )
+            versao = conn.execute(
+                "SELECT versao FROM clientes_alteracoes WHERE cpf = ?", (normalizar_cpf(cpf),)
+            ).fetchone()[0]
+            conn.execute("COMMIT")
+            return versao
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def atualizar_score(self, cpf: str, score: int) -> int:
+        return self._atualizar_campo(cpf, "score_atual", int(score))
+
+    def atualizar_scores_lote(self, pares) -> int:
+        """Grava vários (cpf, score) numa única transação (recalculo noturno em lote)."""
+        conn = self._conexao()
+        agora = datetime.datetime.now().isoformat()
+        linhas = [(normalizar_cpf(cpf), int(score), agora) for cpf, score in pares]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO clientes_alteracoes (cpf, score_atual, versao, atualizado_em)
+                VALUES (?, ?, 1, ?)
+                ON CONFLICT(cpf) DO UPDATE SET
+                    score_atual = excluded.score_atual,
+                    versao = clientes_alteracoes.versao + 1,
+                    atualizado_em = excluded.atualizado_em
+                """,
+                linhas,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(linhas)
+
+    def atualizar_limite(self, cpf: str, limite: float) -> int:
+        return self._atualizar_campo(cpf, "limite_atual", float(limite))
+
+    @staticmethod
+    def _alteracoes(score, limite, versao) -> dict:
+        alteracoes = {"versao": versao}
+        if score is not None:
+            alteracoes["score_atual"] = str(score)
+        if limite is not None:
+            alteracoes["limite_atual"] = str(limite)
+        return alteracoes
+
+    def buscar(self, cpf: str):
+        """Retorna só os campos alterados do cliente (ou None se ele nunca foi alterado)."""
+        linha = self._conexao().execute(
+            "SELECT score_atual, limite_atual, versao FROM clientes_alteracoes WHERE cpf = ?", (normalizar_cpf(cpf),)
+        ).fetchone()
+        return None if linha is None else self._alteracoes(*linha)
+
+    def versao(self, cpf: str) -> int:
+        """Versão atual das alterações do cliente (0 = nunca alterado ou já consolidado)."""
+        linha = self._conexao().execute(
+            "SELECT versao FROM clientes_alteracoes WHERE cpf = ?", (normalizar_cpf(cpf),)
+        ).fetchone()
+        return 0 if linha is None else linha[0]
+
+    def buscar_lote(self, cpfs) -> dict:
+        """Mesmo que `buscar` para vários CPFs: {cpf normalizado: alterações}, só dos clientes alterados."""
+        conn = self._conexao()
+        cpfs = list(dict.fromkeys(normalizar_cpf(cpf) for cpf in cpfs))
+        resultado = {}
+        # Em partes, abaixo do limite de parâmetros por consulta do SQLite
+        for inicio in range(0, len(cpfs), 900):
+            parte = cpfs[inicio:inicio + 900]
+            consulta = (
+                "SELECT cpf, score_atual, limite_atual, versao FROM clientes_alteracoes "
+                f"WHERE cpf IN ({','.join('?' * len(parte))})"
+            )
+            for cpf, score, limite, versao in conn.execute(consulta, parte):
+                resultado[cpf] = self._alteracoes(score, limite, versao)
+        return resultado
+
+    def consolidar(self, caminho_csv: str = CLIENTES_CSV) -> int:
+        """
+        Job offline: aplica as alterações no CSV base e limpa as que foram aplicadas.
+        Alterações que chegarem durante a consolidação ficam no SQLite (versão maior).
+        """
+        conn = self._conexao()
+        alteracoes = pd.read_sql_query("SELECT cpf, score_atual, limite_atual, versao FROM clientes_alteracoes", conn)
+        if alteracoes.empty:
+            return 0
+
+        df = pd.read_csv(caminho_csv, dtype=str, keep_default_na=False)
+        indice = alteracoes.set_index("cpf")
+        chaves = df["cpf"].map(normalizar_cpf)
+        for campo in self.CAMPOS:
+            valores = indice[campo].dropna()
+            if campo == "score_atual":
+                valores = valores.astype(int)
+            mascara = chaves.isin(valores.index)
+            df.loc[mascara, campo] = chaves[mascara].map(valores).astype(str)
+
+        temporario = caminho_csv + ".tmp"
+        df.to_csv(temporario, index=False)
+        os.replace(temporario, caminho_csv)
+
+        # O snapshot colunar precisa refletir o CSV antes de as alterações saírem do SQLite
+        from src.snapshot_clientes import PONTEIRO, exportar_snapshot
+        if os.path.exists(os.path.join(CLIENTES_SNAPSHOT, PONTEIRO)):
+            exportar_snapshot(caminho_csv, CLIENTES_SNAPSHOT)
+
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(
+            "DELETE FROM clientes_alteracoes WHERE cpf = ? AND versao = ?",
+            list(zip(alteracoes["cpf"], alteracoes["versao"].astype(int))),
+        )
+        conn.execute("COMMIT")
+        return len(alteracoes)
+
+
+armazem_clientes = ArmazemClientes(CLIENTES_DB)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manutenção do armazém de alterações de clientes.")
+    parser.add_argument("--consolidar", action="store_true", help="Aplica as alterações no clientes.csv.")
+    args = parser.parse_args()
+
+    if args.consolidar:
+        print(f"✅ Clientes consolidados no CSV: {armazem_clientes.consolidar()}")
@@ -0,0 +1,148 @@
+# src/atendimento.py
+# Um turno de conversa independente da interface: monta a entrada do grafo, traduz o stream
+# do LangGraph em eventos simples (token, etapa, fim) e aplica o pós-turno.
+# Usado pelo app.py (modo local), pela API (src/servico.py) e pelo cliente da API.
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.constants import TAG_NOSTREAM
+
+from src.guardas import CAMPOS_NOVO_TURNO
+
+# Nós que respondem ao usuário (os tokens deles são exibidos enquanto chegam). Dentro deles,
+# chamadas marcadas com TAG_NOSTREAM (ex: o classificador da triagem) não são exibidas.
+NOS_COM_RESPOSTA = {"triagem", "credito", "cambio", "entrevista"}
+
+ETAPAS = {
+    "credito": "💳 Falando com o Agente de Crédito...",
+    "cambio": "💱 Falando com o Agente de Câmbio...",
+    "entrevista": "📝 Falando com o Agente de Entrevista...",
+}
+
+MODOS_STREAM = ["messages", "updates"]
+
+
+def config_turno(thread_id: str) -> dict:
+    from src.graph import config_sessao
+    return config_sessao(thread_id, recursion_limit=50)
+
+
+def montar_entrada(texto: str) -> dict:
+    """
+    Só a mensagem nova; o resto vem do checkpoint. Os controles do turno (destino, hops, memo) são zerados.
+    Login, CPF e perfil do cliente são gravados pelo próprio grafo quando o validar_cpf dá certo.
+    """
+    return {"messages": [HumanMessage(content=texto)], **CAMPOS_NOVO_TURNO}
+
+
+def historico(estado: dict) -> list:
+    """Falas do usuário e respostas finais do robô, no formato que as interfaces exibem."""
+    mensagens = []
+    for msg in estado.get("messages", []):
+        if isinstance(msg, HumanMessage):
+            mensagens.append({"papel": "user", "conteudo": msg.content})
+        elif isinstance(msg, AIMessage) and msg.content and not msg.tool_calls:
+            mensagens.append({"papel": "assistant", "conteudo": msg.content})
+    return mensagens
+
+
+class Turno:
+    """Acumula o stream de um turno e devolve os eventos para a interface."""
+
+    def __init__(self):
+        self.resposta = ""
+        self.saida = {}
+        self._id_em_exibicao = None
+        self._ultima_msg = None
+
+    def processar(self, modo: str, evento) -> list:
+        if modo == "messages":
+            chunk, metadata = evento
+            if metadata.get("langgraph_node") not in NOS_COM_RESPOSTA or not isinstance(chunk, AIMessage):
+                return []
+            if TAG_NOSTREAM in (metadata.get("tags") or ()):
+                return []
+            if not isinstance(chunk.content, str) or not chunk.content:
+                return []
+            # Nova chamada do LLM (ex: depois de uma tool): recomeça o texto exibido
+            if chunk.id != self._id_em_exibicao:
+                self._id_em_exibicao = chunk.id
+                self.resposta = ""
+            self.resposta += chunk.content
+            return [{"tipo": "token", "conteudo": chunk.content, "reiniciar": self.resposta == chunk.content}]
+
+        eventos = []
+        for no, atualizacao in evento.items():
+            if not atualizacao:
+                continue
+            self.saida.update({k: v for k, v in atualizacao.items() if k != "messages"})
+            for msg in atualizacao.get("messages", []):
+                if isinstance(msg, AIMessage) and msg.tool_calls:
+                    nomes = ", ".join(c["name"] for c in msg.tool_calls)
+                    eventos.append({"tipo": "etapa", "rotulo": f"🛠️ Executando: {nomes}"})
+                elif isinstance(msg, AIMessage):
+                    self._ultima_msg = msg
+            if no == "triagem" and atualizacao.get("proximo_agente"):
+                eventos.append({"tipo": "etapa", "rotulo": ETAPAS.get(atualizacao["proximo_agente"], "⏳ Processando...")})
+            elif no == "tools":
+                eventos.append({"tipo": "etapa", "rotulo": "🔄 Analisando o resultado..."})
+        return eventos
+
+    def finalizar(self) -> dict:
+        if self._ultima_msg is not None:
+            self.resposta = self._ultima_msg.content
+        return {"tipo": "fim", "resposta": self.resposta, "ultimo_agente": self.saida.get("ultimo_agente")}
+
+
+# --- Execução local (mesmo processo do grafo) ---
+def executar_turno(app, thread_id: str, texto: str):
+    """Gerador de eventos de um turno no grafo síncrono."""
+    config = config_turno(thread_id)
+    turno = Turno()
+    for modo, evento in app.stream(montar_entrada(texto), config=config, stream_mode=MODOS_STREAM):
+        yield from turno.processar(modo, evento)
+    yield turno.finalizar()
+
+
+async def aexecutar_turno(app, thread_id: str, texto: str):
+    """Mesmo turno no grafo async (API)."""
+    config = config_turno(thread_id)
+    turno = Turno()
+    async for modo, evento in app.astream(montar_entrada(texto), config=config, stream_mode=MODOS_STREAM):
+        for item in turno.processar(modo, evento):
+            yield item
+    yield turno.finalizar()
+
+
+class AtendimentoLocal:
+    """Roda o grafo no próprio processo (modo padrão do Streamlit)."""
+
+    def __init__(self):
+        from src.graph import obter_app
+        self.app = obter_app()
+
+    def historico(self, thread_id: str) -> list:
+        return historico(self.app.get_state(config_turno(thread_id)).values)
+
+    def turno(self, thread_id: str, texto: str):
+        return executar_turno(self.app, thread_id, texto)
+
+
+class AtendimentoRemoto:
+    """Cliente fino da API (src/servico.py): os eventos chegam em NDJSON, um por linha."""
+
+    def __init__(self, url_base: str, timeout: float = 120.0):
+        import httpx
+        self._cliente = httpx.Client(base_url=url_base.rstrip("/"), timeout=timeout)
+
+    def historico(self, thread_id: str) -> list:
+        resposta = self._cliente.get(f"/sessoes/{thread_id}/mensagens")
+        resposta.raise_for_status()
+        return resposta.json()["mensagens"]
+
+    def turno(self, thread_id: str, texto: str):
+        with self._cliente.stream("POST", f"/sessoes/{thread_id}/stream", json={"texto": texto}) as resposta:
+            resposta.raise_for_status()
+            for linha in resposta.iter_lines():
+                if linha:
+                    yield json.loads(linha)
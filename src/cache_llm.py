@@ -0,0 +1,227 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+
+from src.logs import obter_logger
+from src.metricas import amedir_llm, cache_llm, medir_llm
+from src.config import (
+    CACHE_LLM_ATIVO,
+    CACHE_LLM_MAX_ITENS,
+    CACHE_LLM_MENSAGENS,
+    CACHE_LLM_SIMILARIDADE,
+    CACHE_LLM_TTL,
+)
+
+# Dados do cliente que não podem vazar de uma sessão para outra
+PADRAO_SENSIVEL = re.compile(
+    r"\d{3}\.?\d{3}\.?\d{3}-?\d{2}"          # CPF
+    r"|\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2}"  # datas
+    r"|R\$\s*\d"                              # valores (limites)
+    r"|\bscore\b\D{0,20}\d"                   # score com número
+, re.IGNORECASE)
+
+
+def _normalizar(texto) -> str:
+    return re.sub(r"\s+", " ", str(texto)).strip().lower()
+
+
+def _tem_dado_sensivel(*textos) -> bool:
+    return any(PADRAO_SENSIVEL.search(str(t)) for t in textos)
+
+
+class CacheRespostas:
+    """
+    Cache das respostas do LLM por (nó, prompt de sistema, últimas mensagens normalizadas).
+    - Camada exata: hash da chave, com TTL e despejo LRU.
+    - Camada semântica (opcional): se `embeddings` for informado, respostas de perguntas
+      parecidas (cosseno >= limiar) no mesmo nó/prompt também são reaproveitadas.
+    Não guarda respostas com tool calls nem conversas com resultado de tool. Conteúdo com
+    dado de cliente (CPF, datas, valores) só entra com `escopo` (ex: o CPF da sessão), e
+    entradas com escopo nunca participam da busca semântica.
+    """
+
+    def __init__(self, max_itens=1000, ttl=300, max_mensagens=4, embeddings=None, limiar_similaridade=0.95):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.max_mensagens = max_mensagens
+        self.embeddings = embeddings
+        self.limiar_similaridade = limiar_similaridade
+
+        self._lock = threading.Lock()
+        self._itens = OrderedDict()  # chave -> (expira_em, conteudo, grupo, vetor)
+        # Vetores calculados na busca semântica que deu miss: o `guardar` seguinte reaproveita
+        self._vetores_pendentes = OrderedDict()  # chave -> vetor
+        self.estatisticas = {"hits_exatos": 0, "hits_semanticos": 0, "misses": 0, "ignorados": 0}
+
+    # --- Chaves ---
+    def _recentes(self, mensagens):
+        return mensagens[-self.max_mensagens:]
+
+    def _texto_mensagens(self, mensagens) -> str:
+        return "\n".join(f"{m.type}:{_normalizar(m.content)}" for m in self._recentes(mensagens))
+
+    def _grupo(self, no, prompt_sistema, escopo) -> str:
+        base = f"{no}\x00{_normalizar(prompt_sistema)}\x00{escopo or ''}"
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+    def _chave(self, grupo, texto_mensagens) -> str:
+        return hashlib.sha256(f"{grupo}\x00{texto_mensagens}".encode("utf-8")).hexdigest()
+
+    def _cacheavel(self, prompt_sistema, mensagens, escopo) -> bool:
+        recentes = self._recentes(mensagens)
+        if any(isinstance(m, ToolMessage) or getattr(m, "tool_calls", None) for m in recentes):
+            return False
+        if escopo is None and _tem_dado_sensivel(prompt_sistema, *(m.content for m in recentes)):
+            return False
+        return True
+
+    def _contar(self, campo, no):
+        with self._lock:
+            self.estatisticas[campo] += 1
+        cache_llm.inc(no=no, resultado=campo)
+
+    # --- API ---
+    def obter(self, no, prompt_sistema, mensagens, escopo=None):
+        if not self._cacheavel(prompt_sistema, mensagens, escopo):
+            self._contar("ignorados", no)
+            return None
+
+        grupo = self._grupo(no, prompt_sistema, escopo)
+        texto = self._texto_mensagens(mensagens)
+        chave = self._chave(grupo, texto)
+        agora = time.monotonic()
+
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] > agora:
+                self._itens.move_to_end(chave)
+                self.estatisticas["hits_exatos"] += 1
+                cache_llm.inc(no=no, resultado="hits_exatos")
+                return AIMessage(content=item[1])  # mensagem nova (id novo) para o add_messages anexar
+
+        if self.embeddings is not None and escopo is None:
+            conteudo, vetor = self._buscar_semelhante(grupo, texto, agora)
+            if conteudo is not None:
+                self._contar("hits_semanticos", no)
+                return AIMessage(content=conteudo)
+            if vetor is not None:
+                with self._lock:
+                    self._vetores_pendentes[chave] = vetor
+                    while len(self._vetores_pendentes) > self.max_itens:
+                        self._vetores_pendentes.popitem(last=False)
+
+        self._contar("misses", no)
+        return None
+
+    def guardar(self, no, prompt_sistema, mensagens, resposta, escopo=None):
+        if getattr(resposta, "tool_calls", None) or not isinstance(resposta.content, str) or not resposta.content:
+            return
+        if not self._cacheavel(prompt_sistema, mensagens, escopo):
+            return
+        if escopo is None and _tem_dado_sensivel(resposta.content):
+            return
+
+        grupo = self._grupo(no, prompt_sistema, escopo)
+        texto = self._texto_mensagens(mensagens)
+        chave = self._chave(grupo, texto)
+        vetor = None
+        if self.embeddings is not None and escopo is None:
+            with self._lock:
+                vetor = self._vetores_pendentes.pop(chave, None)
+            if vetor is None:
+                vetor = self._vetor(texto)
+
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, resposta.content, grupo, vetor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._vetores_pendentes.clear()
+
+    # --- Camada semântica ---
+    def _vetor(self, texto):
+        vetor = np.asarray(self.embeddings.embed_query(texto), dtype=np.float32)
+        norma = np.linalg.norm(vetor)
+        return vetor / norma if norma else vetor
+
+    def _buscar_semelhante(self, grupo, texto, agora):
+        """(conteúdo parecido ou None, vetor do texto se chegou a ser calculado)."""
+        with self._lock:
+            candidatos = [(chave, item) for chave, item in self._itens.items()
+                          if item[2] == grupo and item[3] is not None and item[0] > agora]
+        if not candidatos:
+            return None, None
+
+        vetor = self._vetor(texto)
+        matriz = np.stack([item[3] for _, item in candidatos])
+        similaridades = matriz @ vetor
+        melhor = int(np.argmax(similaridades))
+        if similaridades[melhor] < self.limiar_similaridade:
+            return None, vetor
+
+        chave, item = candidatos[melhor]
+        with self._lock:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+        return item[1], vetor
+
+
+def _criar_embeddings():
+    if CACHE_LLM_SIMILARIDADE <= 0:
+        return None
+    from langchain_openai import OpenAIEmbeddings
+    return OpenAIEmbeddings(model="text-embedding-3-small")
+
+
+log = obter_logger("cache_llm")
+
+cache_respostas = CacheRespostas(
+    max_itens=CACHE_LLM_MAX_ITENS,
+    ttl=CACHE_LLM_TTL,
+    max_mensagens=CACHE_LLM_MENSAGENS,
+    embeddings=_criar_embeddings(),
+    limiar_similaridade=CACHE_LLM_SIMILARIDADE,
+)
+
+
+def _consultar_cache(no, msg_sistema, mensagens, escopo):
+    if not CACHE_LLM_ATIVO:
+        return None
+    em_cache = cache_respostas.obter(no, msg_sistema, mensagens, escopo)
+    if em_cache is not None:
+        log.info("Resposta reaproveitada do cache", extra={"campos": {"no": no}})
+    return em_cache
+
+
+def _guardar_no_cache(no, msg_sistema, mensagens, resposta, escopo):
+    if CACHE_LLM_ATIVO:
+        cache_respostas.guardar(no, msg_sistema, mensagens, resposta, escopo)
+
+
+def invocar_com_cache(no, llm_ativo, msg_sistema, mensagens, escopo=None):
+    """Consulta o cache antes de chamar o LLM e guarda a resposta depois."""
+    em_cache = _consultar_cache(no, msg_sistema, mensagens, escopo)
+    if em_cache is not None:
+        return em_cache
+    resposta = medir_llm(no, llm_ativo.invoke, [SystemMessage(content=msg_sistema)] + list(mensagens))
+    _guardar_no_cache(no, msg_sistema, mensagens, resposta, escopo)
+    return resposta
+
+
+async def ainvocar_com_cache(no, llm_ativo, msg_sistema, mensagens, escopo=None):
+    """Versão assíncrona de `invocar_com_cache` (usa `ainvoke`)."""
+    em_cache = _consultar_cache(no, msg_sistema, mensagens, escopo)
+    if em_cache is not None:
+        return em_cache
+    resposta = await amedir_llm(no, llm_ativo.ainvoke, [SystemMessage(content=msg_sistema)] + list(mensagens))
+    _guardar_no_cache(no, msg_sistema, mensagens, resposta, escopo)
+    return resposta
@@ -0,0 +1,196 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+from src.config import COTACOES_CSV, COTACOES_PROVEDOR, COTACOES_TTL, COTACOES_URL, HTTP_TIMEOUT
+from src.logs import obter_logger
+from src.monitor_arquivo import ArquivoMonitorado
+from src.roteador import normalizar_texto
+
+# Nomes que o cliente costuma usar -> código ISO da moeda
+APELIDOS_MOEDA = {
+    "dolar": "USD", "dolares": "USD", "dolar americano": "USD",
+    "euro": "EUR", "euros": "EUR",
+    "libra": "GBP", "libras": "GBP", "libra esterlina": "GBP",
+    "iene": "JPY", "ienes": "JPY",
+    "peso argentino": "ARS", "pesos argentinos": "ARS",
+    "dolar canadense": "CAD", "franco suico": "CHF",
+    "bitcoin": "BTC", "real": "BRL", "reais": "BRL",
+}
+
+
+log = obter_logger("cambio")
+
+
+class CotacaoIndisponivel(Exception):
+    pass
+
+
+def normalizar_moeda(moeda: str) -> str:
+    texto = normalizar_texto(moeda or "")
+    if texto in APELIDOS_MOEDA:
+        return APELIDOS_MOEDA[texto]
+    if len(texto) == 3 and texto.isalpha():
+        return texto.upper()
+    raise CotacaoIndisponivel(f"Moeda não reconhecida: {moeda}")
+
+
+@dataclass
+class Cotacao:
+    moeda: str
+    base: str
+    compra: float
+    venda: float
+    atualizado_em: str
+    fonte: str
+
+    def resumo(self) -> dict:
+        return asdict(self)
+
+
+# ======================================================
+# --- PROVEDORES ---
+# ======================================================
+class ProvedorCotacoes:
+    """Interface dos provedores: `cotar(moeda, base)` devolve uma Cotacao ou levanta CotacaoIndisponivel."""
+
+    nome = "provedor"
+
+    def cotar(self, moeda: str, base: str) -> Cotacao:
+        raise NotImplementedError
+
+
+class ProvedorArquivo(ArquivoMonitorado, ProvedorCotacoes):
+    """Cotações de um CSV local (moeda, base, compra, venda, atualizado_em), relido quando o arquivo muda."""
+
+    nome = "arquivo"
+
+    def _carregar(self):
+        df = pd.read_csv(self.caminho, dtype={"moeda": str, "base": str, "atualizado_em": str})
+        return {
+            (linha.moeda.upper(), linha.base.upper()): (float(linha.compra), float(linha.venda), linha.atualizado_em)
+            for linha in df.itertuples(index=False)
+        }
+
+    def cotar(self, moeda, base):
+        try:
+            tabela = self.obter()
+        except FileNotFoundError:
+            raise CotacaoIndisponivel(f"Arquivo de cotações não encontrado: {self.caminho}")
+        if (moeda, base) in tabela:
+            compra, venda, atualizado_em = tabela[(moeda, base)]
+            return Cotacao(moeda, base, compra, venda, atualizado_em, self.nome)
+        # Par invertido (ex: BRL -> USD a partir de USD -> BRL)
+        if (base, moeda) in tabela:
+            compra, venda, atualizado_em = tabela[(base, moeda)]
+            return Cotacao(moeda, base, round(1 / venda, 6), round(1 / compra, 6), atualizado_em, self.nome)
+        raise CotacaoIndisponivel(f"Sem cotação para {moeda}/{base}")
+
+
+class ProvedorHTTP(ProvedorCotacoes):
+    """
+    Cotação ao vivo numa API no formato da AwesomeAPI
+    (GET .../json/last/USD-BRL -> {"USDBRL": {"bid": ..., "ask": ..., "create_date": ...}}).
+    """
+
+    nome = "http"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        import httpx
+        self.url = url
+        self._cliente = httpx.Client(timeout=timeout)
+
+    def cotar(self, moeda, base):
+        try:
+            resposta = self._cliente.get(self.url.format(moeda=moeda, base=base))
+            resposta.raise_for_status()
+            dados = resposta.json()[f"{moeda}{base}"]
+            return Cotacao(moeda, base, float(dados["bid"]), float(dados["ask"]), dados.get("create_date", ""), self.nome)
+        except Exception as e:
+            raise CotacaoIndisponivel(f"Falha ao consultar {moeda}/{base}: {e}")
+
+
+class ProvedorComReserva(ProvedorCotacoes):
+    """Tenta o provedor principal e cai para o reserva (ex: HTTP -> arquivo local)."""
+
+    def __init__(self, principal: ProvedorCotacoes, reserva: ProvedorCotacoes):
+        self.principal = principal
+        self.reserva = reserva
+        self.nome = f"{principal.nome}+{reserva.nome}"
+
+    def cotar(self, moeda, base):
+        try:
+            return self.principal.cotar(moeda, base)
+        except CotacaoIndisponivel as e:
+            log.warning("Provedor principal de cotação falhou, usando reserva",
+                        extra={"campos": {"erro": str(e), "reserva": self.reserva.nome}})
+            return self.reserva.cotar(moeda, base)
+
+
+# ======================================================
+# --- CACHE COM COALESCÊNCIA ---
+# ======================================================
+class CacheCotacoes:
+    """
+    Cache com TTL na frente do provedor. Pedidos concorrentes do mesmo par
+    enquanto a consulta está em andamento esperam o mesmo resultado
+    (uma única ida ao provedor).
+    """
+
+    def __init__(self, provedor: ProvedorCotacoes, ttl: float = 60):
+        self.provedor = provedor
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._itens = {}    # (moeda, base) -> (expira_em, Cotacao)
+        self._em_voo = {}   # (moeda, base) -> Future
+        self.estatisticas = {"hits": 0, "misses": 0, "coalescidos": 0, "erros": 0}
+
+    def obter(self, moeda: str, base: str = "BRL") -> Cotacao:
+        chave = (normalizar_moeda(moeda), normalizar_moeda(base))
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] > time.monotonic():
+                self.estatisticas["hits"] += 1
+                return item[1]
+            futuro = self._em_voo.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = self._em_voo[chave] = Future()
+                self.estatisticas["misses"] += 1
+            else:
+                self.estatisticas["coalescidos"] += 1
+
+        if not dono:
+            return futuro.result()
+
+        try:
+            cotacao = self.provedor.cotar(*chave)
+        except Exception as e:
+            with self._lock:
+                self.estatisticas["erros"] += 1
+                del self._em_voo[chave]
+            futuro.set_exception(e)
+            raise
+
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl, cotacao)
+            del self._em_voo[chave]
+        futuro.set_result(cotacao)
+        return cotacao
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+
+def _criar_provedor() -> ProvedorCotacoes:
+    local = ProvedorArquivo(COTACOES_CSV)
+    if COTACOES_PROVEDOR == "arquivo":
+        return local
+    return ProvedorComReserva(ProvedorHTTP(COTACOES_URL, timeout=min(HTTP_TIMEOUT, 10.0)), local)
+
+
+cache_cotacoes = CacheCotacoes(_criar_provedor(), ttl=COTACOES_TTL)
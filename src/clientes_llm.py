@@ -0,0 +1,32 @@
+# src/clientes_llm.py
+# Clientes compartilhados pelo processo inteiro: um pool HTTP com keep-alive
+# (sync e async) reaproveitado por todas as chamadas ao LLM.
+import httpx
+from dotenv import load_dotenv
+load_dotenv()
+
+from langchain_openai import ChatOpenAI
+
+from src.config import HTTP_KEEPALIVE_SEGUNDOS, HTTP_MAX_CONEXOES, HTTP_MAX_KEEPALIVE, HTTP_TIMEOUT
+
+_limites = httpx.Limits(
+    max_connections=HTTP_MAX_CONEXOES,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=HTTP_KEEPALIVE_SEGUNDOS,
+)
+http_client = httpx.Client(limits=_limites, timeout=HTTP_TIMEOUT)
+http_async_client = httpx.AsyncClient(limits=_limites, timeout=HTTP_TIMEOUT)
+
+
+def criar_chat(temperature: float, model: str = "gpt-4.1-mini") -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        stream_usage=True,  # Contagem de tokens também nas respostas em streaming
+    )
+
+
+llm = criar_chat(temperature=0)
+llm_classificador = criar_chat(temperature=1)
@@ -0,0 +1,96 @@
+import os
+
+# Caminhos dos arquivos (garantindo que funciona em qualquer SO)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# BANCO_DATA_DIR permite apontar para outra pasta de dados (ex: fixtures do bench)
+DATA_DIR = os.getenv("BANCO_DATA_DIR", os.path.join(BASE_DIR, "data"))
+CLIENTES_CSV = os.path.join(DATA_DIR, "clientes.csv")
+SOLICITACOES_CSV = os.path.join(DATA_DIR, "solicitacoes_aumento_limite.csv")
+SCORE_CSV = os.path.join(DATA_DIR, "score_limite.csv")
+# Snapshot colunar (um .npy por coluna, ordenado por CPF) gerado a partir do clientes.csv
+CLIENTES_SNAPSHOT = os.getenv("CLIENTES_SNAPSHOT", os.path.join(DATA_DIR, "clientes_snapshot"))
+
+# --- Log de solicitações (append-only) ---
+# fsync a cada N linhas (1 = toda solicitação é gravada de forma durável antes de responder)
+SOLICITACOES_FSYNC_A_CADA = int(os.getenv("SOLICITACOES_FSYNC_A_CADA", "1"))
+# Group commit: junta escritas concorrentes num único write + fsync
+SOLICITACOES_GROUP_COMMIT = os.getenv("SOLICITACOES_GROUP_COMMIT", "0") == "1"
+# Rotaciona o arquivo ativo ao passar desse tamanho (0 = nunca rotaciona automaticamente)
+SOLICITACOES_ROTACAO_BYTES = int(os.getenv("SOLICITACOES_ROTACAO_BYTES", "0"))
+# Visões agregadas do log (por CPF, dia e faixa), atualizadas a partir do último offset lido
+SOLICITACOES_VISOES_DB = os.getenv("SOLICITACOES_VISOES_DB", os.path.join(DATA_DIR, "solicitacoes_visoes.db"))
+
+# --- Alterações pontuais de clientes (SQLite WAL) ---
+CLIENTES_DB = os.getenv("CLIENTES_DB", os.path.join(DATA_DIR, "clientes_alteracoes.db"))
+
+# --- Roteador da triagem ---
+# Confiança mínima (0 a 1) para o caminho rápido decidir sem chamar o LLM classificador
+ROTEADOR_CONFIANCA_MINIMA = float(os.getenv("ROTEADOR_CONFIANCA_MINIMA", "0.75"))
+
+# --- Cache de respostas do LLM ---
+CACHE_LLM_ATIVO = os.getenv("CACHE_LLM_ATIVO", "1") == "1"
+CACHE_LLM_TTL = float(os.getenv("CACHE_LLM_TTL", "300"))
+CACHE_LLM_MAX_ITENS = int(os.getenv("CACHE_LLM_MAX_ITENS", "1000"))
+# Quantas mensagens finais do histórico entram na chave do cache
+CACHE_LLM_MENSAGENS = int(os.getenv("CACHE_LLM_MENSAGENS", "4"))
+# Similaridade mínima (cosseno) da camada semântica; 0 desliga (e não cria cliente de embeddings)
+CACHE_LLM_SIMILARIDADE = float(os.getenv("CACHE_LLM_SIMILARIDADE", "0"))
+
+# --- Pool HTTP compartilhado pelos clientes de LLM ---
+HTTP_MAX_CONEXOES = int(os.getenv("HTTP_MAX_CONEXOES", "200"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "50"))
+HTTP_KEEPALIVE_SEGUNDOS = float(os.getenv("HTTP_KEEPALIVE_SEGUNDOS", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "60"))
+
+# --- Checkpointer do grafo (memória das sessões por thread_id) ---
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", os.path.join(DATA_DIR, "checkpoints.db"))
+
+# --- Histórico enviado ao LLM ---
+# Orçamento (tokens estimados) da janela de mensagens de cada nó
+HISTORICO_ORCAMENTO_PADRAO = int(os.getenv("HISTORICO_ORCAMENTO_PADRAO", "3000"))
+# Sobrescritas por nó, ex: "entrevista=2000,cambio=1500"
+HISTORICO_ORCAMENTOS_POR_NO = {
+    no.strip(): int(valor)
+    for no, valor in (item.split("=") for item in os.getenv("HISTORICO_ORCAMENTOS_POR_NO", "").split(",") if "=" in item)
+}
+# Resultados de tool de turnos anteriores são cortados nesse tamanho
+HISTORICO_MAX_CHARS_TOOL = int(os.getenv("HISTORICO_MAX_CHARS_TOOL", "300"))
+# Tamanho máximo do resumo incremental guardado no estado
+HISTORICO_MAX_CHARS_RESUMO = int(os.getenv("HISTORICO_MAX_CHARS_RESUMO", "2000"))
+
+# --- Cotações de câmbio ---
+COTACOES_CSV = os.getenv("COTACOES_CSV", os.path.join(DATA_DIR, "cotacoes.csv"))
+# "http" (API ao vivo, com o CSV como reserva) ou "arquivo" (só o CSV local: benches e testes, offline)
+COTACOES_PROVEDOR = os.getenv("COTACOES_PROVEDOR", "http")
+COTACOES_URL = os.getenv("COTACOES_URL", "https://economia.awesomeapi.com.br/json/last/{moeda}-{base}")
+# Segundos que uma cotação fica em cache
+COTACOES_TTL = float(os.getenv("COTACOES_TTL", "60"))
+
+# --- Observabilidade ---
+LOG_NIVEL = os.getenv("LOG_NIVEL", "INFO")
+# "texto" (legível no terminal) ou "json" (uma linha JSON por evento)
+LOG_FORMATO = os.getenv("LOG_FORMATO", "texto")
+# Porta do endpoint /metrics no formato Prometheus (0 = desligado)
+METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+# Coletor OTLP (ex: http://localhost:4318/v1/traces); vazio = sem OpenTelemetry
+METRICAS_OTEL_ENDPOINT = os.getenv("METRICAS_OTEL_ENDPOINT", "")
+
+# --- API (src/servico.py) ---
+# Se definido, o app.py vira só interface e fala com a API nesse endereço (ex: http://localhost:8000)
+BANCO_API_URL = os.getenv("BANCO_API_URL", "")
+
+# --- Inicialização do processo (src/inicializacao.py) ---
+# Aquece em background o índice de clientes, a tabela de score, o grafo e os clientes de LLM
+INICIO_AQUECER = os.getenv("INICIO_AQUECER", "1") == "1"
+# Orçamentos do cold start (segundos): import do grafo e duração do primeiro turno (envio -> resposta)
+INICIO_ORCAMENTO_IMPORT = float(os.getenv("INICIO_ORCAMENTO_IMPORT", "1.5"))
+INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA = float(os.getenv("INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA", "3"))
+
+# --- Limites por turno e por sessão (src/guardas.py) ---
+# Chamadas ao LLM num mesmo turno antes de encerrar o loop de tools
+LIMITE_HOPS_TURNO = int(os.getenv("LIMITE_HOPS_TURNO", "6"))
+# Mensagens por minuto aceitas de uma mesma sessão
+LIMITE_MENSAGENS_MINUTO = int(os.getenv("LIMITE_MENSAGENS_MINUTO", "20"))
+# Falhas seguidas de autenticação antes do bloqueio, e por quanto tempo a sessão fica bloqueada
+LOGIN_MAX_TENTATIVAS = int(os.getenv("LOGIN_MAX_TENTATIVAS", "3"))
+LOGIN_BLOQUEIO_SEGUNDOS = int(os.getenv("LOGIN_BLOQUEIO_SEGUNDOS", "900"))
@@ -0,0 +1,100 @@
+# src/decisao_lote.py
+"""
+Decisão em lote de pedidos de aumento de limite.
+
+Lê um CSV de pedidos (colunas `cpf` e `novo_limite`) em blocos de tamanho fixo, cruza cada
+bloco com a base de clientes (busca vetorizada + alterações do armazém) e com as faixas de
+score, e decide com a mesma regra da tool `solicitar_aumento_limite` (`decidir_aumento`).
+As decisões vão para um arquivo temporário ao lado do log e entram no log de solicitações
+num único append no fim, então a memória fica limitada ao tamanho do bloco.
+Pedidos sem cliente na base ou com valores inválidos são ignorados (a tool também não os registra).
+
+    python -m src.decisao_lote pedidos.csv --tamanho-bloco 100000
+"""
+import datetime
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.logs import obter_logger
+from src.politica import decidir_aumento, politica_limite
+from src.registro_solicitacoes import COLUNAS_SOLICITACAO, registro_solicitacoes
+from src.repositorio import normalizar_cpf, repositorio_clientes
+
+log = obter_logger("decisao_lote")
+
+TAMANHO_BLOCO_PADRAO = 100_000
+
+
+def decidir_bloco(pedidos: pd.DataFrame, repositorio=repositorio_clientes, politica=politica_limite) -> pd.DataFrame:
+    """Decide um bloco de pedidos; devolve as linhas do log (colunas de COLUNAS_SOLICITACAO) dos pedidos válidos."""
+    cpfs = [normalizar_cpf(c) for c in pedidos["cpf"].tolist()]
+    encontrados, valores = repositorio.buscar_lote(cpfs, ["score_atual", "limite_atual"])
+
+    novos_limites = pd.to_numeric(pedidos["novo_limite"], errors="coerce").to_numpy(dtype=float)[encontrados]
+    scores = pd.to_numeric(pd.Series(valores["score_atual"]), errors="coerce").to_numpy(dtype=float)
+    limites_atuais = pd.to_numeric(pd.Series(valores["limite_atual"]), errors="coerce").to_numpy(dtype=float)
+    validos = np.isfinite(novos_limites) & np.isfinite(scores) & np.isfinite(limites_atuais)
+
+    scores = scores[validos]
+    novos_limites = novos_limites[validos]
+    return pd.DataFrame({
+        "cpf_cliente": np.asarray(cpfs, dtype=object)[encontrados][validos],
+        "data_hora_solicitacao": datetime.datetime.now().isoformat(),
+        "limite_atual": limites_atuais[validos],
+        "novo_limite_solicitado": novos_limites,
+        "status_pedido": decidir_aumento(novos_limites, politica.limites_maximos(scores)),
+    }, columns=COLUNAS_SOLICITACAO)
+
+
+def processar_arquivo(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO_PADRAO,
+                      registro=registro_solicitacoes, repositorio=repositorio_clientes,
+                      politica=politica_limite) -> dict:
+    """Decide todos os pedidos do arquivo e grava as decisões no log num único append."""
+    inicio = time.perf_counter()
+    resumo = {"lidos": 0, "aprovados": 0, "rejeitados": 0, "ignorados": 0}
+
+    pasta = os.path.dirname(os.path.abspath(registro.caminho))
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(prefix=".decisao_lote_", suffix=".csv", dir=pasta)
+    try:
+        # snapshot(): todos os blocos leem a mesma versão da base, mesmo que ela seja recarregada no meio
+        with os.fdopen(descritor, "w", encoding="utf-8", newline="") as saida, repositorio.snapshot():
+            leitor = pd.read_csv(caminho, dtype=str, keep_default_na=False,
+                                 usecols=["cpf", "novo_limite"], chunksize=tamanho_bloco)
+            for pedidos in leitor:
+                decisoes = decidir_bloco(pedidos, repositorio, politica)
+                decisoes.to_csv(saida, header=False, index=False, lineterminator="\n")
+                aprovados = int((decisoes["status_pedido"] == "aprovado").sum())
+                resumo["lidos"] += len(pedidos)
+                resumo["aprovados"] += aprovados
+                resumo["rejeitados"] += len(decisoes) - aprovados
+                resumo["ignorados"] += len(pedidos) - len(decisoes)
+
+        gravados = resumo["aprovados"] + resumo["rejeitados"]
+        if gravados:
+            registro.anexar_arquivo(temporario, gravados)
+    finally:
+        os.remove(temporario)
+
+    resumo["segundos"] = round(time.perf_counter() - inicio, 3)
+    resumo["linhas_por_segundo"] = round(resumo["lidos"] / resumo["segundos"]) if resumo["segundos"] else None
+    log.info("Decisão em lote concluída", extra={"campos": {"arquivo": caminho, **resumo}})
+    return resumo
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Decide em lote um CSV de pedidos de aumento (colunas cpf,novo_limite).")
+    parser.add_argument("arquivo")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help="Linhas lidas e decididas por vez (limita a memória usada).")
+    args = parser.parse_args()
+
+    resumo = processar_arquivo(args.arquivo, args.tamanho_bloco)
+    print(f"✅ {resumo['lidos']} pedidos em {resumo['segundos']}s ({resumo['linhas_por_segundo']} linhas/s): "
+          f"{resumo['aprovados']} aprovados, {resumo['rejeitados']} rejeitados, {resumo['ignorados']} ignorados")
@@ -0,0 +1,152 @@
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.roteador import normalizar_texto
+
+# ======================================================
+# --- ROTEIRO DA ENTREVISTA (perguntas fixas, respostas lidas localmente) ---
+# ======================================================
+# O progresso fica em BankState.temp_entrevista:
+#   {"etapa": <índice da pergunta atual>, "respostas": {campo: valor}, "tentativas": <falhas na etapa>}
+# O LLM só entra quando uma resposta não dá para interpretar.
+
+NUMEROS_POR_EXTENSO = {
+    "zero": 0, "nenhum": 0, "nenhuma": 0, "um": 1, "uma": 1, "dois": 2, "duas": 2, "tres": 3,
+    "quatro": 4, "cinco": 5, "seis": 6, "sete": 7, "oito": 8, "nove": 9, "dez": 10,
+}
+
+NEGATIVAS = {"nao", "n", "no", "nenhum", "nenhuma", "nada", "zero", "nao tenho", "nao possuo", "sem"}
+POSITIVAS = {"sim", "s", "yes", "tenho", "possuo", "claro", "infelizmente"}
+
+EMPREGOS = {
+    "formal": ("formal", "clt", "carteira assinada", "registrado", "concursado", "servidor publico"),
+    "autônomo": ("autonomo", "autonoma", "pj", "freelancer", "freela", "conta propria", "empreendedor", "mei"),
+    "desempregado": ("desempregado", "desempregada", "sem emprego", "nao trabalho", "nao estou empregado", "nao estou empregada"),
+}
+
+_PADRAO_NUMERO = re.compile(r"\d[\d.,]*")
+_PADRAO_MIL = re.compile(r"^\s*(mil|k)\b")
+
+
+def _para_float(trecho: str) -> float:
+    """Número no formato brasileiro ou americano: 5.000,50 / 5000.50 / 5,5 / 5.000"""
+    trecho = trecho.rstrip(".,")
+    if "," in trecho and "." in trecho:
+        if trecho.rfind(",") > trecho.rfind("."):
+            trecho = trecho.replace(".", "").replace(",", ".")
+        else:
+            trecho = trecho.replace(",", "")
+    elif "," in trecho:
+        inteiro, _, decimal = trecho.rpartition(",")
+        trecho = f"{inteiro.replace(',', '')}.{decimal}" if len(decimal) <= 2 else trecho.replace(",", "")
+    elif trecho.count(".") > 1 or re.fullmatch(r"\d{1,3}\.\d{3}", trecho):
+        trecho = trecho.replace(".", "")
+    return float(trecho)
+
+
+def interpretar_valor(texto: str) -> Optional[float]:
+    """Valor em reais ("R$ 3.500,00", "3500", "3,5 mil", "5k"). 'nenhuma'/'zero' viram 0."""
+    normalizado = normalizar_texto(texto)
+    achado = _PADRAO_NUMERO.search(texto)
+    if achado is None:
+        palavras = normalizado.split()
+        return 0.0 if palavras and (normalizado in NEGATIVAS or palavras[0] in NEGATIVAS) else None
+    valor = _para_float(achado.group())
+    if _PADRAO_MIL.match(texto[achado.end():].lower()):
+        valor *= 1000
+    return valor
+
+
+def interpretar_emprego(texto: str) -> Optional[str]:
+    normalizado = normalizar_texto(texto)
+    for emprego, termos in EMPREGOS.items():
+        if any(re.search(rf"\b{termo}\b", normalizado) for termo in termos):
+            return emprego
+    if normalizado in NEGATIVAS:
+        return "desempregado"
+    return None  # "sim" sozinho não diz o tipo
+
+
+def interpretar_inteiro(texto: str) -> Optional[int]:
+    achado = re.search(r"\d+", texto)
+    if achado is not None:
+        return int(achado.group())
+    normalizado = normalizar_texto(texto)
+    if normalizado in NEGATIVAS:
+        return 0
+    for palavra in normalizado.split():
+        if palavra in NUMEROS_POR_EXTENSO:
+            return NUMEROS_POR_EXTENSO[palavra]
+    return None
+
+
+def interpretar_sim_nao(texto: str) -> Optional[bool]:
+    normalizado = normalizar_texto(texto)
+    palavras = normalizado.split()
+    # Negação primeiro: "não tenho" contém "tenho"
+    if normalizado in NEGATIVAS or (palavras and palavras[0] in {"nao", "n", "no", "nenhuma", "nada"}):
+        return False
+    if normalizado in POSITIVAS or (palavras and palavras[0] in POSITIVAS):
+        return True
+    return None
+
+
+@dataclass
+class Pergunta:
+    campo: str
+    texto: str
+    interpretar: Callable[[str], Any]
+    formato: str  # Dica usada no pedido de esclarecimento
+
+
+PERGUNTAS = [
+    Pergunta("renda_mensal", "Qual é a sua renda mensal atual?",
+             interpretar_valor, "um valor em reais, por exemplo 3500 ou R$ 3.500,00"),
+    Pergunta("despesas_fixas", "Quais são suas despesas fixas mensais?",
+             interpretar_valor, "um valor em reais, por exemplo 1200 (ou 0 se não tiver)"),
+    Pergunta("tipo_emprego", "Você está empregado? Se sim, qual é o seu tipo de emprego (formal, autônomo ou desempregado)?",
+             interpretar_emprego, "formal, autônomo ou desempregado"),
+    Pergunta("dependentes", "Você tem dependentes? Se sim, quantos?",
+             interpretar_inteiro, "um número inteiro, por exemplo 0, 1 ou 2"),
+    Pergunta("tem_dividas", "Você possui dívidas atualmente? (Sim ou Não)",
+             interpretar_sim_nao, "sim ou não"),
+]
+
+ABERTURA = "Vamos fazer a entrevista para reavaliar o seu score! São 5 perguntas rápidas. 😊"
+PERGUNTA_FINAL = "Gostaria de realizar uma nova análise de crédito?"
+
+
+def iniciar() -> dict:
+    return {"etapa": 0, "respostas": {}, "tentativas": 0}
+
+
+def pergunta_atual(progresso: dict) -> Pergunta:
+    return PERGUNTAS[progresso["etapa"]]
+
+
+def registrar_resposta(progresso: dict, texto: str):
+    """
+    Interpreta a resposta da pergunta atual.
+    Retorna (novo_progresso, entendeu). Não altera o dicionário recebido (ele veio do checkpoint).
+    """
+    pergunta = pergunta_atual(progresso)
+    valor = pergunta.interpretar(texto)
+    if valor is None:
+        return {**progresso, "tentativas": progresso.get("tentativas", 0) + 1}, False
+    respostas = {**progresso["respostas"], pergunta.campo: valor}
+    return {"etapa": progresso["etapa"] + 1, "respostas": respostas, "tentativas": 0}, True
+
+
+def concluida(progresso: dict) -> bool:
+    return progresso["etapa"] >= len(PERGUNTAS)
+
+
+def chamada_score(cpf: str, progresso: dict) -> dict:
+    """Tool call pronto para o ToolNode executar `atualizar_score_entrevista` (sem passar pelo LLM)."""
+    return {
+        "name": "atualizar_score_entrevista",
+        "args": {"cpf": cpf, **progresso["respostas"]},
+        "id": f"entrevista_{uuid.uuid4().hex}",
+    }
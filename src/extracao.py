@@ -0,0 +1,89 @@
+# src/extracao.py
+# Extração local de CPF e data de nascimento da mensagem do usuário, com padrões compilados
+# uma vez no import. Com um CPF válido e uma data sem ambiguidade, a triagem chama a validação
+# direto (sem LLM e sem hop de tools). O dígito verificador é só o filtro desse atalho: um CPF que
+# não passa nele segue o caminho normal (LLM + validar_cpf), que autentica contra a base.
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# 123.456.789-09, 123 456 789 09, 12345678909 (sem colar em outros dígitos)
+_PADRAO_CPF = re.compile(r"(?<!\d)(\d{3})[.\s]?(\d{3})[.\s]?(\d{3})[\s.\-]?(\d{2})(?!\d)")
+# 1985-05-15 / 1985/05/15
+_PADRAO_DATA_ISO = re.compile(r"(?<!\d)(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?!\d)")
+# 15/05/1985, 15-05-1985, 15.05.1985, 15/05/85
+_PADRAO_DATA_BR = re.compile(r"(?<!\d)(\d{1,2})[-/.](\d{1,2})[-/.](\d{4}|\d{2})(?!\d)")
+# 15 de maio de 1985, 15 maio 1985, 15/mai/1985
+_MESES = {
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12,
+}
+_PADRAO_DATA_EXTENSO = re.compile(
+    r"(?<!\d)(\d{1,2})(?:\s+de\s+|\s+|/)(jan|fev|mar|abr|mai|jun|jul|ago|set|out|nov|dez)[a-zç]*\.?"
+    r"(?:\s+de\s+|\s+|/)(\d{4})(?!\d)",
+    re.IGNORECASE,
+)
+
+
+def cpf_valido(cpf: str) -> bool:
+    """Dígitos verificadores do CPF (11 dígitos, sem pontuação). Sequências repetidas são inválidas."""
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    digitos = [int(c) for c in cpf]
+    for posicao in (9, 10):
+        resto = sum(d * peso for d, peso in zip(digitos, range(posicao + 1, 1, -1))) * 10 % 11
+        if (0 if resto == 10 else resto) != digitos[posicao]:
+            return False
+    return True
+
+
+def _data_iso(ano: int, mes: int, dia: int) -> Optional[str]:
+    if ano < 100:
+        # Ano com dois dígitos: o século que não deixa a data no futuro
+        ano += 2000 if 2000 + ano <= datetime.date.today().year else 1900
+    try:
+        return datetime.date(ano, mes, dia).isoformat()
+    except ValueError:
+        return None
+
+
+def _datas(texto: str) -> list:
+    encontradas = []
+    for achado in _PADRAO_DATA_ISO.finditer(texto):
+        ano, mes, dia = (int(g) for g in achado.groups())
+        encontradas.append(_data_iso(ano, mes, dia))
+    for achado in _PADRAO_DATA_BR.finditer(texto):
+        dia, mes, ano = (int(g) for g in achado.groups())
+        encontradas.append(_data_iso(ano, mes, dia))
+    for achado in _PADRAO_DATA_EXTENSO.finditer(texto):
+        dia, mes, ano = achado.groups()
+        encontradas.append(_data_iso(int(ano), _MESES[mes.lower()], int(dia)))
+    return list(dict.fromkeys(d for d in encontradas if d is not None))
+
+
+@dataclass
+class Credenciais:
+    cpfs: list  # CPFs encontrados (só dígitos), na ordem do texto
+    datas: list  # Datas válidas encontradas, já em AAAA-MM-DD
+
+    @property
+    def cpfs_validos(self) -> list:
+        return [cpf for cpf in self.cpfs if cpf_valido(cpf)]
+
+    @property
+    def completas(self) -> bool:
+        """Exatamente um CPF válido e uma data: dá para validar sem perguntar nada ao LLM."""
+        return len(self.cpfs_validos) == 1 and len(self.datas) == 1
+
+    def completar(self, anterior: "Credenciais") -> "Credenciais":
+        """Junta com a mensagem anterior do usuário (ex: CPF num turno, data no seguinte)."""
+        return Credenciais(cpfs=self.cpfs or anterior.cpfs, datas=self.datas or anterior.datas)
+
+
+def extrair_credenciais(texto: str) -> Credenciais:
+    texto = str(texto)
+    # As datas saem do texto antes de procurar o CPF (dígitos de uma data nunca viram CPF)
+    sem_datas = _PADRAO_DATA_EXTENSO.sub(" ", _PADRAO_DATA_BR.sub(" ", _PADRAO_DATA_ISO.sub(" ", texto)))
+    cpfs = list(dict.fromkeys("".join(achado.groups()) for achado in _PADRAO_CPF.finditer(sem_datas)))
+    return Credenciais(cpfs=cpfs, datas=_datas(texto))
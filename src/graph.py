@@ -1,22 +1,89 @@
+import asyncio
+import os
+import sqlite3
+import threading
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode, tools_condition
 from src.state import BankState
 # [ATENÇÃO] Removemos node_analise_intencao da importação
 from src.nodes import (
-    node_triagem, 
-    node_credito, 
-    node_cambio, 
-    node_entrevista
+    node_triagem, anode_triagem,
+    node_credito, anode_credito,
+    node_cambio, anode_cambio,
+    node_entrevista, anode_entrevista,
 )
 from src.tools import (
-    validar_cpf, consultar_limite, solicitar_aumento_limite, atualizar_score_entrevista
+    validar_cpf, consultar_limite, solicitar_aumento_limite, atualizar_score_entrevista, consultar_cotacao,
+    consultar_historico_solicitacoes,
 )
-from langchain_community.tools.tavily_search import TavilySearchResults
+from src.config import CHECKPOINT_DB
+from src.repositorio import repositorio_clientes
+from src import guardas, perfil_sessao
 
 # --- TOOLS ---
-tool_tavily = TavilySearchResults(max_results=1)
-todas_ferramentas = [validar_cpf, consultar_limite, solicitar_aumento_limite, atualizar_score_entrevista, tool_tavily]
-node_ferramentas = ToolNode(todas_ferramentas)
+todas_ferramentas = [
+    validar_cpf, consultar_limite, solicitar_aumento_limite, atualizar_score_entrevista, consultar_cotacao,
+    consultar_historico_solicitacoes,
+]
+_executor_ferramentas = ToolNode(todas_ferramentas)
+
+
+# O ToolNode já roda as tool calls do mesmo turno em paralelo (threads no sync, gather no async).
+# Aqui todas elas compartilham um único snapshot da base de clientes, chamadas de leitura
+# repetidas no turno saem do memo e as falhas de validar_cpf contam para o bloqueio de login.
+# O cliente da sessão já autenticada vem do perfil guardado no estado (sem ler a base), depois
+# de conferir a versão dele no armazém; o login e as tools de escrita (re)carregam esse perfil.
+def _preparar_tools(state: BankState):
+    chamadas = state["messages"][-1].tool_calls
+    memo = state.get("memo_tools") or {}
+    prontas, pendentes = guardas.separar_memoizadas(chamadas, memo)
+    return chamadas, memo, prontas, pendentes
+
+
+def _concluir_tools(state: BankState, chamadas, memo, prontas, executadas):
+    ordem = {chamada["id"]: i for i, chamada in enumerate(chamadas)}
+    mensagens = sorted(prontas + executadas, key=lambda msg: ordem.get(msg.tool_call_id, len(ordem)))
+    return {
+        "messages": mensagens,
+        "memo_tools": guardas.atualizar_memo(memo, chamadas, executadas),
+        # Só validações que rodaram de fato contam como tentativa (repetições do memo não)
+        **guardas.contabilizar_login(state, executadas),
+        **perfil_sessao.atualizar_perfil(state, chamadas, executadas),
+    }
+
+
+def node_ferramentas(state: BankState, config):
+    chamadas, memo, prontas, pendentes = _preparar_tools(state)
+    executadas, recarga = [], {}
+    if pendentes:
+        # Perfil da sessão conferido contra a versão do armazém antes de semear o snapshot
+        recarga = perfil_sessao.conferir_versao(state)
+        state = {**state, **recarga}
+        with repositorio_clientes.snapshot(perfil_sessao.perfis(state)):
+            entrada = {"messages": [AIMessage(content="", tool_calls=pendentes)]}
+            executadas = _executor_ferramentas.invoke(entrada, config)["messages"]
+    return {**recarga, **_concluir_tools(state, chamadas, memo, prontas, executadas)}
+
+
+async def anode_ferramentas(state: BankState, config):
+    chamadas, memo, prontas, pendentes = _preparar_tools(state)
+    executadas, recarga = [], {}
+    if pendentes:
+        recarga = perfil_sessao.conferir_versao(state)
+        state = {**state, **recarga}
+        with repositorio_clientes.snapshot(perfil_sessao.perfis(state)):
+            entrada = {"messages": [AIMessage(content="", tool_calls=pendentes)]}
+            executadas = (await _executor_ferramentas.ainvoke(entrada, config))["messages"]
+    return {**recarga, **_concluir_tools(state, chamadas, memo, prontas, executadas)}
+
+
+def node_limite_turno(state: BankState):
+    return guardas.resposta_limite_turno(state)
+
 
 # --- ROTEADOR DA TRIAGEM (O Cérebro das Conexões) ---
 def router_triagem(state: BankState):
@@ -33,23 +100,29 @@ def router_triagem(state: BankState):
     return END
 
 def router_volta_tools(state: BankState):
+    # Orçamento de hops esgotado ou modelo repetindo chamadas idênticas: encerra sem mais chamadas ao LLM
+    if guardas.estourou_hops(state) or guardas.so_repeticoes(state):
+        return "limite_turno"
+
     mensagens = state["messages"]
     last_tool_msg = mensagens[-1]
     tool_name = last_tool_msg.name
     
     if tool_name == "validar_cpf": return "triagem"
     if tool_name == "atualizar_score_entrevista": return "entrevista"
-    if tool_name == "tavily_search_results_json": return "cambio"
+    if tool_name == "consultar_cotacao": return "cambio"
     return "credito"
 
 # --- GRAFO ---
 workflow = StateGraph(BankState)
 
-workflow.add_node("triagem", node_triagem)
-workflow.add_node("credito", node_credito)
-workflow.add_node("cambio", node_cambio)
-workflow.add_node("entrevista", node_entrevista)
-workflow.add_node("tools", node_ferramentas)
+# Cada nó tem versão sync (invoke/stream) e async (ainvoke/astream)
+workflow.add_node("triagem", RunnableLambda(node_triagem, afunc=anode_triagem, name="triagem"))
+workflow.add_node("credito", RunnableLambda(node_credito, afunc=anode_credito, name="credito"))
+workflow.add_node("cambio", RunnableLambda(node_cambio, afunc=anode_cambio, name="cambio"))
+workflow.add_node("entrevista", RunnableLambda(node_entrevista, afunc=anode_entrevista, name="entrevista"))
+workflow.add_node("tools", RunnableLambda(node_ferramentas, afunc=anode_ferramentas, name="tools"))
+workflow.add_node("limite_turno", node_limite_turno)
 
 workflow.set_entry_point("triagem")
 
@@ -81,8 +154,69 @@ workflow.add_conditional_edges(
         "triagem": "triagem",
         "credito": "credito",
         "cambio": "cambio",
-        "entrevista": "entrevista"
+        "entrevista": "entrevista",
+        "limite_turno": "limite_turno",
     }
 )
+workflow.add_edge("limite_turno", END)
+
+# --- MEMÓRIA PERSISTENTE (Checkpointer) ---
+# O estado de cada conversa fica salvo no SQLite, indexado pelo thread_id da config.
+# A interface manda só a mensagem nova; histórico, CPF e agente atual vêm do checkpoint.
+# O grafo síncrono é um singleton do processo, compilado (e o SQLite aberto) no primeiro uso:
+# importar este módulo não toca em disco.
+_app = None
+_lock_app = threading.Lock()
+
+def obter_app():
+    global _app
+    if _app is None:
+        with _lock_app:
+            if _app is None:
+                os.makedirs(os.path.dirname(CHECKPOINT_DB) or ".", exist_ok=True)
+                # check_same_thread=False é seguro: o SqliteSaver serializa o acesso com um lock
+                conn = sqlite3.connect(CHECKPOINT_DB, check_same_thread=False)
+                # WAL: vários processos (workers da API) lendo e gravando o mesmo arquivo de checkpoints
+                conn.execute("PRAGMA journal_mode=WAL")
+                _app = workflow.compile(checkpointer=SqliteSaver(conn))
+    return _app
+
+def __getattr__(nome):
+    # `from src.graph import app` continua funcionando: compila no primeiro acesso
+    if nome == "app":
+        return obter_app()
+    if nome == "checkpointer":
+        return obter_app().checkpointer
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def config_sessao(thread_id: str, **extras) -> dict:
+    return {"configurable": {"thread_id": thread_id}, **extras}
+
+# --- ENTRADA ASSÍNCRONA ---
+# Um único processo atende várias conversas ao mesmo tempo: as chamadas ao LLM
+# usam ainvoke e o pool HTTP compartilhado de src/clientes_llm.py.
+# O SqliteSaver é síncrono, então a versão async usa o AsyncSqliteSaver (mesmo arquivo),
+# criado no primeiro uso dentro do event loop.
+_app_async = None
+# Requisições simultâneas logo após o boot esperam a primeira montagem (uma conexão só)
+_lock_app_async = asyncio.Lock()
+
+async def obter_app_async():
+    global _app_async
+    if _app_async is None:
+        async with _lock_app_async:
+            if _app_async is None:
+                import aiosqlite
+                from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+                conn = await aiosqlite.connect(CHECKPOINT_DB)
+                await conn.execute("PRAGMA journal_mode=WAL")
+                _app_async = workflow.compile(checkpointer=AsyncSqliteSaver(conn))
+    return _app_async
 
-app = workflow.compile()
\ No newline at end of file
+async def fechar_app_async():
+    """Fecha a conexão aiosqlite (a thread dela segura o processo aberto ao sair)."""
+    global _app_async
+    if _app_async is not None:
+        await _app_async.checkpointer.conn.close()
+        _app_async = None
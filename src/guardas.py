@@ -0,0 +1,144 @@
+# src/guardas.py
+# Limites decididos sem chamar o LLM: orçamento de hops por turno, memo de tool calls
+# repetidas no turno, limite de mensagens por sessão e bloqueio após falhas de login.
+import json
+import math
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.config import (
+    LIMITE_HOPS_TURNO,
+    LIMITE_MENSAGENS_MINUTO,
+    LOGIN_BLOQUEIO_SEGUNDOS,
+    LOGIN_MAX_TENTATIVAS,
+)
+from src.logs import obter_logger
+
+log = obter_logger("guardas")
+
+# Só tools de leitura: repetir a chamada no mesmo turno daria o mesmo resultado
+TOOLS_MEMOIZAVEIS = {"validar_cpf", "consultar_limite", "consultar_cotacao", "consultar_historico_solicitacoes"}
+
+MSG_LIMITE_TURNO = ("Não consegui concluir o seu pedido desta vez. "
+                    "Pode reformular ou tentar de novo em instantes?")
+MSG_LIMITE_MENSAGENS = "Você enviou muitas mensagens em pouco tempo. Aguarde um minutinho e tente de novo, por favor."
+MSG_BLOQUEIO = ("Por segurança, o acesso foi bloqueado após {tentativas} tentativas de autenticação sem sucesso. "
+                "Tente novamente em {minutos} minuto(s).")
+
+
+# Campos zerados na entrada de cada turno (junto com a mensagem nova)
+CAMPOS_NOVO_TURNO = {"proximo_agente": None, "hops_turno": 0, "memo_tools": None}
+
+
+# --- Orçamento de hops (chamadas ao LLM por turno) ---
+def contar_hop(state) -> dict:
+    """Atualização de estado de um nó que chamou o LLM. O contador é zerado na entrada de cada turno."""
+    return {"hops_turno": (state.get("hops_turno") or 0) + 1}
+
+
+def estourou_hops(state) -> bool:
+    return (state.get("hops_turno") or 0) >= LIMITE_HOPS_TURNO
+
+
+def resposta_limite_turno(state) -> dict:
+    log.warning("Turno encerrado pelo limite de hops/repetição de tools",
+                extra={"campos": {"hops": state.get("hops_turno"), "repeticao": so_repeticoes(state)}})
+    return {"messages": [AIMessage(content=MSG_LIMITE_TURNO)], "proximo_agente": None}
+
+
+# --- Memo de tool calls do turno ---
+def chave_tool_call(chamada: dict) -> str:
+    return f"{chamada['name']}:{json.dumps(chamada.get('args', {}), sort_keys=True, default=str)}"
+
+
+def separar_memoizadas(chamadas: list, memo: dict):
+    """(ToolMessages já respondidas pelo memo, chamadas que ainda precisam rodar)."""
+    prontas, pendentes = [], []
+    for chamada in chamadas:
+        chave = chave_tool_call(chamada)
+        if chamada["name"] in TOOLS_MEMOIZAVEIS and chave in memo:
+            prontas.append(ToolMessage(content=memo[chave], name=chamada["name"], tool_call_id=chamada["id"],
+                                       additional_kwargs={"memo": True}))
+        else:
+            pendentes.append(chamada)
+    return prontas, pendentes
+
+
+def atualizar_memo(memo: dict, chamadas: list, mensagens: list) -> dict:
+    por_id = {chamada["id"]: chamada for chamada in chamadas}
+    # Uma tool de escrita (aumento, score) rodou: as leituras guardadas podem ter mudado
+    if any(por_id.get(getattr(msg, "tool_call_id", None), {}).get("name") not in TOOLS_MEMOIZAVEIS for msg in mensagens):
+        memo = {}
+    novo = dict(memo)
+    for msg in mensagens:
+        chamada = por_id.get(getattr(msg, "tool_call_id", None))
+        if chamada is not None and chamada["name"] in TOOLS_MEMOIZAVEIS and msg.status != "error":
+            novo[chave_tool_call(chamada)] = msg.content
+    return novo
+
+
+def so_repeticoes(state) -> bool:
+    """O último hop de tools foi todo respondido pelo memo: o modelo está repetindo a mesma chamada."""
+    mensagens = state["messages"]
+    finais = []
+    for msg in reversed(mensagens):
+        if not isinstance(msg, ToolMessage):
+            break
+        finais.append(msg)
+    return bool(finais) and all(msg.additional_kwargs.get("memo") for msg in finais)
+
+
+# --- Falhas de login ---
+def _sucesso_validacao(msg: ToolMessage):
+    try:
+        return bool(json.loads(msg.content).get("sucesso"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def contabilizar_login(state, mensagens: list) -> dict:
+    """Conta as falhas de validar_cpf; na N-ésima seguida, bloqueia a sessão por um tempo."""
+    return contabilizar_validacoes(state, [
+        _sucesso_validacao(msg) for msg in mensagens if isinstance(msg, ToolMessage) and msg.name == "validar_cpf"
+    ])
+
+
+def contabilizar_validacoes(state, resultados: list) -> dict:
+    """Mesma contagem a partir dos resultados (True/False/None) das validações feitas no turno."""
+    tentativas = state.get("tentativas_falhas") or 0
+    atualizacao = {}
+    for sucesso in resultados:
+        if sucesso:
+            tentativas = 0
+            atualizacao["bloqueado_ate"] = None
+        elif sucesso is False:
+            tentativas += 1
+        if tentativas >= LOGIN_MAX_TENTATIVAS:
+            log.warning("Sessão bloqueada por falhas de autenticação", extra={"campos": {"tentativas": tentativas}})
+            atualizacao["bloqueado_ate"] = time.time() + LOGIN_BLOQUEIO_SEGUNDOS
+            tentativas = 0
+        atualizacao["tentativas_falhas"] = tentativas
+    return atualizacao
+
+
+# --- Controle da sessão na entrada da triagem ---
+def controle_sessao(state):
+    """
+    (resposta, atualizacao): se `resposta` vier preenchida, a triagem devolve ela sem chamar o LLM.
+    `atualizacao` traz os campos de controle que a triagem grava junto com o resultado normal.
+    """
+    agora = time.time()
+    bloqueado_ate = state.get("bloqueado_ate")
+    if bloqueado_ate and agora < bloqueado_ate and not state.get("autenticado"):
+        minutos = math.ceil((bloqueado_ate - agora) / 60)
+        texto = MSG_BLOQUEIO.format(tentativas=LOGIN_MAX_TENTATIVAS, minutos=minutos)
+        return {"messages": [AIMessage(content=texto)], "proximo_agente": None}, {}
+
+    if not isinstance(state["messages"][-1], HumanMessage):
+        return None, {}
+    recentes = [t for t in (state.get("mensagens_recentes") or []) if agora - t < 60]
+    if len(recentes) >= LIMITE_MENSAGENS_MINUTO:
+        log.warning("Limite de mensagens por minuto atingido", extra={"campos": {"mensagens": len(recentes)}})
+        return {"messages": [AIMessage(content=MSG_LIMITE_MENSAGENS)], "proximo_agente": None}, {}
+    return None, {"mensagens_recentes": recentes + [agora]}
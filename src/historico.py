@@ -0,0 +1,165 @@
+import threading
+from dataclasses import dataclass, field
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.logs import obter_logger
+from src.metricas import tokens_historico
+from src.config import (
+    HISTORICO_MAX_CHARS_RESUMO,
+    HISTORICO_MAX_CHARS_TOOL,
+    HISTORICO_ORCAMENTO_PADRAO,
+    HISTORICO_ORCAMENTOS_POR_NO,
+)
+
+# Estimativa barata (~4 caracteres por token + overhead por mensagem), sem tokenizer
+CHARS_POR_TOKEN = 4
+TOKENS_POR_MENSAGEM = 4
+
+
+def estimar_tokens_texto(texto) -> int:
+    return len(str(texto)) // CHARS_POR_TOKEN + 1
+
+
+def estimar_tokens(mensagens) -> int:
+    total = 0
+    for m in mensagens:
+        total += TOKENS_POR_MENSAGEM + estimar_tokens_texto(m.content)
+        for chamada in getattr(m, "tool_calls", None) or []:
+            total += estimar_tokens_texto(chamada.get("args", ""))
+    return total
+
+
+def _omitir_tools_antigas(mensagens, max_chars):
+    """Resultados de tool de turnos anteriores viram um resumo curto; os do turno atual ficam inteiros."""
+    ultimo_humano = max((i for i, m in enumerate(mensagens) if isinstance(m, HumanMessage)), default=-1)
+    resultado = []
+    for i, m in enumerate(mensagens):
+        if isinstance(m, ToolMessage) and i < ultimo_humano and len(str(m.content)) > max_chars:
+            conteudo = str(m.content)[:max_chars] + " …[resultado antigo omitido]"
+            m = ToolMessage(content=conteudo, tool_call_id=m.tool_call_id, name=m.name, id=m.id)
+        resultado.append(m)
+    return resultado
+
+
+def _inicio_da_janela(mensagens, orcamento):
+    """
+    Índice da primeira mensagem que cabe no orçamento (contando do fim).
+    A janela sempre começa numa fala do usuário, para nunca separar um tool call
+    do seu resultado, e sempre inclui a última fala do usuário.
+    """
+    usados = 0
+    corte = len(mensagens)
+    for i in range(len(mensagens) - 1, -1, -1):
+        usados += estimar_tokens([mensagens[i]])
+        if usados > orcamento:
+            break
+        corte = i
+
+    inicios_validos = [i for i, m in enumerate(mensagens) if isinstance(m, HumanMessage)]
+    if not inicios_validos:
+        return 0
+    depois_do_corte = [i for i in inicios_validos if i >= corte]
+    return depois_do_corte[0] if depois_do_corte else inicios_validos[-1]
+
+
+def resumir_localmente(resumo_anterior: str, mensagens, max_chars: int) -> str:
+    """Resumo extrativo (sem LLM): guarda as falas mais recentes que saíram da janela."""
+    linhas = [resumo_anterior] if resumo_anterior else []
+    for m in mensagens:
+        if isinstance(m, HumanMessage):
+            linhas.append(f"Cliente: {str(m.content)[:200]}")
+        elif isinstance(m, AIMessage) and m.content and not m.tool_calls:
+            linhas.append(f"Bia: {str(m.content)[:200]}")
+    resumo = "\n".join(linhas)
+    return resumo[-max_chars:]
+
+
+@dataclass
+class ContextoLLM:
+    mensagens: list
+    msg_sistema: str
+    atualizacao: dict = field(default_factory=dict)
+
+
+class MetricasHistorico:
+    """Tokens estimados por nó: quanto do histórico foi enviado e quanto foi cortado."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.por_no = {}
+
+    def registrar(self, no, orcamento, tokens_antes, tokens_depois):
+        with self._lock:
+            m = self.por_no.setdefault(no, {"orcamento": orcamento, "chamadas": 0, "tokens_enviados": 0,
+                                            "tokens_cortados": 0, "maior_envio": 0})
+            m["orcamento"] = orcamento
+            m["chamadas"] += 1
+            m["tokens_enviados"] += tokens_depois
+            m["tokens_cortados"] += max(0, tokens_antes - tokens_depois)
+            m["maior_envio"] = max(m["maior_envio"], tokens_depois)
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {no: dict(m) for no, m in self.por_no.items()}
+
+
+metricas_historico = MetricasHistorico()
+log = obter_logger("historico")
+
+
+class PoliticaHistorico:
+    """
+    Decide o que do `BankState.messages` vai para o LLM:
+    1. resultados de tool de turnos passados são encurtados;
+    2. só entra a janela final que cabe no orçamento de tokens do nó;
+    3. o que sai da janela é dobrado num resumo incremental guardado no estado
+       (`resumo_historico` / `resumo_ate`), que vai junto do prompt de sistema.
+    """
+
+    def __init__(self, orcamento_padrao=HISTORICO_ORCAMENTO_PADRAO, orcamentos_por_no=None,
+                 max_chars_tool=HISTORICO_MAX_CHARS_TOOL, max_chars_resumo=HISTORICO_MAX_CHARS_RESUMO,
+                 resumidor=None):
+        self.orcamento_padrao = orcamento_padrao
+        self.orcamentos_por_no = dict(orcamentos_por_no or {})
+        self.max_chars_tool = max_chars_tool
+        self.max_chars_resumo = max_chars_resumo
+        # resumidor(resumo_anterior, mensagens_novas) -> str; padrão é o extrativo local
+        self.resumidor = resumidor or (lambda anterior, msgs: resumir_localmente(anterior, msgs, self.max_chars_resumo))
+
+    def orcamento(self, no) -> int:
+        return self.orcamentos_por_no.get(no, self.orcamento_padrao)
+
+    def aplicar(self, no, state, msg_sistema) -> ContextoLLM:
+        mensagens = list(state["messages"])
+        orcamento = self.orcamento(no)
+        tokens_antes = estimar_tokens(mensagens)
+
+        # O prompt de sistema e o espaço máximo do resumo saem do orçamento antes da janela
+        reservado = estimar_tokens_texto(msg_sistema) + self.max_chars_resumo // CHARS_POR_TOKEN
+        compactadas = _omitir_tools_antigas(mensagens, self.max_chars_tool)
+        inicio = _inicio_da_janela(compactadas, max(0, orcamento - reservado))
+        janela = compactadas[inicio:]
+
+        resumo = state.get("resumo_historico") or ""
+        resumo_ate = state.get("resumo_ate") or 0
+        atualizacao = {}
+        if inicio > resumo_ate:
+            resumo = self.resumidor(resumo, mensagens[resumo_ate:inicio])
+            atualizacao = {"resumo_historico": resumo, "resumo_ate": inicio}
+
+        if resumo:
+            msg_sistema = f"{msg_sistema}\n\nResumo da conversa anterior:\n{resumo}"
+
+        tokens_depois = estimar_tokens(janela) + estimar_tokens_texto(msg_sistema)
+        metricas_historico.registrar(no, orcamento, tokens_antes, tokens_depois)
+        tokens_historico.inc(tokens_depois, no=no, tipo="enviados")
+        tokens_historico.inc(max(0, tokens_antes - tokens_depois), no=no, tipo="cortados")
+        if inicio > 0:
+            log.info("Histórico recortado", extra={"campos": {
+                "no": no, "mensagens": f"{len(janela)}/{len(mensagens)}", "tokens": tokens_depois, "orcamento": orcamento}})
+
+        return ContextoLLM(mensagens=janela, msg_sistema=msg_sistema, atualizacao=atualizacao)
+
+
+politica_historico = PoliticaHistorico(orcamentos_por_no=HISTORICO_ORCAMENTOS_POR_NO)
@@ -0,0 +1,116 @@
+# src/inicializacao.py
+# Cold start do processo (Streamlit ou script). Este módulo é leve de importar: o grafo, o pandas
+# e os clientes de LLM só são carregados pelo aquecimento, numa thread em background, enquanto
+# a interface já desenha a página. Cada etapa é medida; o import do grafo e a primeira resposta
+# do processo são comparados com os orçamentos do config. A primeira resposta é a duração do
+# primeiro turno (envio -> fim), sem o tempo ocioso do usuário; o tempo até o processo ficar
+# pronto (import + aquecimento) sai à parte, em `aquecimento_concluido`.
+import contextlib
+import threading
+import time
+
+from src.config import INICIO_AQUECER, INICIO_ORCAMENTO_IMPORT, INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA
+from src.logs import obter_logger
+from src.metricas import duracao_inicio
+
+log = obter_logger("inicializacao")
+
+
+class Inicializacao:
+    """Aquecimento em background e orçamento do cold start (import do grafo e primeira resposta)."""
+
+    def __init__(self, relogio=time.perf_counter):
+        self.relogio = relogio
+        self.inicio = relogio()
+        self.tempos = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pronto = threading.Event()
+
+    @contextlib.contextmanager
+    def medir(self, etapa: str):
+        inicio = self.relogio()
+        try:
+            yield
+        finally:
+            self.tempos[etapa] = round(self.relogio() - inicio, 3)
+            duracao_inicio.observar(self.tempos[etapa], etapa=etapa)
+
+    def aquecer(self, em_background: bool = True):
+        """Dispara o aquecimento uma única vez por processo (chamadas seguintes não fazem nada)."""
+        with self._lock:
+            if self._thread is not None or self._pronto.is_set():
+                return
+            if not INICIO_AQUECER:
+                self._pronto.set()
+                return
+            self._thread = threading.Thread(target=self._aquecer, name="aquecimento", daemon=True)
+        if em_background:
+            self._thread.start()
+        else:
+            self._thread.run()
+
+    def _aquecer(self):
+        try:
+            with self.medir("import_grafo"):
+                from src import graph
+            from src.nodes import runnables
+            from src.politica import politica_limite
+            from src.repositorio import repositorio_clientes
+
+            with self.medir("indice_clientes"):
+                repositorio_clientes.obter()
+            with self.medir("tabela_score"):
+                politica_limite.obter()
+            with self.medir("grafo"):
+                graph.obter_app()
+            with self.medir("clientes_llm"):
+                runnables["triagem_conversa"]  # monta todos os papéis (e importa o cliente da OpenAI)
+        except Exception:
+            log.exception("Falha no aquecimento; o que faltou será carregado no primeiro uso")
+        finally:
+            # Tempo até ficar pronto: do início do processo ao fim do aquecimento (sem orçamento próprio)
+            self.tempos["aquecimento_concluido"] = round(self.relogio() - self.inicio, 3)
+            duracao_inicio.observar(self.tempos["aquecimento_concluido"], etapa="aquecimento_concluido")
+            self._pronto.set()
+            self.relatar()
+
+    def aguardar(self, timeout=None) -> bool:
+        return self._pronto.wait(timeout)
+
+    def registrar_primeira_resposta(self, inicio_turno: float) -> dict:
+        """
+        Chamado no fim de cada turno com o instante do envio (`relogio()` lido antes do turno);
+        só o primeiro turno do processo é medido e comparado com INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA.
+        """
+        with self._lock:
+            if "primeira_resposta" in self.tempos:
+                return {}
+            self.tempos["primeira_resposta"] = round(self.relogio() - inicio_turno, 3)
+        duracao_inicio.observar(self.tempos["primeira_resposta"], etapa="primeira_resposta")
+        return self.relatar()
+
+    def _estouros(self) -> dict:
+        orcamentos = {"import_grafo": INICIO_ORCAMENTO_IMPORT, "primeira_resposta": INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA}
+        return {etapa: orcamento for etapa, orcamento in orcamentos.items() if self.tempos.get(etapa, 0) > orcamento}
+
+    def relatar(self) -> dict:
+        """Tempos medidos até agora contra os orçamentos; estouro vira warning no log."""
+        estouros = self._estouros()
+        campos = {**self.tempos, "orcamento_import": INICIO_ORCAMENTO_IMPORT,
+                  "orcamento_primeira_resposta": INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA}
+        if estouros:
+            log.warning("Cold start acima do orçamento", extra={"campos": {**campos, "estouros": estouros}})
+        else:
+            log.info("Cold start dentro do orçamento", extra={"campos": campos})
+        return {"tempos": dict(self.tempos), "estouros": estouros}
+
+
+# Instância única do processo
+inicializacao = Inicializacao()
+
+
+if __name__ == "__main__":
+    # Mede o cold start deste ambiente: python -m src.inicializacao
+    inicializacao.aquecer(em_background=False)
+    print(inicializacao.tempos)
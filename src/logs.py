@@ -0,0 +1,60 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+from src.config import LOG_FORMATO, LOG_NIVEL
+
+_lock = threading.Lock()
+_configurado = False
+
+
+class FormatoJSON(logging.Formatter):
+    """Uma linha JSON por evento: ts, nivel, logger, msg e os campos passados em extra={"campos": {...}}."""
+
+    def format(self, record):
+        evento = {
+            "ts": round(record.created, 3),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **getattr(record, "campos", {}),
+        }
+        if record.exc_info:
+            evento["erro"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+class FormatoTexto(logging.Formatter):
+    """Formato legível: `hora nivel logger: mensagem chave=valor ...`."""
+
+    def format(self, record):
+        hora = time.strftime("%H:%M:%S", time.localtime(record.created))
+        campos = " ".join(f"{k}={v}" for k, v in getattr(record, "campos", {}).items())
+        linha = f"{hora} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if campos:
+            linha = f"{linha} | {campos}"
+        if record.exc_info:
+            linha = f"{linha}\n{self.formatException(record.exc_info)}"
+        return linha
+
+
+def configurar_logs(nivel=LOG_NIVEL, formato=LOG_FORMATO):
+    """Configura o logger raiz do projeto ("banco") uma única vez por processo."""
+    global _configurado
+    with _lock:
+        if _configurado:
+            return
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(FormatoJSON() if formato == "json" else FormatoTexto())
+        raiz = logging.getLogger("banco")
+        raiz.addHandler(handler)
+        raiz.setLevel(nivel)
+        raiz.propagate = False
+        _configurado = True
+
+
+def obter_logger(nome: str) -> logging.Logger:
+    configurar_logs()
+    return logging.getLogger(f"banco.{nome}")
@@ -0,0 +1,317 @@
+# src/metricas.py
+"""
+Métricas e tracing do processo, sem dependências obrigatórias.
+
+Contadores e histogramas ficam em memória (`metricas`) e saem no formato texto do
+Prometheus em /metrics (`iniciar_servidor_metricas`). Os decoradores `instrumentar_no`
+e `instrumentar_tool` medem nós e tools; `medir_llm`/`amedir_llm` medem as chamadas
+ao LLM. Spans do OpenTelemetry só são criados se METRICAS_OTEL_ENDPOINT estiver
+configurado e o pacote estiver instalado.
+"""
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config import METRICAS_OTEL_ENDPOINT, METRICAS_PORTA
+from src.logs import obter_logger
+
+log = obter_logger("metricas")
+
+# Buckets padrão de latência (segundos), os mesmos do cliente oficial do Prometheus
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _chave(rotulos: dict) -> tuple:
+    return tuple(sorted(rotulos.items()))
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(chave, extra=None) -> str:
+    pares = list(chave) + list(extra or [])
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nome, ajuda):
+        self.nome = nome
+        self.ajuda = ajuda
+        self._lock = threading.Lock()
+        self._valores = {}
+
+    def inc(self, valor=1, **rotulos):
+        chave = _chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        return self._valores.get(_chave(rotulos), 0)
+
+    def linhas(self):
+        with self._lock:
+            itens = list(self._valores.items())
+        return [f"{self.nome}{_formatar_rotulos(chave)} {valor}" for chave, valor in itens]
+
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, buckets=BUCKETS_LATENCIA):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # rótulos -> [contagens por bucket..., soma, total]
+
+    def observar(self, valor, **rotulos):
+        chave = _chave(rotulos)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [0] * len(self.buckets) + [0.0, 0]
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    serie[i] += 1
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def contagem(self, **rotulos):
+        serie = self._series.get(_chave(rotulos))
+        return serie[-1] if serie else 0
+
+    def linhas(self):
+        with self._lock:
+            itens = [(chave, list(serie)) for chave, serie in self._series.items()]
+        saida = []
+        for chave, serie in itens:
+            for limite, contagem in zip(self.buckets, serie):
+                saida.append(f"{self.nome}_bucket{_formatar_rotulos(chave, [('le', limite)])} {contagem}")
+            saida.append(f"{self.nome}_bucket{_formatar_rotulos(chave, [('le', '+Inf')])} {serie[-1]}")
+            saida.append(f"{self.nome}_sum{_formatar_rotulos(chave)} {serie[-2]}")
+            saida.append(f"{self.nome}_count{_formatar_rotulos(chave)} {serie[-1]}")
+        return saida
+
+
+class RegistroMetricas:
+    """Métricas do processo (em memória), exportadas no formato texto do Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metricas = {}
+
+    def _obter(self, classe, nome, ajuda, **kwargs):
+        with self._lock:
+            if nome not in self._metricas:
+                self._metricas[nome] = classe(nome, ajuda, **kwargs)
+            return self._metricas[nome]
+
+    def contador(self, nome, ajuda="") -> Contador:
+        return self._obter(Contador, nome, ajuda)
+
+    def histograma(self, nome, ajuda="", buckets=BUCKETS_LATENCIA) -> Histograma:
+        return self._obter(Histograma, nome, ajuda, buckets=buckets)
+
+    def exportar_prometheus(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.ajuda}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.linhas())
+        return "\n".join(linhas) + "\n"
+
+
+metricas = RegistroMetricas()
+
+duracao_no = metricas.histograma("banco_no_duracao_segundos", "Duração de cada execução de nó do grafo.")
+duracao_tool = metricas.histograma("banco_tool_duracao_segundos", "Duração de cada chamada de tool.")
+duracao_llm = metricas.histograma("banco_llm_duracao_segundos", "Duração das chamadas ao LLM (sem cache).")
+tokens_llm = metricas.contador("banco_llm_tokens_total", "Tokens de prompt e de resposta consumidos por nó.")
+cache_llm = metricas.contador("banco_cache_llm_total", "Consultas ao cache de respostas do LLM por resultado.")
+roteamento = metricas.contador("banco_roteamento_total", "Decisões de roteamento da triagem por intenção e origem.")
+tokens_historico = metricas.contador("banco_historico_tokens_total", "Tokens estimados do histórico enviados/cortados por nó.")
+duracao_inicio = metricas.histograma("banco_inicio_duracao_segundos", "Etapas do cold start do processo (import, aquecimento, primeira resposta).")
+
+
+# ======================================================
+# --- TRACING (OpenTelemetry opcional) ---
+# ======================================================
+def _criar_tracer():
+    """Só ativa se houver endpoint configurado e o pacote do OpenTelemetry instalado."""
+    if not METRICAS_OTEL_ENDPOINT:
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        log.warning("OpenTelemetry não instalado; tracing desligado",
+                    extra={"campos": {"pacotes": "opentelemetry-sdk opentelemetry-exporter-otlp-proto-http"}})
+        return None
+    provedor = TracerProvider(resource=Resource.create({"service.name": "banco-agil"}))
+    provedor.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=METRICAS_OTEL_ENDPOINT)))
+    trace.set_tracer_provider(provedor)
+    return trace.get_tracer("banco_agil")
+
+
+_tracer = _criar_tracer()
+
+
+def _span(nome, **atributos):
+    if _tracer is None:
+        return contextlib.nullcontext()
+    return _tracer.start_as_current_span(nome, attributes=atributos)
+
+
+# ======================================================
+# --- INSTRUMENTAÇÃO ---
+# ======================================================
+def _instrumentar(funcao, nome_span, registrar):
+    """Envolve uma função sync ou async: mede a duração e abre um span."""
+    if inspect.iscoroutinefunction(funcao):
+        @functools.wraps(funcao)
+        async def envoltorio_async(*args, **kwargs):
+            inicio = time.perf_counter()
+            resultado, erro = None, None
+            with _span(nome_span):
+                try:
+                    resultado = await funcao(*args, **kwargs)
+                    return resultado
+                except Exception as e:
+                    erro = e
+                    raise
+                finally:
+                    registrar(time.perf_counter() - inicio, resultado, erro)
+        return envoltorio_async
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        resultado, erro = None, None
+        with _span(nome_span):
+            try:
+                resultado = funcao(*args, **kwargs)
+                return resultado
+            except Exception as e:
+                erro = e
+                raise
+            finally:
+                registrar(time.perf_counter() - inicio, resultado, erro)
+    return envoltorio
+
+
+def instrumentar_no(no: str):
+    """Decorator dos nós do grafo (sync ou async)."""
+    log_no = obter_logger("grafo")
+
+    def registrar(segundos, resultado, erro):
+        status = "erro" if erro else "ok"
+        duracao_no.observar(segundos, no=no, status=status)
+        campos = {"no": no, "duracao_ms": round(segundos * 1000, 2), "status": status}
+        if isinstance(resultado, dict) and resultado.get("proximo_agente"):
+            campos["proximo_agente"] = resultado["proximo_agente"]
+        if erro:
+            log_no.error("Falha no nó", extra={"campos": {**campos, "erro": repr(erro)}})
+        else:
+            log_no.info("Nó executado", extra={"campos": campos})
+
+    return lambda funcao: _instrumentar(funcao, f"no.{no}", registrar)
+
+
+def _status_tool(resultado, erro) -> str:
+    if erro is not None:
+        return "erro"
+    if isinstance(resultado, dict) and resultado.get("sucesso") is False:
+        return "falha"
+    if isinstance(resultado, str) and resultado.startswith("Erro"):
+        return "falha"
+    return "ok"
+
+
+def instrumentar_tool(funcao):
+    """Decorator das funções de tool (aplicar por baixo do @tool para manter a assinatura)."""
+    log_tool = obter_logger("tools")
+    nome = funcao.__name__
+
+    def registrar(segundos, resultado, erro):
+        status = _status_tool(resultado, erro)
+        duracao_tool.observar(segundos, tool=nome, status=status)
+        log_tool.info("Tool executada", extra={"campos": {"tool": nome, "duracao_ms": round(segundos * 1000, 2), "status": status}})
+
+    return _instrumentar(funcao, f"tool.{nome}", registrar)
+
+
+def registrar_llm(no, resposta, segundos):
+    duracao_llm.observar(segundos, no=no)
+    uso = getattr(resposta, "usage_metadata", None) or {}
+    if uso:
+        tokens_llm.inc(uso.get("input_tokens", 0), no=no, tipo="prompt")
+        tokens_llm.inc(uso.get("output_tokens", 0), no=no, tipo="resposta")
+
+
+def medir_llm(no, invocar, mensagens):
+    inicio = time.perf_counter()
+    with _span(f"llm.{no}"):
+        resposta = invocar(mensagens)
+    registrar_llm(no, resposta, time.perf_counter() - inicio)
+    return resposta
+
+
+async def amedir_llm(no, ainvocar, mensagens):
+    inicio = time.perf_counter()
+    with _span(f"llm.{no}"):
+        resposta = await ainvocar(mensagens)
+    registrar_llm(no, resposta, time.perf_counter() - inicio)
+    return resposta
+
+
+# ======================================================
+# --- ENDPOINT /metrics ---
+# ======================================================
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        corpo = metricas.exportar_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass  # Sem log de acesso a cada scrape
+
+
+_servidor = None
+_lock_servidor = threading.Lock()
+
+
+def iniciar_servidor_metricas(porta: int = METRICAS_PORTA):
+    """Sobe o /metrics numa thread (uma vez por processo). Porta 0 = desligado."""
+    global _servidor
+    if not porta:
+        return None
+    with _lock_servidor:
+        if _servidor is None:
+            try:
+                _servidor = ThreadingHTTPServer(("0.0.0.0", porta), _HandlerMetricas)
+            except OSError as e:
+                log.warning("Não foi possível abrir o endpoint de métricas", extra={"campos": {"porta": porta, "erro": str(e)}})
+                return None
+            threading.Thread(target=_servidor.serve_forever, daemon=True).start()
+            log.info("Endpoint de métricas no ar", extra={"campos": {"url": f"http://localhost:{porta}/metrics"}})
+    return _servidor
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+
+
+def assinatura_arquivo(caminho: str):
+    """(mtime, tamanho, inode) do arquivo, ou None se ele não existe."""
+    try:
+        info = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+class ArquivoMonitorado:
+    """
+    Mantém em memória uma versão já processada de um arquivo do disco.
+    O arquivo só é relido quando a assinatura (mtime, tamanho, inode) muda.
+    As subclasses implementam `_carregar()`.
+    """
+
+    def __init__(self, caminho: str, intervalo_verificacao: float = 1.0):
+        self.caminho = caminho
+        # Evita um os.stat() a cada chamada: só olha o disco de tempos em tempos
+        self.intervalo_verificacao = intervalo_verificacao
+        self._lock = threading.Lock()
+        self._dados = None
+        self._assinatura = None
+        self._ultima_verificacao = 0.0
+
+    def _assinatura_atual(self):
+        return assinatura_arquivo(self.caminho)
+
+    def _carregar(self):
+        raise NotImplementedError
+
+    def obter(self):
+        dados = self._dados
+        agora = time.monotonic()
+        if dados is not None and agora - self._ultima_verificacao < self.intervalo_verificacao:
+            return dados
+
+        assinatura = self._assinatura_atual()
+        if dados is not None and assinatura == self._assinatura:
+            self._ultima_verificacao = agora
+            return dados
+
+        with self._lock:
+            # Outra thread pode ter recarregado enquanto esperávamos o lock
+            assinatura = self._assinatura_atual()
+            if self._dados is None or assinatura != self._assinatura:
+                self._dados = self._carregar()
+                self._assinatura = assinatura
+            self._ultima_verificacao = time.monotonic()
+            return self._dados
+
+    def invalidar(self):
+        """Força a releitura na próxima chamada (ex: após uma escrita deste processo)."""
+        with self._lock:
+            self._dados = None
+            self._assinatura = None
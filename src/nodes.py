@@ -1,22 +1,33 @@
 # src/nodes.py
+import math
 import re
-from dotenv import load_dotenv
-load_dotenv()
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, AIMessage
-from langchain_community.tools.tavily_search import TavilySearchResults
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langgraph.constants import TAG_NOSTREAM
 
 from src.state import BankState
+from src.roteador import decisao_rapida, intencao_da_resposta_llm, metricas_roteador, DecisaoRota
+from src.cache_llm import invocar_com_cache, ainvocar_com_cache
+from src.historico import politica_historico
+from src.logs import obter_logger
+from src.metricas import amedir_llm, instrumentar_no, medir_llm, roteamento
+from src import entrevista, guardas, perfil_sessao
+from src.config import LOGIN_BLOQUEIO_SEGUNDOS, LOGIN_MAX_TENTATIVAS
+from src.extracao import extrair_credenciais
+from src.perfil_sessao import CAMPOS_PERFIL_VAZIO
 from src.tools import (
     validar_cpf,
     consultar_limite,
     solicitar_aumento_limite,
     atualizar_score_entrevista,
+    consultar_cotacao,
+    consultar_historico_solicitacoes,
 )
 
-llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0)
-
 
 # ======================================================
 # --- CENTRAL DE PROMPTS (Fácil de editar) ---
@@ -25,12 +36,17 @@ PROMPTS = {
     "sistema_bia_sem_dados": """Você é a **Bia**, a consultora digital do **Banco Ágil**, seja simpática e atenciosa.
     **Sua Diretriz Principal:** NENHUMA informação ou serviço pode ser discutido antes da identificação do cliente.
     **Fluxo de Atendimento Obrigatório:**
-    1. **Saudação e Identificação:** Apresente-se e peça o CPF.
-    2. **Oferta de Serviços:** APENAS após validar o CPF, apresente o menu:
-       - Consultar Limite de Crédito.
-       - Entrevista para Aumento de Score.
-       - Câmbio de Moedas.
-    **Regra de Ouro:** Se o usuário perguntar algo antes do CPF, peça a identificação educadamente.""",
+    1. **Saudação e Identificação:** - Ao iniciar a conversa, apresente-se brevemente e solicite IMEDIATAMENTE o
+    CPF do cliente para acessar o ambiente seguro.
+    - *Exemplo de fala:* "Olá! Sou a Bia do Banco Ágil. Para começarmos e eu acessar seus dados com segurança,
+    por favor, digite o seu CPF."
+    2. **Oferta de Serviços:** - APENAS após o usuário fornecer o CPF, valide o recebimento (simule uma confirmação)
+    e apresente o menu:
+        - Consultar Limite de Crédito.
+        - Entrevista para Aumento de Score.
+        - Câmbio de Moedas.
+    **Regra de Ouro:** Se o usuário perguntar qualquer coisa ou solicitar um serviço antes de fornecer o CPF,
+    explique educadamente que precisa da identificação primeiro para prosseguir.""",
 
     "sistema_bia_com_dados": "Use a ferramenta 'validar_cpf' com os dados informados.",
 
@@ -43,27 +59,150 @@ PROMPTS = {
     Responda APENAS UMA palavra:
     CAMBIO      -> Moeda, dólar, euro, cotação.
     ENTREVISTA  -> Entrevista, perguntas, sim (se foi oferecido entrevista), aumento de score.
-    CREDITO     -> Limite de crédito, aumento, crédito, cartão, menu.
+    CREDITO     -> Limite de crédito, aumento, crédito, cartão.
     
-    Se for saudação ou não souber, mande para CREDITO.
+    Se for saudação ou não souber, mande para CREDITO (Menu Principal).
     """,
 
     "credito": "Especialista de Crédito, seja simpática e atenciosa. CPF: {cpf}. Use tools. Sem LaTeX.",
     
-    "cambio": "Especialista de Câmbio, seja simpática e atenciosa. Use Tavily.",
+    "cambio": "Especialista de Câmbio, seja simpática e atenciosa. Use a tool 'consultar_cotacao' e informe compra, venda e a data da cotação. Sem LaTeX.",
     
-    "entrevista": """Agente de Entrevista seja simpática e atenciosa. CPF: {cpf}. Faça 5 perguntas, uma por vez de forma educada, são elas:
-        Qual é a sua renda mensal atual?
-        Quais são suas despesas fixas mensais?
-        Você está empregado? Se sim, qual é o seu tipo de emprego (formal, autônomo ou desempregado)?
-        Você tem dependentes? Se sim, quantos?
-        Você possui dívidas atualmente? (Sim ou Não)
-        Chame tool no final. Diga REDIRECIONANDO e pergunte se o cliente gostaria de realizar uma nova análise de crédito"""
+    "entrevista": """Agente de Entrevista seja simpática e atenciosa. CPF: {cpf}.
+        A entrevista é conduzida pelo sistema; você só entra quando a resposta do cliente não foi entendida.
+        Pergunta atual: "{pergunta}"
+        Peça educadamente que o cliente responda de novo no formato: {formato}.
+        Não faça outras perguntas e não calcule o score."""
 }
 
+# Compilados uma vez: os prompts de sistema viram texto (chave do cache e do orçamento de histórico);
+# o do classificador já sai como mensagem do usuário.
+_TEMPLATES = {
+    chave: PromptTemplate.from_template(texto) for chave, texto in PROMPTS.items() if chave != "classificador"
+}
+_TEMPLATE_CLASSIFICADOR = ChatPromptTemplate.from_messages([("human", PROMPTS["classificador"])])
+
+
+def _prompt(chave: str, **variaveis) -> str:
+    return _TEMPLATES[chave].format(**variaveis)
+
+
+# Respostas da validação feita direto na triagem (CPF e data extraídos localmente, sem LLM)
+MSG_BOAS_VINDAS = ("Prontinho, {nome}, você está autenticado(a)! Posso ajudar com:\n"
+                   "- Consultar Limite de Crédito.\n- Entrevista para Aumento de Score.\n- Câmbio de Moedas.\n"
+                   "O que você precisa?")
+MSG_FALHA_VALIDACAO = ("Não encontrei um cliente com esse CPF e essa data de nascimento. "
+                       "Confira os dados e tente de novo, por favor.")
+
+
+# ======================================================
+# --- LLMs PRÉ-MONTADOS (tools já ligadas) ---
+# ======================================================
+class RegistroRunnables:
+    """
+    Um runnable por papel, com as tools já ligadas (bind_tools uma vez por processo).
+    Montado no primeiro uso: o cliente da OpenAI só é importado quando um nó precisa do LLM.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runnables = None
+        self._llm = None
+        self._llm_classificador = None
+
+    def configurar(self, llm=None, llm_classificador=None):
+        """Troca os modelos base (ex: LLM falso nos benches) e remonta o registro."""
+        with self._lock:
+            self._llm = llm or self._llm
+            self._llm_classificador = llm_classificador or self._llm_classificador
+            self._runnables = None
+
+    def _montar(self) -> dict:
+        if self._llm is None or self._llm_classificador is None:
+            from src.clientes_llm import llm, llm_classificador
+            self._llm = self._llm or llm
+            self._llm_classificador = self._llm_classificador or llm_classificador
+        return {
+            "triagem_conversa": self._llm,
+            "triagem_validacao": self._llm.bind_tools([validar_cpf]),
+            "credito": self._llm.bind_tools([consultar_limite, solicitar_aumento_limite, consultar_historico_solicitacoes]),
+            "cambio": self._llm.bind_tools([consultar_cotacao]),
+            "entrevista": self._llm,
+            # O rótulo de rota do classificador não é resposta: fica fora do stream de tokens
+            "classificador": self._llm_classificador.with_config(tags=[TAG_NOSTREAM]),
+        }
+
+    def __getitem__(self, papel: str):
+        runnables = self._runnables
+        if runnables is None:
+            with self._lock:
+                if self._runnables is None:
+                    self._runnables = self._montar()
+                runnables = self._runnables
+        return runnables[papel]
+
+
+runnables = RegistroRunnables()
+
+
+# ======================================================
+# --- EXECUÇÃO (mesma lógica para o grafo sync e async) ---
+# ======================================================
+@dataclass
+class ChamadaLLM:
+    """
+    Chamada ao LLM que um nó precisa fazer. O nó só monta o pedido;
+    quem executa (`_executar` ou `_aexecutar`) decide entre invoke e ainvoke.
+    """
+    no: str
+    llm: Any
+    msg_sistema: Optional[str]
+    mensagens: list
+    finalizar: Callable[[Any], dict]
+    escopo: Optional[str] = None
+    usar_cache: bool = True
+
+
+@dataclass
+class ValidacaoDireta:
+    """CPF e data sem ambiguidade: a triagem chama o validar_cpf direto, sem LLM nem nó de tools."""
+    cpf: str
+    data_nascimento: str
+
+    def argumentos(self) -> dict:
+        return {"cpf": self.cpf, "data_nascimento": self.data_nascimento}
+
+
+log = obter_logger("nodes")
+
+
+def _executar(plano, state):
+    if isinstance(plano, ValidacaoDireta):
+        return _concluir_validacao(state, validar_cpf.invoke(plano.argumentos()))
+    if not isinstance(plano, ChamadaLLM):
+        return plano
+    if plano.usar_cache:
+        resposta = invocar_com_cache(plano.no, plano.llm, plano.msg_sistema, plano.mensagens, plano.escopo)
+    else:
+        resposta = medir_llm(plano.no, plano.llm.invoke, plano.mensagens)
+    return {**plano.finalizar(resposta), **guardas.contar_hop(state)}
+
+
+async def _aexecutar(plano, state):
+    if isinstance(plano, ValidacaoDireta):
+        # ainvoke da tool roda a consulta num executor: o event loop segue atendendo outras conversas
+        return _concluir_validacao(state, await validar_cpf.ainvoke(plano.argumentos()))
+    if not isinstance(plano, ChamadaLLM):
+        return plano
+    if plano.usar_cache:
+        resposta = await ainvocar_com_cache(plano.no, plano.llm, plano.msg_sistema, plano.mensagens, plano.escopo)
+    else:
+        resposta = await amedir_llm(plano.no, plano.llm.ainvoke, plano.mensagens)
+    return {**plano.finalizar(resposta), **guardas.contar_hop(state)}
+
+
 # --- NÓ 1: TRIAGEM UNIFICADA (Autentica + Direciona) ---
-def node_triagem(state: BankState):
-    print("--- NODE: TRIAGEM (SUPER) ---")
+def _planejar_triagem(state: BankState):
     
     mensagens = state["messages"]
     ultima_msg = mensagens[-1]
@@ -73,7 +212,7 @@ def node_triagem(state: BankState):
     
     # Se o usuário disse alguma dessas palavras
     if any(termo in texto for termo in termos_saida):
-        print("Usuário solicitou encerramento.")
+        log.info("Usuário solicitou encerramento")
         
         # Mensagem de despedida
         msg_tchau = AIMessage(content="Atendimento encerrado com segurança. Obrigado por usar o Banco Ágil! Se precisar, é só chamar novamente. 👋")
@@ -84,121 +223,203 @@ def node_triagem(state: BankState):
         return {
             "messages": [msg_tchau],
             "autenticado": False,  # <--- Desloga
-            "cpf": None,           # <--- Esquece o CPF
+            **CAMPOS_PERFIL_VAZIO, # <--- Esquece CPF e perfil do cliente
             "ultimo_agente": None, # <--- Limpa o histórico
-            "tentativas_falhas": 0 # <--- Reseta erros
+            "tentativas_falhas": 0, # <--- Reseta erros
+            "temp_entrevista": None # <--- Abandona entrevista em andamento
         }
 
     # 1. LÓGICA DE RETORNO RÁPIDO (Sticky Routing)
-    # Se o usuário estava falando com um especialista, mandamos de volta pra ele
-    # sem nem pensar. Isso mantém o usuário "preso" na entrevista ou no crédito.
-    ultimo_agente = state.get("ultimo_agente")
-    
-    if ultimo_agente == "entrevista":
-        # Verifica se a entrevista acabou (pela palavra chave do agente)
-        if len(mensagens) > 1:
-            msg_robo_anterior = mensagens[-2].content.upper()
-            if "REDIRECIONANDO" in msg_robo_anterior:
-                print("-> Fim da entrevista detectado. Liberando para Crédito.")
-                return {"proximo_agente": "credito"}
-        
-        print("-> Mantendo usuário preso na ENTREVISTA.")
+    # Com uma entrevista em andamento (temp_entrevista), o usuário volta direto pra ela.
+    # A entrevista só é abandonada se a resposta não encaixa na pergunta atual e o texto
+    # claramente pede outro serviço (ex: "quero ver o dólar").
+    progresso = state.get("temp_entrevista")
+    if progresso and entrevista.concluida(progresso):
+        # Turno interrompido antes de gravar o score: a entrevista reenvia a chamada da tool
+        log.info("Entrevista concluída sem score gravado, retomando")
+        return {"proximo_agente": "entrevista"}
+    if progresso:
+        _, entendeu = entrevista.registrar_resposta(progresso, ultima_msg.content)
+        desvio = None if entendeu else decisao_rapida(texto, "")
+        if desvio is not None and desvio.intencao != "entrevista":
+            log.info("Entrevista abandonada", extra={"campos": {"pedido": desvio.intencao}})
+            return {**_direcionar(desvio), "temp_entrevista": None}
+
+        log.info("Mantendo usuário na entrevista", extra={"campos": {"etapa": progresso["etapa"]}})
         return {"proximo_agente": "entrevista"}
 
     # 2. LÓGICA DE AUTENTICAÇÃO 
-    if not (state.get("autenticado") and state.get("cpf")):
+    # Volta do validar_cpf: o LLM responde o resultado (o login já foi gravado pelo nó de tools)
+    if isinstance(ultima_msg, ToolMessage) or not (state.get("autenticado") and state.get("cpf")):
         # -- Sub-fluxo de Autenticação --
+        if not isinstance(ultima_msg, ToolMessage):
+            credenciais = extrair_credenciais(ultima_msg.content)
+            anterior = next((m for m in reversed(mensagens[:-1]) if isinstance(m, HumanMessage)), None)
+            if not credenciais.completas and anterior is not None:
+                credenciais = credenciais.completar(extrair_credenciais(anterior.content))
+            # Dígito verificador só escolhe o atalho: fora dele, o LLM e o validar_cpf decidem pela base
+            if credenciais.completas:
+                log.info("Triagem: validando CPF direto (sem LLM)")
+                return ValidacaoDireta(credenciais.cpfs_validos[0], credenciais.datas[0])
+
         qtd_numeros = len(re.findall(r"\d", texto))
         
         if qtd_numeros < 3:
             # Modo Conversa (Sem dados)
-            print("-> Triagem: Conversando (Sem dados).")
-            llm_ativo = llm
-            msg_sistema = """Você é a **Bia**, a consultora digital do **Banco Ágil**, seja simpática e atenciosa.
-            **Sua Diretriz Principal:** NENHUMA informação ou serviço pode ser discutido antes da identificação do cliente.
-            **Fluxo de Atendimento Obrigatório:**
-            1. **Saudação e Identificação:** - Ao iniciar a conversa, apresente-se brevemente e solicite IMEDIATAMENTE o 
-            CPF do cliente para acessar o ambiente seguro.
-            - *Exemplo de fala:* "Olá! Sou a Bia do Banco Ágil. Para começarmos e eu acessar seus dados com segurança, 
-            por favor, digite o seu CPF."
-            2. **Oferta de Serviços:** - APENAS após o usuário fornecer o CPF, valide o recebimento (simule uma confirmação) 
-            e apresente o menu:
-                - Consultar Limite de Crédito.
-                - Entrevista para Aumento de Score.
-                - Câmbio de Moedas.
-            **Regra de Ouro:** Se o usuário perguntar qualquer coisa ou solicitar um serviço antes de fornecer o CPF, 
-            educadamente que precisa da identificação primeiro para prosseguir..
-            """
+            log.info("Triagem: conversando (sem dados)")
+            runnable = runnables["triagem_conversa"]
+            msg_sistema = _prompt("sistema_bia_sem_dados")
         else:
             # Modo Validação (Com dados)
-            print("-> Triagem: Validando CPF.")
-            ferramentas = [validar_cpf]
-            llm_ativo = llm.bind_tools(ferramentas)
-            msg_sistema = "Use a ferramenta 'validar_cpf' com os dados informados."
+            log.info("Triagem: validando CPF")
+            runnable = runnables["triagem_validacao"]
+            msg_sistema = _prompt("sistema_bia_com_dados")
 
-        resposta = llm_ativo.invoke([SystemMessage(content=msg_sistema)] + mensagens)
-        return {"messages": [resposta], "ultimo_agente": "triagem"}
+        ctx = politica_historico.aplicar("triagem", state, msg_sistema)
+        return ChamadaLLM(
+            "triagem", runnable, ctx.msg_sistema, ctx.mensagens,
+            finalizar=lambda resposta: {"messages": [resposta], "ultimo_agente": "triagem", **ctx.atualizacao},
+        )
 
     # 3. LÓGICA DE DIRECIONAMENTO 
-    print("-> Usuário Autenticado. Triagem decidindo destino...")
+    log.info("Usuário autenticado, triagem decidindo destino")
     
     # Recupera contexto anterior para decisão melhor
     contexto_anterior = ""
     if len(mensagens) > 1 and isinstance(mensagens[-2], AIMessage):
         contexto_anterior = mensagens[-2].content
 
-    prompt_classificacao = f"""
-    O usuário já está autenticado. Direcione-o para o agente correto.
-    
-    CONTEXTO: O Robô disse: "{contexto_anterior}"
-    USUÁRIO disse: "{texto}"
-    
-    Responda APENAS UMA palavra:
-    CAMBIO      -> Moeda, dólar, euro, cotação.
-    ENTREVISTA  -> Entrevista, perguntas, sim (se foi oferecido entrevista), aumento de score.
-    CREDITO     -> Limite de crédito, aumento, crédito, cartão.
-    
-    Se for saudação ou não souber, mande para CREDITO (Menu Principal).
-    """
-    
-    classificador = ChatOpenAI(model="gpt-4.1-mini", temperature=1)
-    resposta_class = classificador.invoke(prompt_classificacao)
-    intencao = resposta_class.content.strip().upper()
-    
-    print(f"Direcionando para: {intencao}")
-    
-    if "CAMBIO" in intencao: return {"proximo_agente": "cambio"}
-    if "ENTREVISTA" in intencao: return {"proximo_agente": "entrevista"}
-    return {"proximo_agente": "credito"} # Padrão
+    # Caminho rápido por palavras-chave; o LLM só é chamado quando a confiança é baixa
+    decisao = decisao_rapida(texto, contexto_anterior)
+    if decisao is not None:
+        return _direcionar(decisao)
+
+    return ChamadaLLM(
+        "classificador", runnables["classificador"], None,
+        _TEMPLATE_CLASSIFICADOR.format_messages(contexto_anterior=contexto_anterior, texto=texto),
+        finalizar=lambda resposta: _direcionar(DecisaoRota(intencao_da_resposta_llm(resposta.content), 1.0, "llm")),
+        usar_cache=False,
+    )
+
+def _concluir_validacao(state: BankState, resultado: dict):
+    """Resposta da triagem para uma `ValidacaoDireta` (login, bloqueio ou falha)."""
+    sucesso = bool(resultado.get("sucesso"))
+    atualizacao = {"ultimo_agente": "triagem", **guardas.contabilizar_validacoes(state, [sucesso])}
+    if sucesso:
+        atualizacao.update(perfil_sessao.login(resultado["dados"]["cpf"]))
+        nome = str(resultado["dados"].get("nome") or "").split(" ")[0]
+        texto = MSG_BOAS_VINDAS.format(nome=nome)
+    elif atualizacao.get("bloqueado_ate"):
+        texto = guardas.MSG_BLOQUEIO.format(tentativas=LOGIN_MAX_TENTATIVAS,
+                                            minutos=math.ceil(LOGIN_BLOQUEIO_SEGUNDOS / 60))
+    else:
+        texto = MSG_FALHA_VALIDACAO
+    return {"messages": [AIMessage(content=texto)], **atualizacao}
+
+def _direcionar(decisao: DecisaoRota):
+    metricas_roteador.registrar(decisao)
+    roteamento.inc(intencao=decisao.intencao, origem=decisao.origem)
+    log.info("Direcionando", extra={"campos": {"destino": decisao.intencao, "origem": decisao.origem, "confianca": decisao.confianca}})
+    return {"proximo_agente": decisao.intencao}
+
+# Bloqueio de login e limite de mensagens são checados antes de qualquer chamada ao LLM
+@instrumentar_no("triagem")
+def node_triagem(state: BankState):
+    resposta, controle = guardas.controle_sessao(state)
+    if resposta is not None:
+        return resposta
+    return {**_executar(_planejar_triagem(state), state), **controle}
+
+@instrumentar_no("triagem")
+async def anode_triagem(state: BankState):
+    resposta, controle = guardas.controle_sessao(state)
+    if resposta is not None:
+        return resposta
+    return {**(await _aexecutar(_planejar_triagem(state), state)), **controle}
 
 # ======================================================
-# --- NÓS ESPECIALISTAS (MANTENHA IGUAL) ---
+# --- NÓS ESPECIALISTAS (planos de ChamadaLLM executados por _executar/_aexecutar) ---
 # ======================================================
-def node_credito(state: BankState):
-    print("--- NODE: CRÉDITO ---")
+def _planejar_credito(state: BankState):
     cpf_usuario = state.get("cpf")
-    msg = f"Especialista de Crédito, seja simpática e atenciosa. CPF: {cpf_usuario}. Use tools. Sem LaTeX."
-    tools = [consultar_limite, solicitar_aumento_limite]
-    resp = llm.bind_tools(tools).invoke([SystemMessage(content=msg)] + state["messages"])
-    return {"messages": [resp], "ultimo_agente": "credito"}
+    ctx = politica_historico.aplicar("credito", state, _prompt("credito", cpf=cpf_usuario))
+    return ChamadaLLM(
+        "credito", runnables["credito"], ctx.msg_sistema, ctx.mensagens, escopo=cpf_usuario,
+        finalizar=lambda resp: {"messages": [resp], "ultimo_agente": "credito", **ctx.atualizacao},
+    )
+
+def _planejar_cambio(state: BankState):
+    ctx = politica_historico.aplicar("cambio", state, _prompt("cambio"))
+    return ChamadaLLM(
+        "cambio", runnables["cambio"], ctx.msg_sistema, ctx.mensagens,
+        finalizar=lambda resp: {"messages": [resp], "ultimo_agente": "cambio", **ctx.atualizacao},
+    )
+
+def _planejar_entrevista(state: BankState):
+    cpf = state.get("cpf")
+    progresso = state.get("temp_entrevista")
+    ultima_msg = state["messages"][-1]
+
+    # Volta da tool: score gravado, entrevista encerrada
+    if isinstance(ultima_msg, ToolMessage) and ultima_msg.name == "atualizar_score_entrevista":
+        resultado = str(ultima_msg.content)
+        achado = re.search(r"recalculado para (\d+)", resultado)
+        if achado:
+            resultado = f"Prontinho! Seu novo score é **{achado.group(1)}** e o seu cadastro já foi atualizado."
+        texto = f"{resultado}\n\n{entrevista.PERGUNTA_FINAL}"
+        return {"messages": [AIMessage(content=texto)], "temp_entrevista": None, "ultimo_agente": "entrevista"}
 
+    # Início: primeira pergunta, sem LLM
+    if not progresso:
+        texto = f"{entrevista.ABERTURA}\n\n{entrevista.PERGUNTAS[0].texto}"
+        return {"messages": [AIMessage(content=texto)], "temp_entrevista": entrevista.iniciar(), "ultimo_agente": "entrevista"}
+
+    # Todas as respostas já estavam em mãos (turno interrompido antes da tool): reenvia a chamada
+    if entrevista.concluida(progresso):
+        log.info("Entrevista já concluída, reenviando o recálculo de score")
+        chamada = AIMessage(content="", tool_calls=[entrevista.chamada_score(cpf, progresso)])
+        return {"messages": [chamada], "ultimo_agente": "entrevista"}
+
+    novo, entendeu = entrevista.registrar_resposta(progresso, ultima_msg.content)
+    if entendeu:
+        if entrevista.concluida(novo):
+            # Todas as respostas em mãos: chama a tool direto pelo ToolNode
+            log.info("Entrevista concluída, recalculando score")
+            chamada = AIMessage(content="", tool_calls=[entrevista.chamada_score(cpf, novo)])
+            return {"messages": [chamada], "temp_entrevista": novo, "ultimo_agente": "entrevista"}
+        texto = entrevista.pergunta_atual(novo).texto
+        return {"messages": [AIMessage(content=texto)], "temp_entrevista": novo, "ultimo_agente": "entrevista"}
+
+    # Resposta que não deu para interpretar: o LLM pede esclarecimento (sem tools)
+    log.info("Resposta não entendida, pedindo esclarecimento ao LLM", extra={"campos": {"etapa": progresso["etapa"]}})
+    pergunta = entrevista.pergunta_atual(novo)
+    msg = _prompt("entrevista", cpf=cpf, pergunta=pergunta.texto, formato=pergunta.formato)
+    ctx = politica_historico.aplicar("entrevista", state, msg)
+    return ChamadaLLM(
+        "entrevista", runnables["entrevista"], ctx.msg_sistema, ctx.mensagens, escopo=cpf,
+        finalizar=lambda resp: {"messages": [resp], "temp_entrevista": novo, "ultimo_agente": "entrevista", **ctx.atualizacao},
+    )
+
+@instrumentar_no("credito")
+def node_credito(state: BankState):
+    return _executar(_planejar_credito(state), state)
+
+@instrumentar_no("credito")
+async def anode_credito(state: BankState):
+    return await _aexecutar(_planejar_credito(state), state)
+
+@instrumentar_no("cambio")
 def node_cambio(state: BankState):
-    print("--- NODE: CÂMBIO ---")
-    msg = "Especialista de Câmbio, seja simpática e atenciosa. Use Tavily."
-    tool = TavilySearchResults(max_results=1)
-    resp = llm.bind_tools([tool]).invoke([SystemMessage(content=msg)] + state["messages"])
-    return {"messages": [resp], "ultimo_agente": "cambio"}
+    return _executar(_planejar_cambio(state), state)
+
+@instrumentar_no("cambio")
+async def anode_cambio(state: BankState):
+    return await _aexecutar(_planejar_cambio(state), state)
 
+@instrumentar_no("entrevista")
 def node_entrevista(state: BankState):
-    print("--- NODE: ENTREVISTA ---")
-    cpf = state.get("cpf")
-    msg = f"""Agente de Entrevista seja simpática e atenciosa. CPF: {cpf}. Faça 5 perguntas, uma por vez de forma educada, são elas:
-        Qual é a sua renda mensal atual?
-        Quais são suas despesas fixas mensais?
-        Você está empregado? Se sim, qual é o seu tipo de emprego (formal, autônomo ou desempregado)?
-        Você tem dependentes? Se sim, quantos?
-        Você possui dívidas atualmente? (Sim ou Não)
-        Chame tool no final. Diga REDIRECIONANDO e pergunte se o cliente gostaria de realizar uma nova análise de crédito"""
-    tools = [atualizar_score_entrevista]
-    resp = llm.bind_tools(tools).invoke([SystemMessage(content=msg)] + state["messages"])
-    return {"messages": [resp], "ultimo_agente": "entrevista"}
\ No newline at end of file
+    return _executar(_planejar_entrevista(state), state)
+
+@instrumentar_no("entrevista")
+async def anode_entrevista(state: BankState):
+    return await _aexecutar(_planejar_entrevista(state), state)
@@ -0,0 +1,82 @@
+# src/perfil_sessao.py
+# Perfil do cliente autenticado guardado no estado da sessão (cpf, nome, dados_cliente e a
+# versão das alterações dele no armazém). Preenchido quando o validar_cpf dá certo; nos hops de
+# tools seguintes as leituras desse cliente saem do perfil (sem índice nem armazém completo).
+# Antes de cada hop, a versão no armazém é conferida (uma leitura pontual): se outra sessão, o
+# recálculo de scores ou a consolidação mexeram no cliente, o perfil é recarregado. Qualquer tool
+# de escrita executada no próprio hop também recarrega o perfil com a versão nova.
+import json
+
+from langchain_core.messages import ToolMessage
+
+from src.guardas import TOOLS_MEMOIZAVEIS
+from src.logs import obter_logger
+from src.repositorio import repositorio_clientes
+
+log = obter_logger("perfil_sessao")
+
+# Campos limpos no logout
+CAMPOS_PERFIL_VAZIO = {"cpf": None, "nome": None, "dados_cliente": None, "versao_cliente": None}
+
+
+def perfis(state) -> dict:
+    """{cpf: cliente} para semear o snapshot do hop de tools (vazio se a sessão não está autenticada)."""
+    dados = state.get("dados_cliente")
+    if not (state.get("autenticado") and state.get("cpf") and dados):
+        return {}
+    return {state["cpf"]: dados}
+
+
+def _cpf_validado(msg: ToolMessage):
+    try:
+        conteudo = json.loads(msg.content)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(conteudo, dict) or not conteudo.get("sucesso"):
+        return None
+    return (conteudo.get("dados") or {}).get("cpf")
+
+
+def _carregar(cpf: str) -> dict:
+    cliente, versao = repositorio_clientes.perfil(cpf)
+    if cliente is None:
+        return {}
+    return {"cpf": str(cliente["cpf"]), "nome": cliente.get("nome"), "dados_cliente": cliente, "versao_cliente": versao}
+
+
+def login(cpf: str) -> dict:
+    """Atualização de estado de uma validação bem-sucedida: sessão autenticada com o perfil do cliente."""
+    log.info("Cliente autenticado; perfil carregado na sessão")
+    return {"autenticado": True, **_carregar(cpf)}
+
+
+def conferir_versao(state) -> dict:
+    """Recarga do perfil se a versão do cliente no armazém mudou desde que ele foi lido (senão {})."""
+    if not perfis(state):
+        return {}
+    versao = repositorio_clientes.versao(state["cpf"])
+    if versao == state.get("versao_cliente"):
+        return {}
+    log.info("Cliente alterado fora da sessão; perfil recarregado",
+             extra={"campos": {"versao_sessao": state.get("versao_cliente"), "versao": versao}})
+    return _carregar(state["cpf"])
+
+
+def atualizar_perfil(state, chamadas: list, executadas: list) -> dict:
+    """Atualização de estado do nó de tools: login (validar_cpf com sucesso) ou recarga depois de uma escrita."""
+    for msg in executadas:
+        if isinstance(msg, ToolMessage) and msg.name == "validar_cpf":
+            cpf = _cpf_validado(msg)
+            if cpf is not None:
+                return login(cpf)
+
+    if not perfis(state):
+        return {}
+    por_id = {chamada["id"]: chamada["name"] for chamada in chamadas}
+    escreveu = any(por_id.get(msg.tool_call_id) not in TOOLS_MEMOIZAVEIS for msg in executadas)
+    if not escreveu:
+        return {}
+    atualizacao = _carregar(state["cpf"])
+    if atualizacao.get("versao_cliente") != state.get("versao_cliente"):
+        log.info("Perfil da sessão recarregado", extra={"campos": {"versao": atualizacao.get("versao_cliente")}})
+    return atualizacao
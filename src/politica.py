@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.config import SCORE_CSV
+from src.monitor_arquivo import ArquivoMonitorado
+
+# Acima disso a tabela densa deixaria de caber com folga na memória
+MAX_TAMANHO_TABELA = 1_000_000
+
+
+def decidir_aumento(novo_limite, limite_maximo):
+    """
+    Regra única do pedido de aumento (tool do chat e decisão em lote): aprovado se o valor
+    pedido cabe no limite da faixa do score. Aceita escalares (devolve str) ou arrays.
+    """
+    aprovado = np.asarray(novo_limite, dtype=float) <= np.asarray(limite_maximo, dtype=float)
+    status = np.where(aprovado, "aprovado", "rejeitado")
+    return str(status) if status.ndim == 0 else status
+
+
+class TabelaLimites:
+    """
+    Faixas de `score_limite.csv` compiladas numa tabela densa indexada pelo score inteiro.
+    A tabela é pintada na ordem inversa do arquivo, então em faixas sobrepostas vale
+    a PRIMEIRA linha do CSV (mesmo resultado do antigo filtro + iloc[0]).
+    Score fora de toda faixa -> limite 0.0 e faixa -1.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.faixas = [
+            (float(r.score_min), float(r.score_max), float(r.limite_maximo))
+            for r in df.itertuples(index=False)
+        ]
+
+        self.base = 0
+        self._limites = np.zeros(0)
+        self._indices = np.full(0, -1, dtype=np.int32)
+        if not self.faixas:
+            return
+
+        inicio = math.ceil(min(f[0] for f in self.faixas))
+        fim = math.floor(max(f[1] for f in self.faixas))
+        if fim < inicio or fim - inicio + 1 > MAX_TAMANHO_TABELA:
+            return  # Sem tabela densa: tudo cai no caminho de varredura das faixas
+
+        self.base = inicio
+        self._limites = np.zeros(fim - inicio + 1)
+        self._indices = np.full(fim - inicio + 1, -1, dtype=np.int32)
+        for indice in range(len(self.faixas) - 1, -1, -1):
+            score_min, score_max, limite = self.faixas[indice]
+            de = max(math.ceil(score_min), inicio) - inicio
+            ate = min(math.floor(score_max), fim) - inicio
+            if ate >= de:
+                self._limites[de:ate + 1] = limite
+                self._indices[de:ate + 1] = indice
+
+    def _varrer(self, score: float) -> int:
+        # Caminho lento (score não inteiro ou fora da tabela): mesma regra do filtro original
+        for indice, (score_min, score_max, _) in enumerate(self.faixas):
+            if score_min <= score <= score_max:
+                return indice
+        return -1
+
+    def faixa(self, score: float) -> int:
+        if math.isfinite(score) and score == int(score):
+            pos = int(score) - self.base
+            if 0 <= pos < len(self._indices):
+                return int(self._indices[pos])
+        return self._varrer(score)
+
+    def limite_maximo(self, score: float) -> float:
+        indice = self.faixa(score)
+        return self.faixas[indice][2] if indice >= 0 else 0.0
+
+    def faixas_lote(self, scores) -> np.ndarray:
+        scores = np.asarray(scores, dtype=float)
+        resultado = np.full(scores.shape, -1, dtype=np.int32)
+        finitos = np.isfinite(scores)
+        pos = np.where(finitos, scores - self.base, -1.0)
+        na_tabela = finitos & (pos == np.floor(pos)) & (pos >= 0) & (pos < len(self._indices))
+        resultado[na_tabela] = self._indices[pos[na_tabela].astype(np.int64)]
+        for i in np.flatnonzero(~na_tabela):
+            resultado[i] = self._varrer(scores[i])
+        return resultado
+
+    def limites_maximos(self, scores) -> np.ndarray:
+        """Versão vetorizada de `limite_maximo` para lotes de clientes."""
+        indices = self.faixas_lote(scores)
+        limites = np.array([f[2] for f in self.faixas] + [0.0])
+        return limites[indices]  # índice -1 aponta para o 0.0 do final
+
+
+class PoliticaLimite(ArquivoMonitorado):
+    """Política de limite por score, compilada uma vez e recarregada quando o CSV muda."""
+
+    def _carregar(self) -> TabelaLimites:
+        return TabelaLimites(pd.read_csv(self.caminho))
+
+    def limite_maximo(self, score: float) -> float:
+        return self.obter().limite_maximo(score)
+
+    def limites_maximos(self, scores) -> np.ndarray:
+        return self.obter().limites_maximos(scores)
+
+
+politica_limite = PoliticaLimite(SCORE_CSV)
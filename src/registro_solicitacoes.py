@@ -0,0 +1,269 @@
+import contextlib
+import csv
+import datetime
+import glob
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+import time
+
+from src.config import (
+    SOLICITACOES_CSV,
+    SOLICITACOES_FSYNC_A_CADA,
+    SOLICITACOES_GROUP_COMMIT,
+    SOLICITACOES_ROTACAO_BYTES,
+)
+
+try:
+    import fcntl
+
+    def _travar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+
+    def _destravar(arquivo):
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _travar(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _destravar(arquivo):
+        arquivo.seek(0)
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+COLUNAS_SOLICITACAO = ["cpf_cliente", "data_hora_solicitacao", "limite_atual", "novo_limite_solicitado", "status_pedido"]
+
+
+def _formatar_linhas(linhas, colunas) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for linha in linhas:
+        writer.writerow([linha.get(col, "") for col in colunas])
+    return buffer.getvalue().encode("utf-8")
+
+
+class RegistroSolicitacoes:
+    """
+    Log append-only em CSV, seguro para vários processos/sessões escrevendo ao mesmo tempo.
+    - Cada lote vira UMA escrita em modo append, sob lock exclusivo do arquivo.
+    - fsync em lote: só sincroniza a cada `fsync_a_cada` linhas (1 = toda escrita é durável).
+    - Group commit (opcional): uma thread junta as linhas de várias chamadas e faz uma
+      única escrita + fsync; quem chamou só retorna depois que o lote foi gravado.
+    - Rotação: quando o arquivo ativo passa de `rotacao_bytes`, ele vira um segmento fechado.
+    """
+
+    def __init__(self, caminho, colunas=COLUNAS_SOLICITACAO, fsync_a_cada=1,
+                 group_commit=False, janela_group_commit=0.005, rotacao_bytes=0):
+        self.caminho = caminho
+        self.colunas = list(colunas)
+        self.fsync_a_cada = max(1, int(fsync_a_cada))
+        self.rotacao_bytes = rotacao_bytes
+        self.janela_group_commit = janela_group_commit
+        self.dir_segmentos = os.path.splitext(caminho)[0] + "_segmentos"
+
+        self._lock = threading.Lock()  # serializa as threads deste processo
+        self._linhas_sem_fsync = 0
+        self._fila = None
+        if group_commit:
+            self._fila = queue.Queue()
+            threading.Thread(target=self._loop_group_commit, daemon=True).start()
+
+    # --- API pública ---
+    def registrar(self, linha: dict):
+        self.registrar_lote([linha])
+
+    def registrar_lote(self, linhas):
+        linhas = list(linhas)
+        if not linhas:
+            return
+        if self._fila is None:
+            self._gravar(_formatar_linhas(linhas, self.colunas), len(linhas))
+            return
+
+        pedido = {"dados": _formatar_linhas(linhas, self.colunas), "qtd": len(linhas),
+                  "pronto": threading.Event(), "erro": None}
+        self._fila.put(pedido)
+        pedido["pronto"].wait()
+        if pedido["erro"] is not None:
+            raise pedido["erro"]
+
+    def anexar_arquivo(self, caminho_linhas: str, qtd: int = 0):
+        """
+        Anexa de uma vez um arquivo de linhas já formatadas (sem cabeçalho, mesmas colunas):
+        uma única escrita em append sob o lock do arquivo e um fsync, como um lote grande.
+        Usado pela decisão em lote, que monta as linhas em disco para não segurá-las na memória.
+        """
+        with self._lock:
+            with self._abrir_travado() as arquivo, open(caminho_linhas, "rb") as origem:
+                shutil.copyfileobj(origem, arquivo, 1024 * 1024)
+                self._sincronizar(arquivo, qtd, forcar=True)
+            self._rotacionar_se_necessario()
+
+    def flush(self):
+        """Força o fsync das linhas pendentes (útil no encerramento do processo)."""
+        with self._lock:
+            if self._linhas_sem_fsync and os.path.exists(self.caminho):
+                with self._abrir_travado() as arquivo:
+                    self._sincronizar(arquivo, 0, forcar=True)
+
+    # --- Escrita ---
+    @contextlib.contextmanager
+    def _abrir_travado(self):
+        arquivo = self._abrir_e_travar()
+        try:
+            yield arquivo
+        finally:
+            arquivo.flush()
+            _destravar(arquivo)
+            arquivo.close()
+
+    def _abrir_e_travar(self):
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        while True:
+            arquivo = open(self.caminho, "ab")
+            _travar(arquivo)
+            # Se o arquivo foi rotacionado enquanto esperávamos o lock, reabre o novo
+            try:
+                mesmo_arquivo = os.fstat(arquivo.fileno()).st_ino == os.stat(self.caminho).st_ino
+            except FileNotFoundError:
+                mesmo_arquivo = False
+            if mesmo_arquivo:
+                break
+            _destravar(arquivo)
+            arquivo.close()
+
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if tamanho == 0:
+            arquivo.write(_formatar_linhas([dict(zip(self.colunas, self.colunas))], self.colunas))
+        else:
+            self._reparar_linha_parcial(arquivo, tamanho)
+        return arquivo
+
+    def _reparar_linha_parcial(self, arquivo, tamanho):
+        # Um crash no meio de uma escrita pode deixar uma linha sem '\n' no fim.
+        # Descartamos esse pedaço para a próxima linha não sair "colada" nele.
+        with open(self.caminho, "rb") as leitura:
+            leitura.seek(tamanho - 1)
+            if leitura.read(1) == b"\n":
+                return
+            inicio = max(0, tamanho - 64 * 1024)
+            leitura.seek(inicio)
+            ultimo_nl = leitura.read(tamanho - inicio).rfind(b"\n")
+        if ultimo_nl >= 0:
+            arquivo.truncate(inicio + ultimo_nl + 1)
+
+    def _sincronizar(self, arquivo, qtd, forcar=False):
+        arquivo.flush()
+        self._linhas_sem_fsync += qtd
+        if forcar or self._linhas_sem_fsync >= self.fsync_a_cada:
+            os.fsync(arquivo.fileno())
+            self._linhas_sem_fsync = 0
+
+    def _gravar(self, dados: bytes, qtd: int):
+        with self._lock:
+            with self._abrir_travado() as arquivo:
+                arquivo.write(dados)
+                self._sincronizar(arquivo, qtd)
+            self._rotacionar_se_necessario()
+
+    def _loop_group_commit(self):
+        while True:
+            pedidos = [self._fila.get()]
+            # Janela curta para juntar as escritas concorrentes num único fsync
+            time.sleep(self.janela_group_commit)
+            while True:
+                try:
+                    pedidos.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock:
+                    with self._abrir_travado() as arquivo:
+                        arquivo.write(b"".join(p["dados"] for p in pedidos))
+                        self._sincronizar(arquivo, sum(p["qtd"] for p in pedidos), forcar=True)
+                    self._rotacionar_se_necessario()
+            except Exception as e:
+                for p in pedidos:
+                    p["erro"] = e
+            for p in pedidos:
+                p["pronto"].set()
+
+    # --- Rotação e compactação ---
+    def _rotacionar_se_necessario(self):
+        if self.rotacao_bytes and os.path.getsize(self.caminho) >= self.rotacao_bytes:
+            self.rotacionar()
+
+    def rotacionar(self):
+        """Fecha o arquivo ativo como segmento; o próximo registro recria o arquivo com cabeçalho."""
+        if not os.path.exists(self.caminho):
+            return None
+        os.makedirs(self.dir_segmentos, exist_ok=True)
+        with open(self.caminho, "ab") as arquivo:
+            _travar(arquivo)
+            try:
+                if os.fstat(arquivo.fileno()).st_size == 0:
+                    return None
+                carimbo = datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+                destino = os.path.join(self.dir_segmentos, f"{carimbo}.csv")
+                os.replace(self.caminho, destino)
+                return destino
+            finally:
+                _destravar(arquivo)
+
+    def listar_segmentos(self):
+        """Segmentos fechados (mais antigos primeiro) seguidos do arquivo ativo."""
+        segmentos = sorted(glob.glob(os.path.join(self.dir_segmentos, "*.csv")))
+        if os.path.exists(self.caminho):
+            segmentos.append(self.caminho)
+        return segmentos
+
+    def compactar(self, dias: int = 7):
+        """
+        Junta os segmentos fechados há mais de `dias` dias em arquivos mensais .csv.gz
+        (um membro gzip por segmento) e apaga os segmentos originais.
+        """
+        limite = time.time() - dias * 86400
+        compactados = 0
+        for segmento in sorted(glob.glob(os.path.join(self.dir_segmentos, "*.csv"))):
+            if os.path.getmtime(segmento) > limite:
+                continue
+            mes = os.path.basename(segmento)[:6]
+            destino = os.path.join(self.dir_segmentos, f"{mes}.csv.gz")
+            ja_existe = os.path.exists(destino)
+            with open(segmento, "rb") as origem, gzip.open(destino, "ab") as saida:
+                if ja_existe:
+                    origem.readline()  # o arquivo mensal já tem cabeçalho
+                shutil.copyfileobj(origem, saida)
+            os.remove(segmento)
+            compactados += 1
+        return compactados
+
+
+registro_solicitacoes = RegistroSolicitacoes(
+    SOLICITACOES_CSV,
+    fsync_a_cada=SOLICITACOES_FSYNC_A_CADA,
+    group_commit=SOLICITACOES_GROUP_COMMIT,
+    rotacao_bytes=SOLICITACOES_ROTACAO_BYTES,
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manutenção do log de solicitações de aumento de limite.")
+    parser.add_argument("--rotacionar", action="store_true", help="Fecha o arquivo ativo como segmento.")
+    parser.add_argument("--compactar-dias", type=int, default=None,
+                        help="Compacta em .csv.gz os segmentos mais velhos que N dias.")
+    args = parser.parse_args()
+
+    if args.rotacionar:
+        print(f"✅ Segmento criado: {registro_solicitacoes.rotacionar()}")
+    if args.compactar_dias is not None:
+        print(f"✅ Segmentos compactados: {registro_solicitacoes.compactar(args.compactar_dias)}")
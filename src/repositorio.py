@@ -0,0 +1,213 @@
+import contextlib
+import contextvars
+import os
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from src.armazenamento import armazem_clientes, normalizar_cpf
+from src.monitor_arquivo import ArquivoMonitorado, assinatura_arquivo
+from src.config import CLIENTES_CSV, CLIENTES_SNAPSHOT
+from src.snapshot_clientes import PONTEIRO, IndiceSnapshot, caminho_base_clientes
+
+
+class IndiceClientes:
+    """
+    Base de clientes carregada uma única vez, com índices hash:
+    - CPF normalizado -> posição da linha
+    - (CPF, data de nascimento) -> posição da linha (autenticação)
+    As colunas ficam como arrays; o dict do cliente só é montado na consulta.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.colunas = list(df.columns)
+        self._valores = {col: df[col].to_numpy() for col in self.colunas}
+
+        cpfs = df["cpf"].str.replace(".", "", regex=False).str.replace("-", "", regex=False).str.strip().tolist()
+        nascimentos = df["data_nascimento"].tolist()
+        posicoes = range(len(cpfs))
+
+        # Montado de trás pra frente: em CPFs repetidos vence a PRIMEIRA linha (igual ao iloc[0] antigo)
+        self._por_cpf = dict(zip(reversed(cpfs), reversed(posicoes)))
+        self._por_cpf_nascimento = dict(zip(reversed(list(zip(cpfs, nascimentos))), reversed(posicoes)))
+
+    def __len__(self):
+        return len(self._por_cpf)
+
+    def contem(self, cpf: str) -> bool:
+        return normalizar_cpf(cpf) in self._por_cpf
+
+    def _linha(self, pos: int) -> dict:
+        return {col: self._valores[col][pos] for col in self.colunas}
+
+    def buscar(self, cpf: str):
+        pos = self._por_cpf.get(normalizar_cpf(cpf))
+        return None if pos is None else self._linha(pos)
+
+    def autenticar(self, cpf: str, data_nascimento: str):
+        pos = self._por_cpf_nascimento.get((normalizar_cpf(cpf), str(data_nascimento).strip()))
+        return None if pos is None else self._linha(pos)
+
+    def buscar_lote(self, cpfs, colunas):
+        """Versão em lote de `buscar` (CPFs já normalizados): máscara dos encontrados e as colunas dessas linhas."""
+        posicoes = np.fromiter((self._por_cpf.get(c, -1) for c in cpfs), dtype=np.int64, count=len(cpfs))
+        encontrados = posicoes >= 0
+        return encontrados, {col: self._valores[col][posicoes[encontrados]] for col in colunas}
+
+
+class SnapshotClientes:
+    """
+    Leitura consistente da base durante um hop de tools: todas as chamadas do turno
+    veem o mesmo índice e cada cliente passa pelo armazém SQLite uma única vez.
+    Escritas feitas no mesmo hop não aparecem aqui (valem a partir do próximo turno).
+    `perfis` ({cpf: cliente}) são clientes já conhecidos pela sessão (src/perfil_sessao.py):
+    a busca deles sai direto da memória, sem índice nem armazém.
+    """
+
+    def __init__(self, repositorio, indice: IndiceClientes, perfis=None):
+        self.repositorio = repositorio
+        self.indice = indice
+        self._lock = threading.Lock()
+        self._clientes = {}  # chave -> Future com o cliente (ou None)
+        for cpf, cliente in (perfis or {}).items():
+            futuro = self._clientes[normalizar_cpf(cpf)] = Future()
+            futuro.set_result(dict(cliente))
+
+    def _memo(self, chave, carregar):
+        # Chamadas simultâneas do mesmo cliente esperam a primeira leitura (mesmo esquema do cache de câmbio)
+        with self._lock:
+            futuro = self._clientes.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = self._clientes[chave] = Future()
+        if dono:
+            try:
+                futuro.set_result(carregar())
+            except Exception as e:
+                futuro.set_exception(e)
+        cliente = futuro.result()
+        return None if cliente is None else dict(cliente)
+
+    def buscar(self, cpf: str):
+        return self._memo(normalizar_cpf(cpf), lambda: self.repositorio._aplicar_alteracoes(self.indice.buscar(cpf)))
+
+    def autenticar(self, cpf: str, data_nascimento: str):
+        chave = (normalizar_cpf(cpf), str(data_nascimento).strip())
+        return self._memo(chave, lambda: self.repositorio._aplicar_alteracoes(self.indice.autenticar(cpf, data_nascimento)))
+
+
+# Snapshot do turno atual; propagado para as threads/tasks das tools via contextvars
+_snapshot_atual = contextvars.ContextVar("snapshot_clientes", default=None)
+
+
+class RepositorioClientes(ArquivoMonitorado):
+    """
+    Repositório compartilhado de clientes: lido do CSV (ou do snapshot colunar, se estiver em dia)
+    uma vez e recarregado só quando o arquivo muda.
+    Com `pasta_snapshot`, o CSV e o ponteiro do snapshot são monitorados juntos: a cada mudança
+    em qualquer um dos dois a base é escolhida de novo (snapshot mais antigo que o CSV -> CSV).
+    Por cima da base, aplica as alterações pontuais (score/limite) gravadas no armazém SQLite.
+    """
+
+    def __init__(self, caminho: str, armazem=None, intervalo_verificacao: float = 1.0, pasta_snapshot: str = None):
+        super().__init__(caminho, intervalo_verificacao)
+        self.armazem = armazem
+        self.pasta_snapshot = pasta_snapshot
+
+    def _assinatura_atual(self):
+        if self.pasta_snapshot is None:
+            return super()._assinatura_atual()
+        return (super()._assinatura_atual(), assinatura_arquivo(os.path.join(self.pasta_snapshot, PONTEIRO)))
+
+    def _carregar(self):
+        base = self.caminho if self.pasta_snapshot is None else caminho_base_clientes(self.caminho, self.pasta_snapshot)
+        # Snapshot colunar (src/snapshot_clientes.py): só abre as colunas com mmap
+        if os.path.basename(base) == PONTEIRO:
+            return IndiceSnapshot(base)
+        df = pd.read_csv(base, dtype=str, keep_default_na=False)
+        return IndiceClientes(df)
+
+    def _aplicar_alteracoes(self, cliente):
+        if cliente is None or self.armazem is None:
+            return cliente
+        return self._aplicar(cliente, self.armazem.buscar(cliente["cpf"]))
+
+    @staticmethod
+    def _aplicar(cliente, alteracoes):
+        if alteracoes:
+            alteracoes.pop("versao", None)
+            for campo, valor in alteracoes.items():
+                # O armazém guarda texto; no snapshot tipado o campo mantém o tipo da coluna
+                base = cliente.get(campo)
+                cliente[campo] = type(base)(float(valor)) if isinstance(base, (int, float)) else valor
+        return cliente
+
+    def _snapshot_ativo(self):
+        snapshot = _snapshot_atual.get()
+        return snapshot if snapshot is not None and snapshot.repositorio is self else None
+
+    @contextlib.contextmanager
+    def snapshot(self, perfis=None):
+        """Fixa um SnapshotClientes para as leituras feitas dentro do bloco (reentrante)."""
+        atual = self._snapshot_ativo()
+        if atual is not None:
+            yield atual
+            return
+        token = _snapshot_atual.set(SnapshotClientes(self, self.obter(), perfis))
+        try:
+            yield _snapshot_atual.get()
+        finally:
+            _snapshot_atual.reset(token)
+
+    def buscar(self, cpf: str):
+        snapshot = self._snapshot_ativo()
+        if snapshot is not None:
+            return snapshot.buscar(cpf)
+        return self._aplicar_alteracoes(self.obter().buscar(cpf))
+
+    def autenticar(self, cpf: str, data_nascimento: str):
+        snapshot = self._snapshot_ativo()
+        if snapshot is not None:
+            return snapshot.autenticar(cpf, data_nascimento)
+        return self._aplicar_alteracoes(self.obter().autenticar(cpf, data_nascimento))
+
+    def perfil(self, cpf: str):
+        """(cliente, versão das alterações no armazém) lidos numa consulta só; versão 0 = nunca alterado."""
+        cliente = self.obter().buscar(cpf)
+        if cliente is None:
+            return None, 0
+        alteracoes = self.armazem.buscar(cliente["cpf"]) if self.armazem is not None else None
+        versao = alteracoes["versao"] if alteracoes else 0
+        return self._aplicar(cliente, alteracoes), versao
+
+    def versao(self, cpf: str) -> int:
+        """Versão das alterações do cliente no armazém (leitura pontual, sem montar o cliente)."""
+        return self.armazem.versao(cpf) if self.armazem is not None else 0
+
+    def buscar_lote(self, cpfs, colunas):
+        """
+        Versão vetorizada de `buscar` (decisão em lote): máscara dos CPFs encontrados e as
+        `colunas` pedidas dessas linhas, com as alterações do armazém já aplicadas.
+        Dentro de `snapshot()`, todos os lotes leem o mesmo índice.
+        """
+        snapshot = self._snapshot_ativo()
+        indice = snapshot.indice if snapshot is not None else self.obter()
+        encontrados, valores = indice.buscar_lote([normalizar_cpf(c) for c in cpfs], ["cpf", *colunas])
+        chaves = [normalizar_cpf(c) for c in valores.pop("cpf").tolist()]
+        if self.armazem is None or not chaves:
+            return encontrados, valores
+        alteracoes = self.armazem.buscar_lote(chaves)
+        if alteracoes:
+            for pos, chave in enumerate(chaves):
+                for campo, valor in alteracoes.get(chave, {}).items():
+                    if campo in valores:
+                        coluna = valores[campo]
+                        # Mesma conversão do `_aplicar_alteracoes`: colunas tipadas mantêm o tipo
+                        coluna[pos] = valor if coluna.dtype == object else coluna.dtype.type(float(valor))
+        return encontrados, valores
+
+
+# Instância única usada por todas as tools
+repositorio_clientes = RepositorioClientes(CLIENTES_CSV, armazem=armazem_clientes, pasta_snapshot=CLIENTES_SNAPSHOT)
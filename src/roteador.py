@@ -0,0 +1,147 @@
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+from src.config import ROTEADOR_CONFIANCA_MINIMA
+
+INTENCOES = ("cambio", "entrevista", "credito")
+
+# Pesos das palavras-chave (texto já sem acento e em minúsculas).
+# 3 = sinal forte sozinho; 1-2 = sinal fraco, precisa de reforço.
+PALAVRAS_CHAVE = {
+    "cambio": {
+        "cambio": 3, "cotacao": 3, "dolar": 3, "dolares": 3, "euro": 3, "euros": 3,
+        "libra": 3, "iene": 3, "bitcoin": 2, "moeda": 2, "moedas": 2, "usd": 3, "eur": 3,
+        "peso argentino": 3, "converter": 1.5, "cambial": 3,
+    },
+    "entrevista": {
+        "entrevista": 3, "entrevistas": 3, "questionario": 3, "aumentar meu score": 3,
+        "aumentar o score": 3, "melhorar meu score": 3, "melhorar o score": 3,
+        "reanalise": 2, "perguntas": 1.5, "score": 1,
+    },
+    "credito": {
+        "limite": 3, "credito": 2.5, "cartao": 2, "aumento": 1.5,
+        "emprestimo": 2, "menu": 2, "opcoes": 1.5, "servicos": 1.5,
+    },
+}
+
+SAUDACOES = {"oi", "ola", "bom dia", "boa tarde", "boa noite", "e ai", "hey", "hello", "opa"}
+AFIRMATIVAS = {"sim", "s", "quero", "claro", "pode", "pode ser", "bora", "vamos", "ok", "aceito", "com certeza", "yes"}
+
+# Suavização: com o limiar padrão (0.75), um termo isolado de peso < 1.5 não decide sozinho e vai para o LLM
+SUAVIZACAO = 0.5
+
+
+def normalizar_texto(texto: str) -> str:
+    sem_acento = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", sem_acento.lower())).strip()
+
+
+def _compilar(termos):
+    # Maiores primeiro para "aumentar meu score" ganhar de "score"
+    ordenados = sorted(termos, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(t) for t in ordenados) + r")\b")
+
+
+PADROES = {intencao: _compilar(pesos) for intencao, pesos in PALAVRAS_CHAVE.items()}
+
+
+@dataclass
+class DecisaoRota:
+    intencao: str
+    confianca: float
+    origem: str  # "regra", "palavras" ou "llm"
+
+
+class MetricasRoteador:
+    """Contadores de quantas decisões saíram do caminho rápido vs. do LLM."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.rapido = 0
+        self.llm = 0
+        self.por_intencao = {intencao: 0 for intencao in INTENCOES}
+
+    def registrar(self, decisao: DecisaoRota):
+        with self._lock:
+            self.total += 1
+            if decisao.origem == "llm":
+                self.llm += 1
+            else:
+                self.rapido += 1
+            self.por_intencao[decisao.intencao] = self.por_intencao.get(decisao.intencao, 0) + 1
+
+    def taxa_acerto(self) -> float:
+        return self.rapido / self.total if self.total else 0.0
+
+    def resumo(self) -> dict:
+        with self._lock:
+            return {
+                "total": self.total,
+                "rapido": self.rapido,
+                "llm": self.llm,
+                "taxa_acerto": round(self.taxa_acerto(), 4),
+                "por_intencao": dict(self.por_intencao),
+            }
+
+
+metricas_roteador = MetricasRoteador()
+
+
+def _pontuar(texto: str) -> dict:
+    pontos = {}
+    for intencao, padrao in PADROES.items():
+        pesos = PALAVRAS_CHAVE[intencao]
+        pontos[intencao] = sum(pesos[termo] for termo in padrao.findall(texto))
+    return pontos
+
+
+def classificar_intencao(texto: str, contexto_anterior: str = ""):
+    """
+    Caminho rápido da triagem: tenta decidir o agente sem chamar o LLM.
+    Retorna a DecisaoRota (com a confiança) ou None quando não dá pra decidir localmente.
+    """
+    texto = normalizar_texto(texto)
+    contexto = normalizar_texto(contexto_anterior or "")
+
+    # 1. Regras de contexto: "sim" logo depois de uma oferta do robô
+    if texto in AFIRMATIVAS:
+        if "entrevista" in contexto:
+            return DecisaoRota("entrevista", 1.0, "regra")
+        if "credito" in contexto or "limite" in contexto:
+            return DecisaoRota("credito", 1.0, "regra")
+        return None
+
+    # 2. Saudação pura volta para o menu principal (Crédito)
+    if texto in SAUDACOES:
+        return DecisaoRota("credito", 1.0, "regra")
+
+    # 3. Palavras-chave ponderadas
+    pontos = _pontuar(texto)
+    total = sum(pontos.values())
+    if total == 0:
+        return None
+    intencao = max(pontos, key=pontos.get)
+    confianca = pontos[intencao] / (total + SUAVIZACAO)
+    return DecisaoRota(intencao, round(confianca, 4), "palavras")
+
+
+def decisao_rapida(texto: str, contexto_anterior: str, confianca_minima: float = None):
+    """
+    Retorna a decisão do caminho rápido se a confiança passar do limiar
+    (ROTEADOR_CONFIANCA_MINIMA por padrão); None quando é preciso perguntar ao LLM.
+    """
+    limiar = ROTEADOR_CONFIANCA_MINIMA if confianca_minima is None else confianca_minima
+    decisao = classificar_intencao(texto, contexto_anterior)
+    if decisao is None or decisao.confianca < limiar:
+        return None
+    return decisao
+
+
+def intencao_da_resposta_llm(resposta: str) -> str:
+    intencao = resposta.strip().upper()
+    if "CAMBIO" in intencao: return "cambio"
+    if "ENTREVISTA" in intencao: return "entrevista"
+    return "credito" # Padrão
@@ -0,0 +1,139 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Pesos da fórmula de score (usados pela tool e pelo lote) ---
+PESO_RENDA = 30
+
+PESO_EMPREGO = {
+    "formal": 300,
+    "autônomo": 200,
+    "desempregado": 0
+}
+
+PESO_DIVIDAS = {
+    True: -100,  # Sim, tem dívidas
+    False: 100   # Não tem dívidas
+}
+
+COLUNAS_ENTREVISTA = ["cpf", "renda_mensal", "despesas_fixas", "tipo_emprego", "dependentes", "tem_dividas"]
+
+RESPOSTAS_SIM = {"true", "1", "sim", "s", "yes", "y"}
+RESPOSTAS_NAO = {"false", "0", "não", "nao", "n", "no"}
+
+
+def normalizar_emprego(tipo_emprego: str) -> str:
+    emprego = tipo_emprego.lower().replace("autonomo", "autônomo")
+    if emprego not in PESO_EMPREGO:
+        emprego = "desempregado"  # Fallback seguro
+    return emprego
+
+
+# Lógica para dependentes (3 ou mais vale 30)
+def get_peso_dependentes(num):
+    if num == 0: return 100
+    if num == 1: return 80
+    if num == 2: return 60
+    return 30 # Para 3+
+
+
+def calcular_score(renda_mensal: float, despesas_fixas: float, tipo_emprego: str, dependentes: int, tem_dividas: bool) -> int:
+    # score = ((renda / (despesas + 1)) * peso_renda) + emprego + dependentes + dividas
+    score_renda = (renda_mensal / (despesas_fixas + 1)) * PESO_RENDA
+    score_emprego = PESO_EMPREGO[normalizar_emprego(tipo_emprego)]
+    score_dependentes = get_peso_dependentes(dependentes)
+    score_dividas = PESO_DIVIDAS[tem_dividas]
+
+    novo_score = score_renda + score_emprego + score_dependentes + score_dividas
+
+    # Trava o score entre 0 e 1000
+    return max(0, min(1000, int(novo_score)))
+
+
+def _para_bool(valores: pd.Series) -> pd.Series:
+    texto = valores.astype(str).str.strip().str.lower()
+    return pd.Series(
+        np.select([texto.isin(RESPOSTAS_SIM), texto.isin(RESPOSTAS_NAO)], [1.0, 0.0], np.nan),
+        index=valores.index,
+    )
+
+
+def score_batch(entrevistas: pd.DataFrame) -> pd.Series:
+    """
+    Versão vetorizada de `calcular_score` para um DataFrame com as respostas da entrevista.
+    Faz exatamente as mesmas operações em float64 e na mesma ordem da versão por linha,
+    então o resultado é idêntico. Linhas inválidas (valor não numérico, dívidas fora de
+    sim/não, divisão por zero) ficam com <NA>.
+    """
+    renda = pd.to_numeric(entrevistas["renda_mensal"], errors="coerce").to_numpy(dtype=float)
+    despesas = pd.to_numeric(entrevistas["despesas_fixas"], errors="coerce").to_numpy(dtype=float)
+    dependentes = pd.to_numeric(entrevistas["dependentes"], errors="coerce").to_numpy(dtype=float)
+    dividas = _para_bool(entrevistas["tem_dividas"]).to_numpy()
+
+    emprego = (
+        entrevistas["tipo_emprego"].astype(str).str.lower()
+        .str.replace("autonomo", "autônomo", regex=False)
+        .map(PESO_EMPREGO).fillna(PESO_EMPREGO["desempregado"])
+        .to_numpy(dtype=float)
+    )
+    peso_dependentes = np.select([dependentes == 0, dependentes == 1, dependentes == 2], [100.0, 80.0, 60.0], 30.0)
+    peso_dividas = np.where(dividas == 1.0, PESO_DIVIDAS[True], PESO_DIVIDAS[False]).astype(float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score_renda = (renda / (despesas + 1)) * PESO_RENDA
+        novo_score = score_renda + emprego + peso_dependentes + peso_dividas
+
+    validos = np.isfinite(novo_score) & ~np.isnan(dependentes) & ~np.isnan(dividas)
+    scores = np.clip(np.trunc(np.where(validos, novo_score, 0.0)), 0, 1000).astype(np.int64)
+    return pd.Series(scores, index=entrevistas.index, dtype="Int64").where(validos)
+
+
+def ler_entrevistas(caminho: str) -> pd.DataFrame:
+    if caminho.endswith(".parquet"):
+        df = pd.read_parquet(caminho)  # requer pyarrow ou fastparquet
+    else:
+        df = pd.read_csv(caminho, dtype={"cpf": str})
+    faltando = [col for col in COLUNAS_ENTREVISTA if col not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no arquivo de entrevistas: {faltando}")
+    return df
+
+
+def recalcular_scores(caminho: str, aplicar: bool = True) -> dict:
+    """Recalcula os scores de um arquivo de entrevistas e grava tudo numa única transação."""
+    # Import tardio: o cálculo puro não precisa do armazém nem do repositório
+    from src.armazenamento import armazem_clientes
+    from src.repositorio import normalizar_cpf, repositorio_clientes
+
+    inicio = time.perf_counter()
+    df = ler_entrevistas(caminho)
+    df["cpf"] = df["cpf"].map(normalizar_cpf)
+    df["novo_score"] = score_batch(df)
+
+    indice = repositorio_clientes.obter()
+    encontrados = df["cpf"].map(indice.contem)
+    validos = df[df["novo_score"].notna() & encontrados]
+
+    if aplicar and not validos.empty:
+        armazem_clientes.atualizar_scores_lote(zip(validos["cpf"], validos["novo_score"].astype(int)))
+
+    return {
+        "linhas": len(df),
+        "atualizados": len(validos) if aplicar else 0,
+        "invalidos": int(df["novo_score"].isna().sum()),
+        "nao_encontrados": int((~encontrados).sum()),
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recalcula em lote o score dos clientes a partir das respostas de entrevista.")
+    parser.add_argument("arquivo", help=f"CSV ou Parquet com as colunas: {', '.join(COLUNAS_ENTREVISTA)}")
+    parser.add_argument("--simular", action="store_true", help="Só calcula, sem gravar os scores.")
+    args = parser.parse_args()
+
+    resumo = recalcular_scores(args.arquivo, aplicar=not args.simular)
+    print(f"✅ Recalculo concluído: {resumo}")
@@ -0,0 +1,112 @@
+# src/servico.py
+# API headless na frente do grafo compilado. Cada processo tem o seu grafo async; o estado das
+# conversas fica no checkpointer SQLite (thread_id = id da sessão), então qualquer worker atende
+# qualquer sessão.
+#
+#     uvicorn src.servico:api --host 0.0.0.0 --port 8000 --workers 4
+import asyncio
+import json
+import weakref
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from src import graph
+from src.atendimento import aexecutar_turno, config_turno, historico
+from src.logs import obter_logger
+from src.metricas import metricas
+
+log = obter_logger("servico")
+
+# Um turno por vez em cada sessão (dentro do processo): dois envios seguidos da mesma
+# sessão não podem ler o mesmo checkpoint. Entre workers, use afinidade de sessão no balanceador.
+_locks_sessao = weakref.WeakValueDictionary()
+
+
+def _lock_da_sessao(sessao: str) -> asyncio.Lock:
+    lock = _locks_sessao.get(sessao)
+    if lock is None:
+        lock = _locks_sessao[sessao] = asyncio.Lock()
+    return lock
+
+
+@asynccontextmanager
+async def _ciclo_de_vida(_api):
+    await graph.obter_app_async()
+    log.info("API pronta")
+    yield
+    await graph.fechar_app_async()
+
+
+api = FastAPI(title="Banco Ágil", lifespan=_ciclo_de_vida)
+
+
+class Mensagem(BaseModel):
+    texto: str
+
+
+async def _eventos(sessao: str, texto: str):
+    app = await graph.obter_app_async()
+    async with _lock_da_sessao(sessao):
+        async for evento in aexecutar_turno(app, sessao, texto):
+            yield evento
+
+
+@api.get("/saude")
+async def saude():
+    return {"status": "ok"}
+
+
+@api.get("/metrics", response_class=PlainTextResponse)
+async def exportar_metricas():
+    return metricas.exportar_prometheus()
+
+
+@api.get("/sessoes/{sessao}/mensagens")
+async def listar_mensagens(sessao: str):
+    app = await graph.obter_app_async()
+    estado = (await app.aget_state(config_turno(sessao))).values
+    return {"sessao": sessao, "autenticado": bool(estado.get("autenticado")), "mensagens": historico(estado)}
+
+
+@api.post("/sessoes/{sessao}/mensagens")
+async def enviar_mensagem(sessao: str, mensagem: Mensagem):
+    """Turno completo numa resposta só (clientes sem streaming, testes de carga)."""
+    fim = {}
+    async for evento in _eventos(sessao, mensagem.texto):
+        if evento["tipo"] == "fim":
+            fim = evento
+    return {"sessao": sessao, "resposta": fim.get("resposta", ""), "ultimo_agente": fim.get("ultimo_agente")}
+
+
+@api.post("/sessoes/{sessao}/stream")
+async def enviar_mensagem_stream(sessao: str, mensagem: Mensagem):
+    """Mesmos eventos do WebSocket em NDJSON (um JSON por linha), usado pelo Streamlit."""
+    async def linhas():
+        try:
+            async for evento in _eventos(sessao, mensagem.texto):
+                yield json.dumps(evento, ensure_ascii=False) + "\n"
+        except Exception as e:
+            log.exception("Falha no turno", extra={"campos": {"sessao": sessao}})
+            yield json.dumps({"tipo": "erro", "msg": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(linhas(), media_type="application/x-ndjson")
+
+
+@api.websocket("/sessoes/{sessao}/ws")
+async def conversar(websocket: WebSocket, sessao: str):
+    """Cada mensagem recebida ({"texto": ...}) vira um turno; os eventos voltam um a um."""
+    await websocket.accept()
+    try:
+        while True:
+            dados = await websocket.receive_json()
+            try:
+                async for evento in _eventos(sessao, str(dados.get("texto", ""))):
+                    await websocket.send_json(evento)
+            except Exception as e:
+                log.exception("Falha no turno", extra={"campos": {"sessao": sessao}})
+                await websocket.send_json({"tipo": "erro", "msg": str(e)})
+    except WebSocketDisconnect:
+        pass
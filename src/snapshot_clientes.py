@@ -0,0 +1,204 @@
+# src/snapshot_clientes.py
+"""
+Snapshot colunar da base de clientes, exportado do clientes.csv.
+
+Cada versão é uma pasta com um .npy tipado por coluna (CPF como uint64, números como
+int64/float64, textos como bytes UTF-8 de largura fixa), com as linhas ordenadas por CPF.
+As colunas são abertas com mmap: uma busca é um searchsorted na coluna de CPF (poucas
+páginas) mais a leitura de uma posição em cada coluna. O `atual.json` aponta para a versão
+em uso e é trocado de forma atômica, então leitores nunca veem uma exportação pela metade.
+
+    python -m src.snapshot_clientes            # exporta data/clientes.csv -> data/clientes_snapshot/
+"""
+import datetime
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from src.config import CLIENTES_CSV, CLIENTES_SNAPSHOT
+from src.logs import obter_logger
+
+log = obter_logger("snapshot_clientes")
+
+PONTEIRO = "atual.json"
+
+# Colunas com tipo fixo: valor em reais é sempre decimal, mesmo que o CSV só tenha inteiros
+# (senão a alteração 2500.50 do armazém viraria 2500 ao herdar o tipo da coluna)
+TIPOS_COLUNAS = {"limite_atual": np.float64, "renda_mensal": np.float64, "score_atual": np.int64}
+
+
+def _normalizar_cpf(cpf) -> str:
+    return str(cpf).replace(".", "").replace("-", "").strip()
+
+
+def _tipar(serie: pd.Series, tipo=None) -> np.ndarray:
+    """
+    Coluna de texto do CSV -> array tipado (inteiro, decimal ou bytes UTF-8 de largura fixa).
+    Com `tipo` (TIPOS_COLUNAS), a coluna numérica sai nesse tipo em vez do inferido.
+    """
+    numeros = pd.to_numeric(serie, errors="coerce")
+    if len(serie) and not numeros.isna().any():
+        if tipo is not None:
+            return numeros.to_numpy(dtype=tipo)
+        if not serie.str.contains(r"[.eE]").any():
+            return numeros.to_numpy(dtype=np.int64)
+        return numeros.to_numpy(dtype=np.float64)
+    codificados = serie.str.encode("utf-8")
+    largura = max(1, int(codificados.str.len().max() or 1))
+    return codificados.to_numpy(dtype=f"S{largura}")
+
+
+def exportar_snapshot(caminho_csv: str = CLIENTES_CSV, pasta: str = CLIENTES_SNAPSHOT) -> int:
+    """Gera uma nova versão do snapshot e passa o ponteiro para ela. Devolve o número de linhas."""
+    df = pd.read_csv(caminho_csv, dtype=str, keep_default_na=False)
+    cpfs = df["cpf"].map(_normalizar_cpf)
+    validos = cpfs.str.fullmatch(r"\d{1,11}")
+    if not validos.all():
+        log.warning("Linhas com CPF inválido ficaram fora do snapshot", extra={"campos": {"linhas": int((~validos).sum())}})
+        df, cpfs = df[validos], cpfs[validos]
+
+    chaves = cpfs.to_numpy(dtype=np.uint64)
+    # Ordenação estável: em CPFs repetidos a primeira linha do CSV continua vindo primeiro
+    ordem = np.argsort(chaves, kind="stable")
+
+    os.makedirs(pasta, exist_ok=True)
+    versao = f"v{datetime.datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:6]}"
+    pasta_versao = os.path.join(pasta, versao)
+    os.makedirs(pasta_versao)
+
+    np.save(os.path.join(pasta_versao, "cpf.npy"), chaves[ordem])
+    colunas = [{"nome": "cpf", "arquivo": "cpf.npy"}]
+    for i, coluna in enumerate(c for c in df.columns if c != "cpf"):
+        arquivo = f"col{i:02d}.npy"
+        np.save(os.path.join(pasta_versao, arquivo), _tipar(df[coluna], TIPOS_COLUNAS.get(coluna))[ordem])
+        colunas.append({"nome": coluna, "arquivo": arquivo})
+
+    meta = {
+        "versao": versao,
+        "linhas": int(len(ordem)),
+        "colunas": colunas,
+        "origem": os.path.abspath(caminho_csv),
+        "gerado_em": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    temporario = os.path.join(pasta, f".{PONTEIRO}.{uuid.uuid4().hex}")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, os.path.join(pasta, PONTEIRO))
+    _limpar_versoes(pasta, manter={versao})
+    return meta["linhas"]
+
+
+def _limpar_versoes(pasta: str, manter: set):
+    # Quem ainda tem a versão anterior mapeada continua lendo normalmente (POSIX mantém o inode vivo)
+    for nome in os.listdir(pasta):
+        if nome.startswith("v") and nome not in manter and os.path.isdir(os.path.join(pasta, nome)):
+            shutil.rmtree(os.path.join(pasta, nome), ignore_errors=True)
+
+
+def snapshot_atualizado(caminho_csv: str = CLIENTES_CSV, pasta: str = CLIENTES_SNAPSHOT) -> bool:
+    ponteiro = os.path.join(pasta, PONTEIRO)
+    if not os.path.exists(ponteiro):
+        return False
+    return not os.path.exists(caminho_csv) or os.path.getmtime(ponteiro) >= os.path.getmtime(caminho_csv)
+
+
+def garantir_snapshot(caminho_csv: str = CLIENTES_CSV, pasta: str = CLIENTES_SNAPSHOT) -> bool:
+    """Exporta de novo se o snapshot não existe ou é mais antigo que o CSV. True se exportou."""
+    if snapshot_atualizado(caminho_csv, pasta) or not os.path.exists(caminho_csv):
+        return False
+    linhas = exportar_snapshot(caminho_csv, pasta)
+    log.info("Snapshot de clientes exportado", extra={"campos": {"linhas": linhas, "pasta": pasta}})
+    return True
+
+
+def caminho_base_clientes(caminho_csv: str = CLIENTES_CSV, pasta: str = CLIENTES_SNAPSHOT) -> str:
+    """O que o repositório deve abrir: o ponteiro do snapshot se estiver em dia, senão o CSV."""
+    if snapshot_atualizado(caminho_csv, pasta):
+        return os.path.join(pasta, PONTEIRO)
+    if os.path.exists(os.path.join(pasta, PONTEIRO)):
+        log.warning("Snapshot de clientes mais antigo que o CSV; lendo o CSV", extra={"campos": {"pasta": pasta}})
+    return caminho_csv
+
+
+def _python(valor):
+    if isinstance(valor, bytes):
+        return valor.decode("utf-8")
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+class IndiceSnapshot:
+    """Mesma interface do IndiceClientes (repositorio.py), lendo as colunas mapeadas em memória."""
+
+    def __init__(self, caminho_ponteiro: str):
+        with open(caminho_ponteiro, encoding="utf-8") as f:
+            meta = json.load(f)
+        pasta_versao = os.path.join(os.path.dirname(caminho_ponteiro), meta["versao"])
+        self.versao = meta["versao"]
+        self.colunas = [c["nome"] for c in meta["colunas"]]
+        self._valores = {
+            c["nome"]: np.load(os.path.join(pasta_versao, c["arquivo"]), mmap_mode="r") for c in meta["colunas"]
+        }
+        self._cpf = self._valores["cpf"]
+
+    def __len__(self):
+        return len(self._cpf)
+
+    def _posicoes(self, cpf) -> range:
+        texto = _normalizar_cpf(cpf)
+        if not (texto.isascii() and texto.isdigit()) or len(texto) > 11:
+            return range(0)
+        chave = np.uint64(int(texto))
+        inicio = int(np.searchsorted(self._cpf, chave, side="left"))
+        fim = inicio
+        while fim < len(self._cpf) and self._cpf[fim] == chave:
+            fim += 1
+        return range(inicio, fim)
+
+    def _linha(self, pos: int) -> dict:
+        linha = {col: _python(self._valores[col][pos]) for col in self.colunas}
+        linha["cpf"] = f"{linha['cpf']:011d}"
+        return linha
+
+    def contem(self, cpf: str) -> bool:
+        return len(self._posicoes(cpf)) > 0
+
+    def buscar(self, cpf: str):
+        posicoes = self._posicoes(cpf)
+        return self._linha(posicoes[0]) if posicoes else None
+
+    def buscar_lote(self, cpfs, colunas):
+        """Versão em lote de `buscar` (CPFs já normalizados): um searchsorted para o lote inteiro."""
+        textos = pd.Series(cpfs, dtype=str)
+        validos = textos.str.fullmatch(r"\d{1,11}").to_numpy(dtype=bool)
+        chaves = np.zeros(len(textos), dtype=np.uint64)
+        chaves[validos] = textos[validos].astype(np.uint64).to_numpy()
+        posicoes = np.searchsorted(self._cpf, chaves, side="left")
+        encontrados = validos & (posicoes < len(self._cpf))
+        encontrados[encontrados] = self._cpf[posicoes[encontrados]] == chaves[encontrados]
+        selecionadas = posicoes[encontrados]
+        valores = {col: np.asarray(self._valores[col][selecionadas]) for col in colunas}
+        if "cpf" in valores:
+            valores["cpf"] = np.array([f"{c:011d}" for c in valores["cpf"].tolist()], dtype=object)
+        return encontrados, valores
+
+    def autenticar(self, cpf: str, data_nascimento: str):
+        nascimento = str(data_nascimento).strip().encode("utf-8")
+        coluna = self._valores["data_nascimento"]
+        for pos in self._posicoes(cpf):
+            if coluna[pos] == nascimento:
+                return self._linha(pos)
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exporta o clientes.csv para o snapshot colunar (.npy com mmap).")
+    parser.add_argument("--csv", default=CLIENTES_CSV)
+    parser.add_argument("--pasta", default=CLIENTES_SNAPSHOT)
+    args = parser.parse_args()
+    print(f"✅ Snapshot exportado: {exportar_snapshot(args.csv, args.pasta)} linhas em {args.pasta}")
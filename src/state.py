@@ -11,13 +11,22 @@ class BankState(TypedDict):
     # Dados do Usuário Logado
     cpf: Optional[str]
     nome: Optional[str]
-    dados_cliente: Optional[Dict[str, Any]]  # Guarda infos do CSV aqui
+    dados_cliente: Optional[Dict[str, Any]]  # Perfil do cliente autenticado (src/perfil_sessao.py)
+    versao_cliente: Optional[int]  # Versão das alterações do cliente no armazém quando o perfil foi lido
     
     # Controle de Fluxo
     autenticado: bool
-    tentativas_falhas: int
+    tentativas_falhas: int  # Falhas seguidas de validar_cpf (zera no sucesso ou no bloqueio)
+    bloqueado_ate: Optional[float]  # Epoch até quando o login fica bloqueado
+    mensagens_recentes: Optional[List[float]]  # Horários das mensagens do último minuto (limite por sessão)
     ultimo_agente: Optional[str]
     proximo_agente: Optional[str] # Para o roteador saber pra onde mandar
+    hops_turno: Optional[int]  # Chamadas ao LLM no turno atual (zerado na entrada de cada turno)
+    memo_tools: Optional[Dict[str, Any]]  # Resultados de tools de leitura já chamadas no turno
     
     # Contexto Temporário (ex: dados da entrevista)
-    temp_entrevista: Optional[Dict[str, Any]]
\ No newline at end of file
+    temp_entrevista: Optional[Dict[str, Any]]
+    
+    # Resumo incremental do que já saiu da janela de contexto enviada ao LLM
+    resumo_historico: Optional[str]
+    resumo_ate: Optional[int]  # Quantas mensagens do início já estão no resumo
\ No newline at end of file
@@ -0,0 +1,248 @@
+# src/visoes_solicitacoes.py
+"""
+Visões agregadas do log de solicitações (`solicitacoes_aumento_limite.csv`), mantidas de forma
+incremental num SQLite: pedidos, aprovados e soma do valor pedido por CPF, por dia e por faixa
+de score. A posição já lida do log (inode + offset) é gravada na mesma transação dos agregados,
+então cada linha do log entra nas visões uma única vez, mesmo com reinícios e vários processos.
+
+`atualizar()` lê só o que foi anexado desde a última vez (é chamado antes de cada consulta);
+quando o arquivo ativo é rotacionado, o resto do segmento fechado é lido antes do arquivo novo.
+
+Limites conhecidos:
+- As visões são postas em dia na consulta, não no append: o registro de uma solicitação não
+  paga a agregação, e quem consulta paga só o que entrou desde a última leitura.
+- A faixa é a do score do cliente no momento em que a linha entra na visão, não a do momento
+  do pedido (o log não guarda o score). Um pedido anterior a uma mudança de score que ainda
+  não tinha sido agregado entra na faixa nova.
+
+    python -m src.visoes_solicitacoes --visao dia
+    python -m src.visoes_solicitacoes --cpf 12345678900
+"""
+import glob
+import gzip
+import io
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config import SOLICITACOES_VISOES_DB
+from src.logs import obter_logger
+from src.politica import politica_limite
+from src.registro_solicitacoes import registro_solicitacoes
+from src.repositorio import repositorio_clientes
+
+log = obter_logger("visoes_solicitacoes")
+
+VISOES = ("cpf", "dia", "faixa")
+SEM_FAIXA = "sem faixa"
+
+# Bytes do log lidos por vez na atualização (limita a memória numa primeira carga grande)
+BLOCO_LEITURA = 32 * 1024 * 1024
+
+
+class VisoesSolicitacoes:
+    """Agregados do log de solicitações por CPF, dia e faixa de score, atualizados por offset."""
+
+    def __init__(self, caminho_db: str, registro=registro_solicitacoes,
+                 repositorio=repositorio_clientes, politica=politica_limite):
+        self.caminho_db = caminho_db
+        self.registro = registro
+        self.repositorio = repositorio
+        self.politica = politica
+        self._local = threading.local()
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.caminho_db) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.caminho_db, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._criar_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    def _criar_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS visoes (
+                visao TEXT NOT NULL,
+                chave TEXT NOT NULL,
+                pedidos INTEGER NOT NULL,
+                aprovados INTEGER NOT NULL,
+                soma_solicitado REAL NOT NULL,
+                PRIMARY KEY (visao, chave)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS posicao (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                inode INTEGER NOT NULL,
+                offset INTEGER NOT NULL
+            )
+        """)
+
+    # --- Atualização incremental ---
+    def _faixas(self, cpfs) -> np.ndarray:
+        encontrados, valores = self.repositorio.buscar_lote(cpfs, ["score_atual"])
+        tabela = self.politica.obter()
+        indices = np.full(len(cpfs), -1, dtype=np.int64)
+        scores = pd.to_numeric(pd.Series(valores["score_atual"]), errors="coerce").to_numpy(dtype=float)
+        indices[encontrados] = tabela.faixas_lote(scores)
+        rotulos = np.array([f"{mn:g}-{mx:g}" for mn, mx, _ in tabela.faixas] + [SEM_FAIXA], dtype=object)
+        return rotulos[indices]  # índice -1 aponta para o SEM_FAIXA do final
+
+    def _agregar(self, conn, dados: bytes, pular_cabecalho: bool) -> int:
+        df = pd.read_csv(io.BytesIO(dados), header=None, names=self.registro.colunas, dtype=str,
+                         keep_default_na=False, skiprows=1 if pular_cabecalho else 0)
+        if df.empty:
+            return 0
+        df["aprovados"] = (df["status_pedido"] == "aprovado").astype(int)
+        df["soma_solicitado"] = pd.to_numeric(df["novo_limite_solicitado"], errors="coerce").fillna(0.0)
+        df["cpf"] = df["cpf_cliente"]
+        df["dia"] = df["data_hora_solicitacao"].str[:10]
+        df["faixa"] = self._faixas(df["cpf"].tolist())
+
+        linhas = []
+        for visao in VISOES:
+            grupos = df.groupby(visao).agg(pedidos=("aprovados", "size"), aprovados=("aprovados", "sum"),
+                                          soma_solicitado=("soma_solicitado", "sum"))
+            linhas += [(visao, chave, int(g.pedidos), int(g.aprovados), float(g.soma_solicitado))
+                       for chave, g in zip(grupos.index, grupos.itertuples(index=False))]
+        conn.executemany(
+            """
+            INSERT INTO visoes (visao, chave, pedidos, aprovados, soma_solicitado) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(visao, chave) DO UPDATE SET
+                pedidos = pedidos + excluded.pedidos,
+                aprovados = aprovados + excluded.aprovados,
+                soma_solicitado = soma_solicitado + excluded.soma_solicitado
+            """,
+            linhas,
+        )
+        return len(df)
+
+    def _ler_desde(self, conn, arquivo, offset: int) -> int:
+        """Agrega as linhas completas do arquivo aberto a partir de `offset`; devolve o novo offset."""
+        arquivo.seek(offset)
+        resto = b""
+        while True:
+            bloco = arquivo.read(BLOCO_LEITURA)
+            if not bloco:
+                break
+            dados = resto + bloco
+            # Só até o último '\n': uma linha sendo escrita agora fica para a próxima atualização
+            fim = dados.rfind(b"\n") + 1
+            if fim:
+                self._agregar(conn, dados[:fim], pular_cabecalho=offset == 0)
+                offset += fim
+            resto = dados[fim:]
+        return offset
+
+    def _ler_segmentos(self, conn, segmentos, offset_primeiro: int = 0):
+        for i, segmento in enumerate(segmentos):
+            with open(segmento, "rb") as arquivo:
+                self._ler_desde(conn, arquivo, offset_primeiro if i == 0 else 0)
+
+    def _segmentos_fechados(self, inode_ativo: int) -> list:
+        # O arquivo ativo que já abrimos pode ter sido rotacionado depois: ele é lido à parte
+        return [s for s in self.registro.listar_segmentos()
+                if s != self.registro.caminho and os.stat(s).st_ino != inode_ativo]
+
+    def _ler_historico_fechado(self, conn, inode_ativo: int):
+        """Primeira carga: segmentos fechados (inclusive os mensais compactados) lidos por inteiro."""
+        for compactado in sorted(glob.glob(os.path.join(self.registro.dir_segmentos, "*.csv.gz"))):
+            with gzip.open(compactado, "rb") as arquivo:
+                # Só o primeiro membro de cada arquivo mensal tem cabeçalho
+                self._agregar(conn, arquivo.read(), pular_cabecalho=True)
+        self._ler_segmentos(conn, self._segmentos_fechados(inode_ativo))
+
+    def atualizar(self):
+        """Lê o que foi anexado ao log desde a última atualização."""
+        try:
+            ativo = open(self.registro.caminho, "rb")
+        except FileNotFoundError:
+            return
+        conn = self._conexao()
+        with ativo:
+            # Inode do arquivo já aberto: uma rotação durante a leitura não embaralha o offset
+            inode_ativo = os.fstat(ativo.fileno()).st_ino
+            # BEGIN IMMEDIATE: outro processo atualizando espera, e lê o offset já avançado
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                posicao = conn.execute("SELECT inode, offset FROM posicao WHERE id = 1").fetchone()
+                if posicao is None:
+                    self._ler_historico_fechado(conn, inode_ativo)
+                    offset = 0
+                else:
+                    inode, offset = posicao
+                    if inode != inode_ativo:
+                        # O arquivo lido antes foi rotacionado: termina o segmento (e os fechados depois dele)
+                        fechados = self._segmentos_fechados(inode_ativo)
+                        inodes = [os.stat(s).st_ino for s in fechados]
+                        if inode in inodes:
+                            self._ler_segmentos(conn, fechados[inodes.index(inode):], offset)
+                        else:
+                            log.warning("Segmento rotacionado não encontrado; linhas podem ter ficado fora das visões",
+                                        extra={"campos": {"inode": inode}})
+                        offset = 0
+                offset = self._ler_desde(conn, ativo, offset)
+                conn.execute("INSERT OR REPLACE INTO posicao (id, inode, offset) VALUES (1, ?, ?)",
+                             (inode_ativo, offset))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # --- Consultas ---
+    @staticmethod
+    def _linha(chave, pedidos, aprovados, soma_solicitado) -> dict:
+        return {
+            "chave": chave,
+            "pedidos": pedidos,
+            "aprovados": aprovados,
+            "taxa_aprovacao": round(aprovados / pedidos, 4) if pedidos else 0.0,
+            "media_solicitada": round(soma_solicitado / pedidos, 2) if pedidos else 0.0,
+        }
+
+    def consultar(self, visao: str, chave: str):
+        """Agregado de uma chave (ex: visao="cpf", chave="12345678900"); None se não houver pedidos."""
+        if visao not in VISOES:
+            raise ValueError(f"Visão desconhecida: {visao}")
+        self.atualizar()
+        linha = self._conexao().execute(
+            "SELECT chave, pedidos, aprovados, soma_solicitado FROM visoes WHERE visao = ? AND chave = ?",
+            (visao, chave),
+        ).fetchone()
+        return None if linha is None else self._linha(*linha)
+
+    def listar(self, visao: str, limite: int = 50) -> list:
+        """Chaves de uma visão: por CPF, os que mais pediram; por dia e faixa, em ordem de chave."""
+        if visao not in VISOES:
+            raise ValueError(f"Visão desconhecida: {visao}")
+        self.atualizar()
+        ordem = "pedidos DESC, chave" if visao == "cpf" else "chave"
+        linhas = self._conexao().execute(
+            f"SELECT chave, pedidos, aprovados, soma_solicitado FROM visoes WHERE visao = ? ORDER BY {ordem} LIMIT ?",
+            (visao, limite),
+        ).fetchall()
+        return [self._linha(*linha) for linha in linhas]
+
+
+visoes_solicitacoes = VisoesSolicitacoes(SOLICITACOES_VISOES_DB)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Consulta as visões agregadas do log de solicitações.")
+    parser.add_argument("--visao", choices=VISOES, default="dia")
+    parser.add_argument("--cpf", help="Agregado de um CPF (atalho para --visao cpf com a chave).")
+    parser.add_argument("--limite", type=int, default=50)
+    args = parser.parse_args()
+
+    linhas = ([visoes_solicitacoes.consultar("cpf", args.cpf)] if args.cpf
+              else visoes_solicitacoes.listar(args.visao, args.limite))
+    linhas = [linha for linha in linhas if linha is not None]
+    print(pd.DataFrame(linhas).to_string(index=False) if linhas else "Nenhum pedido registrado.")
@@ -0,0 +1,24 @@
+# tests/conftest.py
+# Os módulos de src/ leem os caminhos do config no import: antes de qualquer import, a suíte
+# aponta BANCO_DATA_DIR para uma cópia de data/ (os CSVs versionados nunca são alterados).
+import os
+import shutil
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+_DADOS = tempfile.mkdtemp(prefix="banco_testes_")
+for _nome in ("clientes.csv", "score_limite.csv", "solicitacoes_aumento_limite.csv", "cotacoes.csv"):
+    shutil.copy(os.path.join(RAIZ, "data", _nome), _DADOS)
+os.environ["BANCO_DATA_DIR"] = _DADOS
+os.environ.setdefault("OPENAI_API_KEY", "sk-testes")
+os.environ.setdefault("COTACOES_PROVEDOR", "arquivo")
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def dados_dir():
+    return _DADOS
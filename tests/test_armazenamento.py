@@ -0,0 +1,41 @@
+import pandas as pd
+
+from src.armazenamento import ArmazemClientes
+from src.repositorio import RepositorioClientes
+
+
+def _base(tmp_path, cpf="987.654.321-00"):
+    caminho = tmp_path / "clientes.csv"
+    pd.DataFrame({
+        "cpf": [cpf], "nome": ["Maria Oliveira"], "data_nascimento": ["1985-05-15"],
+        "score_atual": ["800"], "renda_mensal": ["8000.0"], "limite_atual": ["5000.0"],
+    }).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+def test_alteracao_aplicada_a_cpf_pontuado_na_base(tmp_path):
+    armazem = ArmazemClientes(str(tmp_path / "alteracoes.db"))
+    repositorio = RepositorioClientes(_base(tmp_path), armazem=armazem)
+
+    assert armazem.atualizar_score("98765432100", 640) == 1
+    assert repositorio.buscar("98765432100")["score_atual"] == "640"
+    assert repositorio.perfil("987.654.321-00")[1] == 1
+    encontrados, valores = repositorio.buscar_lote(["98765432100"], ["score_atual"])
+    assert encontrados.tolist() == [True] and valores["score_atual"].tolist() == ["640"]
+
+
+def test_escrita_com_cpf_pontuado_usa_a_mesma_chave(tmp_path):
+    armazem = ArmazemClientes(str(tmp_path / "alteracoes.db"))
+    armazem.atualizar_limite("987.654.321-00", 6000.0)
+    assert armazem.atualizar_score("98765432100", 700) == 2
+    assert armazem.buscar("987.654.321-00") == {"versao": 2, "score_atual": "700", "limite_atual": "6000.0"}
+
+
+def test_consolidar_casa_cpf_pontuado(tmp_path):
+    caminho = _base(tmp_path)
+    armazem = ArmazemClientes(str(tmp_path / "alteracoes.db"))
+    armazem.atualizar_score("98765432100", 640)
+    assert armazem.consolidar(caminho) == 1
+    df = pd.read_csv(caminho, dtype=str)
+    assert df.loc[0, "cpf"] == "987.654.321-00" and df.loc[0, "score_atual"] == "640"
+    assert armazem.buscar("98765432100") is None
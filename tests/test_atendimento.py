@@ -0,0 +1,28 @@
+from langchain_core.messages import AIMessageChunk
+from langgraph.constants import TAG_NOSTREAM
+
+from src.atendimento import Turno
+
+
+def test_tokens_de_chamada_nostream_nao_sao_exibidos():
+    turno = Turno()
+    rotulo = AIMessageChunk(content="CREDITO", id="classificador")
+    resposta = AIMessageChunk(content="Seu limite é", id="credito")
+
+    assert turno.processar("messages", (rotulo, {"langgraph_node": "triagem", "tags": [TAG_NOSTREAM]})) == []
+    eventos = turno.processar("messages", (resposta, {"langgraph_node": "credito", "tags": []}))
+    assert eventos == [{"tipo": "token", "conteudo": "Seu limite é", "reiniciar": True}]
+
+
+def test_classificador_da_triagem_fora_do_stream():
+    from bench.llm_falso import ChatFalso
+    from src import graph, nodes
+    from src.atendimento import executar_turno
+
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    app = graph.obter_app()
+    list(executar_turno(app, "teste-classificador", "98765432100 1985-05-15"))
+    eventos = list(executar_turno(app, "teste-classificador", "preciso de ajuda com uma coisa"))
+
+    tokens = [e["conteudo"] for e in eventos if e["tipo"] == "token"]
+    assert tokens and not any(t.strip() in {"CREDITO", "CAMBIO", "ENTREVISTA", "TRIAGEM"} for t in tokens)
@@ -0,0 +1,109 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import cache_llm
+from src.cache_llm import CacheRespostas
+
+PROMPT = "Você é a Bia do Banco Ágil."
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(cache_llm.time, "monotonic", relogio)
+    return relogio
+
+
+class EmbeddingsContados:
+    """Dois vetores fixos (fala de dólar ou não) e a contagem das chamadas."""
+
+    def __init__(self):
+        self.chamadas = []
+
+    def embed_query(self, texto):
+        self.chamadas.append(texto)
+        return [1.0, 0.0] if "dolar" in texto else [0.0, 1.0]
+
+
+def _conversa(*textos):
+    return [HumanMessage(content=t) if i % 2 == 0 else AIMessage(content=t) for i, t in enumerate(textos)]
+
+
+@pytest.mark.parametrize("texto", ["meu cpf é 987.654.321-00", "nasci em 15/05/1985", "quero R$ 5000 de limite"])
+def test_dado_sensivel_sem_escopo_nunca_entra_nem_sai(texto):
+    cache = CacheRespostas()
+    mensagens = _conversa(texto)
+    cache.guardar("triagem", PROMPT, mensagens, AIMessage(content="ok"))
+    assert cache.obter("triagem", PROMPT, mensagens) is None
+    assert cache._itens == {}
+    assert cache.estatisticas["ignorados"] == 1
+
+    # Com escopo (CPF da sessão) a mesma conversa pode ser guardada
+    cache.guardar("triagem", PROMPT, mensagens, AIMessage(content="ok"), escopo="98765432100")
+    assert cache.obter("triagem", PROMPT, mensagens, escopo="98765432100").content == "ok"
+
+
+def test_resposta_com_dado_sensivel_sem_escopo_nao_e_guardada():
+    cache = CacheRespostas()
+    mensagens = _conversa("qual o horário de atendimento?")
+    cache.guardar("triagem", PROMPT, mensagens, AIMessage(content="Seu limite é R$ 5000"))
+    assert cache.obter("triagem", PROMPT, mensagens) is None
+
+
+def test_ttl_expira(relogio):
+    cache = CacheRespostas(ttl=10)
+    mensagens = _conversa("oi")
+    cache.guardar("triagem", PROMPT, mensagens, AIMessage(content="olá"))
+    relogio.agora += 9
+    assert cache.obter("triagem", PROMPT, mensagens).content == "olá"
+    relogio.agora += 2
+    assert cache.obter("triagem", PROMPT, mensagens) is None
+
+
+def test_despejo_lru(relogio):
+    cache = CacheRespostas(max_itens=2)
+    for texto in ("a", "b"):
+        cache.guardar("triagem", PROMPT, _conversa(texto), AIMessage(content=texto.upper()))
+    cache.obter("triagem", PROMPT, _conversa("a"))  # "a" vira o mais recente
+    cache.guardar("triagem", PROMPT, _conversa("c"), AIMessage(content="C"))
+
+    assert cache.obter("triagem", PROMPT, _conversa("b")) is None
+    assert cache.obter("triagem", PROMPT, _conversa("a")).content == "A"
+    assert cache.obter("triagem", PROMPT, _conversa("c")).content == "C"
+
+
+def test_escopo_e_janela_de_mensagens_nao_colidem():
+    cache = CacheRespostas(max_mensagens=4)
+    mensagens = _conversa("oi", "olá", "tudo bem?", "tudo", "e o limite?")
+    cache.guardar("credito", PROMPT, mensagens, AIMessage(content="A"), escopo="11111111111")
+
+    assert cache.obter("credito", PROMPT, mensagens, escopo="22222222222") is None
+    assert cache.obter("credito", PROMPT, mensagens) is None
+    assert cache.obter("cambio", PROMPT, mensagens, escopo="11111111111") is None
+    # Só as 4 últimas entram na chave: mudar a 1ª não importa, mudar uma das 4 importa
+    assert cache.obter("credito", PROMPT, _conversa("ei", *[m.content for m in mensagens[1:]]),
+                       escopo="11111111111").content == "A"
+    assert cache.obter("credito", PROMPT, _conversa("oi", "olá", "tudo mal?", "tudo", "e o limite?"),
+                       escopo="11111111111") is None
+
+
+def test_miss_semantico_calcula_o_vetor_uma_vez():
+    embeddings = EmbeddingsContados()
+    cache = CacheRespostas(embeddings=embeddings, limiar_similaridade=0.9)
+    cache.guardar("cambio", PROMPT, _conversa("cotacao do dolar"), AIMessage(content="D"))
+    assert len(embeddings.chamadas) == 1
+
+    nova = _conversa("cotacao do euro")
+    assert cache.obter("cambio", PROMPT, nova) is None
+    cache.guardar("cambio", PROMPT, nova, AIMessage(content="E"))
+    assert len(embeddings.chamadas) == 2
+
+    assert cache.obter("cambio", PROMPT, _conversa("quanto esta o dolar")).content == "D"
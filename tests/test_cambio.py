@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.cambio import (
+    CacheCotacoes,
+    Cotacao,
+    CotacaoIndisponivel,
+    ProvedorArquivo,
+    ProvedorComReserva,
+    ProvedorCotacoes,
+)
+
+
+class ProvedorForaDoAr(ProvedorCotacoes):
+    nome = "http"
+
+    def cotar(self, moeda, base):
+        raise CotacaoIndisponivel("fora do ar")
+
+
+def test_reserva_do_arquivo_quando_a_api_falha(dados_dir):
+    provedor = ProvedorComReserva(ProvedorForaDoAr(), ProvedorArquivo(f"{dados_dir}/cotacoes.csv"))
+    cotacao = provedor.cotar("USD", "BRL")
+    assert cotacao.moeda == "USD" and cotacao.venda > 0
+    with pytest.raises(CotacaoIndisponivel):
+        provedor.cotar("XYZ", "BRL")
+
+
+class ProvedorContado(ProvedorCotacoes):
+    """Segura a consulta até todas as threads chegarem e conta as idas ao provedor."""
+    nome = "contado"
+
+    def __init__(self, falhas=0):
+        self.chamadas = 0
+        self.falhas = falhas
+        self.liberar = threading.Event()
+
+    def cotar(self, moeda, base):
+        self.chamadas += 1
+        self.liberar.wait(5)
+        if self.chamadas <= self.falhas:
+            raise CotacaoIndisponivel("instável")
+        return Cotacao(moeda, base, 5.0, 5.1, "2026-10-18", self.nome)
+
+
+def test_pedidos_simultaneos_do_mesmo_par_vao_uma_vez_ao_provedor():
+    provedor = ProvedorContado()
+    cache = CacheCotacoes(provedor, ttl=60)
+    threads = 16
+
+    with ThreadPoolExecutor(threads) as executor:
+        futuros = [executor.submit(cache.obter, "usd", "brl") for _ in range(threads)]
+        # Todos os pedidos entram antes da primeira consulta terminar
+        limite = time.monotonic() + 5
+        while cache.estatisticas["misses"] + cache.estatisticas["coalescidos"] < threads and time.monotonic() < limite:
+            time.sleep(0.001)
+        provedor.liberar.set()
+        cotacoes = [f.result(timeout=5) for f in futuros]
+
+    assert provedor.chamadas == 1
+    assert all(c is cotacoes[0] for c in cotacoes)
+    assert cache.estatisticas == {"hits": 0, "misses": 1, "coalescidos": threads - 1, "erros": 0}
+    assert cache.obter("USD") is cotacoes[0] and provedor.chamadas == 1
+
+
+def test_falha_do_provedor_nao_fica_em_cache():
+    provedor = ProvedorContado(falhas=1)
+    provedor.liberar.set()
+    cache = CacheCotacoes(provedor, ttl=60)
+
+    with pytest.raises(CotacaoIndisponivel):
+        cache.obter("EUR")
+    assert cache.obter("EUR").venda == 5.1
+    assert provedor.chamadas == 2
+    assert cache.estatisticas["erros"] == 1
@@ -0,0 +1,54 @@
+import pytest
+
+from src import entrevista
+
+
+@pytest.mark.parametrize("texto, valor", [("R$ 5.000,00", 5000.0), ("5 mil", 5000.0), ("1200", 1200.0)])
+def test_interpretar_valor(texto, valor):
+    assert entrevista.interpretar_valor(texto) == valor
+
+
+@pytest.mark.parametrize("funcao, texto, esperado", [
+    (entrevista.interpretar_emprego, "formal", "formal"),
+    (entrevista.interpretar_emprego, "sou autônomo", "autônomo"),
+    (entrevista.interpretar_inteiro, "2 dependentes", 2),
+    (entrevista.interpretar_sim_nao, "não", False),
+    (entrevista.interpretar_sim_nao, "sim", True),
+    (entrevista.interpretar_sim_nao, "talvez", None),
+])
+def test_interpretadores(funcao, texto, esperado):
+    assert funcao(texto) == esperado
+
+
+def test_resposta_nao_entendida_nao_avanca():
+    progresso = entrevista.iniciar()
+    progresso, entendeu = entrevista.registrar_resposta(progresso, "sei lá")
+    assert not entendeu and progresso["etapa"] == 0
+
+    progresso, entendeu = entrevista.registrar_resposta(progresso, "R$ 3.500,00")
+    assert entendeu and progresso["etapa"] == 1
+    assert progresso["respostas"]["renda_mensal"] == 3500.0
+
+
+def _concluida():
+    respostas = {"renda_mensal": 5000.0, "despesas_fixas": 1000.0, "tipo_emprego": "formal",
+                 "dependentes": 0, "tem_dividas": False}
+    return {"etapa": len(entrevista.PERGUNTAS), "respostas": respostas, "tentativas": 0}
+
+
+def test_entrevista_concluida_sem_score_retoma_o_recalculo():
+    from bench.llm_falso import ChatFalso
+    from src import graph, nodes
+    from src.atendimento import executar_turno
+
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    app = graph.obter_app()
+    config = graph.config_sessao("entrevista-interrompida")
+    list(executar_turno(app, "entrevista-interrompida", "98765432100 1985-05-15"))
+    # Checkpoint de um turno que caiu depois da última resposta e antes da tool
+    app.update_state(config, {"temp_entrevista": _concluida()})
+
+    fim = list(executar_turno(app, "entrevista-interrompida", "oi, e aí?"))[-1]
+
+    assert fim["resposta"].startswith("Prontinho! Seu novo score é")
+    assert app.get_state(config).values["temp_entrevista"] is None
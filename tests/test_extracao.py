@@ -0,0 +1,40 @@
+import pytest
+
+from src.extracao import Credenciais, cpf_valido, extrair_credenciais
+
+
+@pytest.mark.parametrize("cpf, esperado", [
+    ("98765432100", True),
+    ("12345678909", True),
+    ("12345678900", False),
+    ("11111111111", False),
+    ("1234567890", False),
+])
+def test_cpf_valido(cpf, esperado):
+    assert cpf_valido(cpf) is esperado
+
+
+@pytest.mark.parametrize("texto", [
+    "meu cpf é 987.654.321-00 e nasci em 15/05/1985",
+    "98765432100 1985-05-15",
+    "cpf 987 654 321 00, nascimento 15 de maio de 1985.",
+])
+def test_extrai_cpf_e_data(texto):
+    credenciais = extrair_credenciais(texto)
+    assert credenciais.cpfs_validos == ["98765432100"]
+    assert credenciais.datas == ["1985-05-15"]
+    assert credenciais.completas
+
+
+def test_digitos_de_data_nao_viram_cpf():
+    assert extrair_credenciais("nasci em 15/05/1985").cpfs == []
+
+
+def test_cpf_com_digito_errado_nao_usa_o_atalho():
+    credenciais = extrair_credenciais("12345678900 1985-05-15")
+    assert credenciais.cpfs == ["12345678900"] and not credenciais.completas
+
+
+def test_completar_com_a_mensagem_anterior():
+    atual = Credenciais(cpfs=[], datas=["1985-05-15"])
+    assert atual.completar(extrair_credenciais("meu cpf: 98765432100")).completas
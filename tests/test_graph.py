@@ -0,0 +1,109 @@
+import asyncio
+
+from src import graph
+
+
+def test_obter_app_async_monta_uma_vez_com_chamadas_simultaneas():
+    async def cenario():
+        apps = await asyncio.gather(*(graph.obter_app_async() for _ in range(8)))
+        try:
+            assert all(app is apps[0] for app in apps)
+        finally:
+            await graph.fechar_app_async()
+
+    asyncio.run(cenario())
+
+
+def test_obter_app_sincrono_e_singleton():
+    assert graph.obter_app() is graph.obter_app() is graph.app
+
+
+def test_validacao_direta_async_nao_bloqueia_o_event_loop(monkeypatch):
+    import time
+
+    from bench.llm_falso import ChatFalso
+    from src import nodes
+    from src.atendimento import aexecutar_turno
+    from src.tools import validar_cpf
+
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    original = validar_cpf.func
+
+    def validar_lento(*args, **kwargs):
+        time.sleep(0.3)  # consulta lenta à base
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(validar_cpf, "func", validar_lento)
+
+    async def cenario():
+        app = await graph.obter_app_async()
+        batidas = 0
+        terminou = asyncio.Event()
+
+        async def relogio():
+            nonlocal batidas
+            while not terminou.is_set():
+                batidas += 1
+                await asyncio.sleep(0.01)
+
+        async def turno():
+            try:
+                return [evento async for evento in aexecutar_turno(app, "validacao-async", "98765432100 1985-05-15")]
+            finally:
+                terminou.set()
+
+        try:
+            eventos, _ = await asyncio.gather(turno(), relogio())
+        finally:
+            await graph.fechar_app_async()
+        return eventos, batidas
+
+    eventos, batidas = asyncio.run(cenario())
+    assert eventos[-1]["resposta"].startswith("Prontinho")
+    assert batidas >= 10
+
+
+def test_tools_do_mesmo_hop_leem_a_mesma_versao_com_escrita_concorrente(monkeypatch):
+    import threading
+
+    from langchain_core.messages import AIMessage, ToolMessage
+
+    from bench.llm_falso import ChatFalso
+    from src import nodes
+    from src.armazenamento import armazem_clientes
+    from src.repositorio import repositorio_clientes
+    from src.tools import consultar_limite
+
+    cpf = "12345678900"
+    original = consultar_limite.func
+    primeira = threading.Lock()
+    escrita_feita = threading.Event()
+
+    def consultar_com_escrita(*args, **kwargs):
+        if primeira.acquire(blocking=False):
+            resultado = original(*args, **kwargs)
+            # Outra sessão grava o cliente enquanto a segunda tool do hop ainda vai ler
+            armazem_clientes.atualizar_limite(cpf, 7777.0)
+            escrita_feita.set()
+            return resultado
+        escrita_feita.wait(5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(consultar_limite, "func", consultar_com_escrita)
+    chamadas = [{"id": "c1", "name": "consultar_limite", "args": {"cpf": cpf}},
+                {"id": "c2", "name": "consultar_limite", "args": {"cpf": "123.456.789-00"}}]
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    app = graph.obter_app()
+    config = graph.config_sessao("snapshot-concorrente")
+    # Hop de tools pedido pelo crédito, retomado direto do checkpoint
+    app.update_state(config, {"messages": [AIMessage(content="", tool_calls=chamadas)]}, as_node="credito")
+    app.invoke(None, config)
+
+    mensagens = app.get_state(config).values["messages"]
+    resultados = [m.content for m in mensagens if isinstance(m, ToolMessage)]
+
+    assert escrita_feita.is_set()
+    assert len(resultados) == 2 and resultados[0] == resultados[1]
+    assert "7777" not in resultados[0]
+    # O hop seguinte (novo snapshot) já enxerga a escrita
+    assert float(repositorio_clientes.buscar(cpf)["limite_atual"]) == 7777.0
@@ -0,0 +1,49 @@
+import json
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src import guardas
+from src.config import LOGIN_MAX_TENTATIVAS
+
+
+def _validacao(sucesso):
+    return ToolMessage(content=json.dumps({"sucesso": sucesso}), name="validar_cpf", tool_call_id="v")
+
+
+def test_bloqueio_na_n_esima_falha_seguida():
+    estado = {}
+    for _ in range(LOGIN_MAX_TENTATIVAS - 1):
+        estado.update(guardas.contabilizar_login(estado, [_validacao(False)]))
+        assert not estado.get("bloqueado_ate")
+
+    estado.update(guardas.contabilizar_login(estado, [_validacao(False)]))
+    assert estado["bloqueado_ate"] > time.time() and estado["tentativas_falhas"] == 0
+
+    resposta, _ = guardas.controle_sessao({**estado, "messages": [HumanMessage(content="98765432100")]})
+    assert resposta is not None and "bloqueado" in resposta["messages"][0].content
+
+
+def test_sucesso_zera_as_falhas():
+    estado = {"tentativas_falhas": LOGIN_MAX_TENTATIVAS - 1}
+    assert guardas.contabilizar_validacoes(estado, [True]) == {"tentativas_falhas": 0, "bloqueado_ate": None}
+
+
+def test_erro_de_sistema_nao_conta_como_falha():
+    assert guardas.contabilizar_validacoes({"tentativas_falhas": 1}, [None]) == {"tentativas_falhas": 1}
+
+
+def test_memo_de_leituras_e_limpo_por_escrita():
+    leitura = {"name": "consultar_limite", "args": {"cpf": "1"}, "id": "a"}
+    escrita = {"name": "solicitar_aumento_limite", "args": {"cpf": "1", "novo_limite": 2}, "id": "b"}
+    memo = guardas.atualizar_memo({}, [leitura], [ToolMessage(content="limite 1000", tool_call_id="a")])
+
+    prontas, pendentes = guardas.separar_memoizadas([{**leitura, "id": "c"}, escrita], memo)
+    assert [m.content for m in prontas] == ["limite 1000"] and pendentes == [escrita]
+    assert guardas.atualizar_memo(memo, [escrita], [ToolMessage(content="ok", tool_call_id="b")]) == {}
+
+
+def test_repeticao_so_do_memo_encerra_o_turno():
+    repetida = ToolMessage(content="x", tool_call_id="c", additional_kwargs={"memo": True})
+    assert guardas.so_repeticoes({"messages": [AIMessage(content=""), repetida]})
+    assert not guardas.so_repeticoes({"messages": [AIMessage(content="")]})
@@ -0,0 +1,76 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.historico import PoliticaHistorico, estimar_tokens
+
+
+def _turno(n, resultado="x" * 40):
+    """Fala do cliente, tool call, resultado da tool e resposta final."""
+    return [
+        HumanMessage(content=f"pergunta {n} " + "p" * 80),
+        AIMessage(content="", tool_calls=[{"id": f"c{n}", "name": "consultar_limite", "args": {"cpf": "98765432100"}}]),
+        ToolMessage(content=resultado, tool_call_id=f"c{n}", name="consultar_limite"),
+        AIMessage(content=f"resposta {n} " + "r" * 80),
+    ]
+
+
+def _conversa(turnos, **kwargs):
+    return [m for n in range(turnos) for m in _turno(n, **kwargs)]
+
+
+def _politica(orcamento, **kwargs):
+    return PoliticaHistorico(orcamento_padrao=orcamento, max_chars_resumo=400, **kwargs)
+
+
+def test_janela_comeca_no_cliente_e_nao_separa_tool_call_do_resultado():
+    mensagens = _conversa(6)
+    # Orçamentos variados: o corte cai em qualquer posição do turno
+    for orcamento in range(150, 600, 7):
+        janela = _politica(orcamento).aplicar("credito", {"messages": mensagens}, "sistema").mensagens
+        assert isinstance(janela[0], HumanMessage)
+        ids_chamados = {c["id"] for m in janela if isinstance(m, AIMessage) for c in m.tool_calls}
+        ids_respondidos = {m.tool_call_id for m in janela if isinstance(m, ToolMessage)}
+        assert ids_chamados == ids_respondidos
+
+
+def test_ultima_fala_do_cliente_entra_mesmo_acima_do_orcamento():
+    mensagens = _conversa(3)
+    janela = _politica(1).aplicar("credito", {"messages": mensagens}, "sistema").mensagens
+    assert janela == mensagens[-4:]
+
+
+def test_resultados_de_tool_antigos_sao_encurtados():
+    mensagens = _conversa(3, resultado="y" * 1000)
+    janela = _politica(100_000, max_chars_tool=50).aplicar("credito", {"messages": mensagens}, "sistema").mensagens
+    tools = [m for m in janela if isinstance(m, ToolMessage)]
+
+    assert [len(m.content) for m in tools[:2]] == [len("y" * 50 + " …[resultado antigo omitido]")] * 2
+    assert tools[-1].content == "y" * 1000  # turno atual fica inteiro
+    assert estimar_tokens(janela) < estimar_tokens(mensagens)
+
+
+def test_resumo_avanca_sem_resumir_de_novo():
+    chamadas = []
+
+    def resumidor(anterior, novas):
+        chamadas.append(list(novas))
+        return f"{anterior}+{len(novas)}"
+
+    politica = _politica(250, resumidor=resumidor)
+    state = {"messages": _conversa(4)}
+    ctx = politica.aplicar("credito", state, "sistema")
+    resumo_ate = ctx.atualizacao["resumo_ate"]
+    assert resumo_ate > 0
+    assert chamadas == [state["messages"][:resumo_ate]]
+    assert ctx.atualizacao["resumo_historico"] in ctx.msg_sistema
+
+    # Mesma janela no turno seguinte: nada de novo para resumir
+    state.update(ctx.atualizacao)
+    assert politica.aplicar("credito", state, "sistema").atualizacao == {}
+    assert len(chamadas) == 1
+
+    # Mais turnos: só o trecho entre o resumo_ate anterior e o novo início é resumido
+    state["messages"] = state["messages"] + _conversa(2)
+    ctx = politica.aplicar("credito", state, "sistema")
+    assert ctx.atualizacao["resumo_ate"] > resumo_ate
+    assert chamadas[1] == state["messages"][resumo_ate:ctx.atualizacao["resumo_ate"]]
+    assert ctx.atualizacao["resumo_historico"].startswith(state["resumo_historico"])
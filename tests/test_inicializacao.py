@@ -0,0 +1,48 @@
+from src.config import INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA
+from src.inicializacao import Inicializacao
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 100.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_primeira_resposta_mede_o_turno_e_nao_o_tempo_ocioso():
+    relogio = Relogio()
+    inicializacao = Inicializacao(relogio=relogio)
+    relogio.agora += 3600  # página aberta uma hora antes do primeiro envio
+
+    inicio_turno = inicializacao.relogio()
+    relogio.agora += 1.5
+    relatorio = inicializacao.registrar_primeira_resposta(inicio_turno)
+
+    assert relatorio["tempos"]["primeira_resposta"] == 1.5
+    assert relatorio["estouros"] == {}
+    # Só a primeira resposta do processo é medida
+    assert inicializacao.registrar_primeira_resposta(inicio_turno) == {}
+
+
+def test_primeiro_turno_lento_estoura_o_orcamento():
+    relogio = Relogio()
+    inicializacao = Inicializacao(relogio=relogio)
+    inicio_turno = inicializacao.relogio()
+    relogio.agora += INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA + 1
+
+    relatorio = inicializacao.registrar_primeira_resposta(inicio_turno)
+    assert relatorio["estouros"] == {"primeira_resposta": INICIO_ORCAMENTO_PRIMEIRA_RESPOSTA}
+
+
+def test_tempo_ate_pronto_separado_da_primeira_resposta():
+    relogio = Relogio()
+    inicializacao = Inicializacao(relogio=relogio)
+    relogio.agora += 7  # import do app até o aquecimento terminar
+    inicializacao.aquecer(em_background=False)
+
+    inicio_turno = inicializacao.relogio()
+    relogio.agora += 0.5
+    tempos = inicializacao.registrar_primeira_resposta(inicio_turno)["tempos"]
+    assert tempos["aquecimento_concluido"] == 7.0
+    assert tempos["primeira_resposta"] == 0.5
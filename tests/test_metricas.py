@@ -0,0 +1,52 @@
+from src.metricas import RegistroMetricas
+
+
+def _linhas(texto, prefixo):
+    return [linha for linha in texto.splitlines() if linha.startswith(prefixo)]
+
+
+def test_histograma_exporta_buckets_cumulativos():
+    registro = RegistroMetricas()
+    histograma = registro.histograma("teste_duracao_segundos", "Duração.", buckets=(0.1, 0.5, 1.0))
+    for valor in (0.05, 0.1, 0.3, 0.7, 2.0):
+        histograma.observar(valor, no="credito")
+
+    texto = registro.exportar_prometheus()
+    assert "# HELP teste_duracao_segundos Duração." in texto
+    assert "# TYPE teste_duracao_segundos histogram" in texto
+    assert _linhas(texto, "teste_duracao_segundos_bucket") == [
+        'teste_duracao_segundos_bucket{no="credito",le="0.1"} 2',
+        'teste_duracao_segundos_bucket{no="credito",le="0.5"} 3',
+        'teste_duracao_segundos_bucket{no="credito",le="1.0"} 4',
+        'teste_duracao_segundos_bucket{no="credito",le="+Inf"} 5',
+    ]
+    assert _linhas(texto, "teste_duracao_segundos_count") == ['teste_duracao_segundos_count{no="credito"} 5']
+    soma = float(_linhas(texto, "teste_duracao_segundos_sum")[0].split()[-1])
+    assert abs(soma - 3.15) < 1e-9
+
+
+def test_bucket_infinito_igual_ao_count_em_cada_serie():
+    registro = RegistroMetricas()
+    histograma = registro.histograma("teste_latencia_segundos")
+    for i in range(30):
+        histograma.observar(i * 0.7, no="triagem" if i % 2 else "cambio")
+
+    texto = registro.exportar_prometheus()
+    for no in ("triagem", "cambio"):
+        inf = _linhas(texto, f'teste_latencia_segundos_bucket{{no="{no}",le="+Inf"}}')[0].split()[-1]
+        count = _linhas(texto, f'teste_latencia_segundos_count{{no="{no}"}}')[0].split()[-1]
+        assert inf == count == "15"
+        contagens = [int(l.split()[-1]) for l in _linhas(texto, f'teste_latencia_segundos_bucket{{no="{no}"')]
+        assert contagens == sorted(contagens)
+
+
+def test_rotulos_sao_escapados():
+    registro = RegistroMetricas()
+    contador = registro.contador("teste_total", "Contagem.")
+    contador.inc(erro='falhou "feio"\nem C:\\dados')
+    contador.inc(2, erro="simples")
+
+    assert _linhas(registro.exportar_prometheus(), "teste_total") == [
+        'teste_total{erro="falhou \\"feio\\"\\nem C:\\\\dados"} 1',
+        'teste_total{erro="simples"} 2',
+    ]
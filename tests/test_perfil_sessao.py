@@ -0,0 +1,64 @@
+import pytest
+from langchain_core.messages import ToolMessage
+
+from src import perfil_sessao
+from src.armazenamento import armazem_clientes
+
+CPF = "98765432100"
+
+
+@pytest.fixture
+def app():
+    from bench.llm_falso import ChatFalso
+    from src import graph, nodes
+
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    return graph.obter_app()
+
+
+def _limite_consultado(app, sessao, texto="Qual é o meu limite?"):
+    from src.atendimento import executar_turno
+    from src.graph import config_sessao
+
+    list(executar_turno(app, sessao, texto))
+    mensagens = app.get_state(config_sessao(sessao)).values["messages"]
+    resultado = next(m for m in reversed(mensagens) if isinstance(m, ToolMessage) and m.name == "consultar_limite")
+    return resultado.content
+
+
+def test_escrita_de_outra_sessao_invalida_o_perfil(app):
+    from src.atendimento import executar_turno
+    from src.graph import config_sessao
+
+    list(executar_turno(app, "perfil-a", f"{CPF} 1985-05-15"))
+    antes = _limite_consultado(app, "perfil-a")
+    versao_antes = app.get_state(config_sessao("perfil-a")).values["versao_cliente"]
+
+    # Outra sessão (ou o recálculo de scores) altera o cliente no armazém
+    armazem_clientes.atualizar_score(CPF, 100)
+    armazem_clientes.atualizar_limite(CPF, 99.0)
+
+    depois = _limite_consultado(app, "perfil-a")
+    assert antes != depois
+    assert "99.0" in depois and "100" in depois
+    assert app.get_state(config_sessao("perfil-a")).values["versao_cliente"] == versao_antes + 2
+
+    list(executar_turno(app, "perfil-b", f"{CPF} 1985-05-15"))
+    assert _limite_consultado(app, "perfil-b") == depois
+
+
+def test_conferir_versao_sem_mudanca_nao_recarrega():
+    estado = {"autenticado": True, "cpf": CPF, "dados_cliente": {"cpf": CPF}, "versao_cliente": armazem_clientes.versao(CPF)}
+    assert perfil_sessao.conferir_versao(estado) == {}
+    assert perfil_sessao.conferir_versao({**estado, "autenticado": False}) == {}
+    assert perfil_sessao.conferir_versao({**estado, "versao_cliente": -1})["versao_cliente"] == estado["versao_cliente"]
+
+
+def test_cpf_com_digito_verificador_invalido_ainda_autentica_pela_base(app):
+    from src.atendimento import executar_turno
+    from src.graph import config_sessao
+
+    # 12345678900 está na base, mas não passa no dígito verificador: segue pelo LLM + validar_cpf
+    list(executar_turno(app, "perfil-dv", "12345678900 1985-05-15"))
+    estado = app.get_state(config_sessao("perfil-dv")).values
+    assert estado["autenticado"] and estado["cpf"] == "12345678900"
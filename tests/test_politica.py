@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from src.politica import TabelaLimites, decidir_aumento
+
+
+def _tabela(linhas):
+    return TabelaLimites(pd.DataFrame(linhas, columns=["score_min", "score_max", "limite_maximo"]))
+
+
+def test_limite_por_faixa_e_fora_das_faixas():
+    tabela = _tabela([(0, 299, 0.0), (300, 499, 500.0), (500, 699, 2000.0)])
+    assert tabela.limite_maximo(300) == 500.0
+    assert tabela.limite_maximo(699) == 2000.0
+    assert tabela.limite_maximo(800) == 0.0 and tabela.faixa(800) == -1
+    assert tabela.limite_maximo(499.5) == 0.0  # entre faixas: mesmo filtro min <= score <= max
+
+
+def test_faixas_sobrepostas_vale_a_primeira_linha():
+    tabela = _tabela([(0, 500, 100.0), (400, 1000, 900.0)])
+    assert tabela.limite_maximo(450) == 100.0
+    assert tabela.limite_maximo(501) == 900.0
+
+
+def test_lote_igual_ao_escalar():
+    tabela = _tabela([(0, 299, 0.0), (300, 499, 500.0), (500, 699, 2000.0)])
+    scores = np.array([-5, 0, 299, 300, 450.5, 699, 700, np.nan])
+    esperado = [tabela.limite_maximo(s) if np.isfinite(s) else 0.0 for s in scores]
+    assert tabela.limites_maximos(scores).tolist() == esperado
+
+
+def test_decidir_aumento_escalar_e_lote():
+    assert decidir_aumento(500.0, 500.0) == "aprovado"
+    assert decidir_aumento(501.0, 500.0) == "rejeitado"
+    assert decidir_aumento(np.array([1.0, 3.0]), np.array([2.0, 2.0])).tolist() == ["aprovado", "rejeitado"]
+
+
+def test_decisao_em_lote_igual_a_regra_da_tool(dados_dir, tmp_path):
+    from src.decisao_lote import decidir_bloco
+    from src.repositorio import RepositorioClientes
+
+    tabela = TabelaLimites(pd.read_csv(f"{dados_dir}/score_limite.csv"))
+    # Limites de cada faixa, os vizinhos de fora e valores entre faixas
+    scores = sorted({s for minimo, maximo, _ in tabela.faixas
+                     for s in (minimo - 1, minimo, minimo + 0.5, maximo - 0.5, maximo, maximo + 0.5, maximo + 1)})
+    cpfs = [f"{i:011d}" for i in range(1, len(scores) + 1)]
+    pd.DataFrame({
+        "cpf": cpfs, "nome": "Cliente", "data_nascimento": "1990-01-01",
+        "score_atual": scores, "renda_mensal": 3000.0, "limite_atual": 1000.0,
+    }).to_csv(tmp_path / "clientes.csv", index=False)
+    repositorio = RepositorioClientes(str(tmp_path / "clientes.csv"), intervalo_verificacao=0)
+
+    pedidos, esperado = [], []
+    for cpf, score in zip(cpfs, scores):
+        maximo = tabela.limite_maximo(float(score))
+        for novo in {0.0, maximo - 0.01, maximo, maximo + 0.01, 60000.0}:
+            pedidos.append({"cpf": cpf, "novo_limite": str(novo)})
+            # Mesma sequência da tool solicitar_aumento_limite
+            esperado.append(decidir_aumento(novo, tabela.limite_maximo(float(score))))
+
+    decisoes = decidir_bloco(pd.DataFrame(pedidos), repositorio, tabela)
+    assert decisoes["status_pedido"].tolist() == esperado
+    assert {"aprovado", "rejeitado"} <= set(esperado)
@@ -0,0 +1,71 @@
+import csv
+import os
+import threading
+
+from src.registro_solicitacoes import COLUNAS_SOLICITACAO, RegistroSolicitacoes
+
+
+def _linha(i):
+    return {"cpf_cliente": f"{i:011d}", "data_hora_solicitacao": "2025-01-02T10:00:00",
+            "limite_atual": "1000.0", "novo_limite_solicitado": "1500.0", "status_pedido": "aprovado"}
+
+
+def _ler(caminho):
+    with open(caminho, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_cabecalho_so_no_arquivo_novo(tmp_path):
+    registro = RegistroSolicitacoes(str(tmp_path / "log.csv"))
+    registro.registrar(_linha(1))
+    registro.registrar_lote([_linha(2), _linha(3)])
+    linhas = _ler(registro.caminho)
+    assert linhas[0] == COLUNAS_SOLICITACAO
+    assert [l[0] for l in linhas[1:]] == ["00000000001", "00000000002", "00000000003"]
+
+
+def test_linha_parcial_de_um_crash_e_descartada(tmp_path):
+    registro = RegistroSolicitacoes(str(tmp_path / "log.csv"))
+    registro.registrar(_linha(1))
+    with open(registro.caminho, "ab") as arquivo:
+        arquivo.write(b"00000000002,2025-01-02T10:00:00,1000.0,15")  # escrita interrompida
+
+    registro.registrar(_linha(3))
+    linhas = _ler(registro.caminho)
+    assert [l[0] for l in linhas[1:]] == ["00000000001", "00000000003"]
+    assert all(len(l) == len(COLUNAS_SOLICITACAO) for l in linhas)
+
+
+def test_escritas_concorrentes_nao_se_misturam(tmp_path):
+    registro = RegistroSolicitacoes(str(tmp_path / "log.csv"), group_commit=True)
+    threads = [threading.Thread(target=registro.registrar, args=(_linha(i),)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    linhas = _ler(registro.caminho)[1:]
+    assert sorted(int(l[0]) for l in linhas) == list(range(50))
+
+
+def test_rotacao_por_tamanho_e_segmentos_em_ordem(tmp_path):
+    registro = RegistroSolicitacoes(str(tmp_path / "log.csv"), rotacao_bytes=300)
+    for i in range(10):
+        registro.registrar(_linha(i))
+
+    segmentos = registro.listar_segmentos()
+    assert len(segmentos) > 2 and segmentos[-1] == registro.caminho
+    cpfs = [l[0] for s in segmentos for l in _ler(s) if l[0] != "cpf_cliente"]
+    assert cpfs == [f"{i:011d}" for i in range(10)]
+    assert all(_ler(s)[0] == COLUNAS_SOLICITACAO for s in segmentos)
+
+
+def test_compactar_junta_segmentos_antigos(tmp_path):
+    registro = RegistroSolicitacoes(str(tmp_path / "log.csv"))
+    for i in range(3):
+        registro.registrar(_linha(i))
+        registro.rotacionar()
+    for segmento in registro.listar_segmentos():
+        os.utime(segmento, (0, 0))
+
+    assert registro.compactar(dias=7) == 3
+    assert registro.listar_segmentos() == []
@@ -0,0 +1,76 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.repositorio import RepositorioClientes
+from src.snapshot_clientes import IndiceSnapshot, exportar_snapshot
+
+
+def _gravar_base(caminho, nome):
+    pd.DataFrame({
+        "cpf": ["12345678900"], "nome": [nome], "data_nascimento": ["1990-01-01"],
+        "score_atual": ["500"], "renda_mensal": ["3000.0"], "limite_atual": ["1000.0"],
+    }).to_csv(caminho, index=False)
+
+
+def _mais_novo(caminho, referencia):
+    # Garante mtime estritamente maior mesmo em sistemas de arquivos com resolução grossa
+    instante = os.path.getmtime(referencia) + 2
+    os.utime(caminho, (instante, instante))
+
+
+@pytest.fixture
+def base(tmp_path):
+    csv = str(tmp_path / "clientes.csv")
+    pasta = str(tmp_path / "clientes_snapshot")
+    _gravar_base(csv, "João Silva")
+    exportar_snapshot(csv, pasta)
+    return csv, pasta
+
+
+def test_csv_editado_depois_do_snapshot_vence(base):
+    csv, pasta = base
+    repositorio = RepositorioClientes(csv, intervalo_verificacao=0, pasta_snapshot=pasta)
+    assert isinstance(repositorio.obter(), IndiceSnapshot)
+    assert repositorio.buscar("12345678900")["nome"] == "João Silva"
+
+    _gravar_base(csv, "Joana Silva")
+    _mais_novo(csv, os.path.join(pasta, "atual.json"))
+    assert repositorio.buscar("12345678900")["nome"] == "Joana Silva"
+    assert not isinstance(repositorio.obter(), IndiceSnapshot)
+
+
+def test_snapshot_reexportado_volta_a_ser_usado(base):
+    csv, pasta = base
+    _gravar_base(csv, "Joana Silva")
+    _mais_novo(csv, os.path.join(pasta, "atual.json"))
+    repositorio = RepositorioClientes(csv, intervalo_verificacao=0, pasta_snapshot=pasta)
+    assert not isinstance(repositorio.obter(), IndiceSnapshot)
+
+    exportar_snapshot(csv, pasta)
+    _mais_novo(os.path.join(pasta, "atual.json"), csv)
+    assert isinstance(repositorio.obter(), IndiceSnapshot)
+    assert repositorio.buscar("12345678900")["nome"] == "Joana Silva"
+
+
+def test_limite_inteiro_no_csv_nao_trunca_alteracao_decimal(base, tmp_path):
+    from src.armazenamento import ArmazemClientes
+
+    csv, pasta = base
+    pd.DataFrame({
+        "cpf": ["12345678900"], "nome": ["João"], "data_nascimento": ["1990-01-01"],
+        "score_atual": ["500"], "renda_mensal": ["3000"], "limite_atual": ["1000"],
+    }).to_csv(csv, index=False)
+    exportar_snapshot(csv, pasta)
+    _mais_novo(os.path.join(pasta, "atual.json"), csv)
+
+    armazem = ArmazemClientes(str(tmp_path / "armazem.db"))
+    armazem.atualizar_limite("12345678900", 2500.50)
+    repositorio = RepositorioClientes(csv, armazem=armazem, intervalo_verificacao=0, pasta_snapshot=pasta)
+    assert isinstance(repositorio.obter(), IndiceSnapshot)
+
+    cliente = repositorio.buscar("12345678900")
+    assert cliente["limite_atual"] == 2500.5
+    assert cliente["renda_mensal"] == 3000.0 and isinstance(cliente["renda_mensal"], float)
+    assert cliente["score_atual"] == 500 and isinstance(cliente["score_atual"], int)
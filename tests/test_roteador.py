@@ -0,0 +1,23 @@
+import pytest
+
+from src.roteador import decisao_rapida, intencao_da_resposta_llm
+
+
+@pytest.mark.parametrize("texto, intencao", [
+    ("quero ver meu limite", "credito"),
+    ("quero aumentar meu limite", "credito"),
+    ("quanto está o dólar hoje", "cambio"),
+    ("quero fazer a entrevista", "entrevista"),
+])
+def test_caminho_rapido_decide_sem_llm(texto, intencao):
+    decisao = decisao_rapida(texto, "")
+    assert decisao is not None and decisao.intencao == intencao and decisao.origem == "palavras"
+
+
+@pytest.mark.parametrize("texto", ["oi tudo bem", "preciso de ajuda com uma coisa"])
+def test_baixa_confianca_fica_para_o_classificador(texto):
+    assert decisao_rapida(texto, "") is None
+
+
+def test_rotulo_do_llm():
+    assert intencao_da_resposta_llm("CREDITO") == "credito"
@@ -0,0 +1,43 @@
+import itertools
+
+import pandas as pd
+
+from src.score import calcular_score, score_batch
+
+RENDAS = [0.0, 1500.0, 3000.0, 8000.5, 1_000_000.0, -50_000.0]
+DESPESAS = [-1.0, -3.0, 0.0, 500.0, 2999.5]
+EMPREGOS = ["formal", "Formal", "autônomo", "autonomo", "AUTONOMO", "desempregado", "estagiário"]
+DEPENDENTES = [0, 1, 2, 3, 7]
+DIVIDAS = [True, False]
+
+
+def _escalar(renda, despesas, emprego, dependentes, dividas):
+    try:
+        return calcular_score(renda, despesas, emprego, dependentes, dividas)
+    except ZeroDivisionError:
+        return None  # despesas = -1: a versão em lote marca a linha como inválida
+
+
+def test_score_batch_igual_a_calcular_score_linha_a_linha():
+    grade = list(itertools.product(RENDAS, DESPESAS, EMPREGOS, DEPENDENTES, DIVIDAS))
+    df = pd.DataFrame(grade, columns=["renda_mensal", "despesas_fixas", "tipo_emprego", "dependentes", "tem_dividas"])
+
+    lote = score_batch(df)
+    for linha, obtido in zip(grade, lote.tolist()):
+        esperado = _escalar(*linha)
+        assert (None if pd.isna(obtido) else obtido) == esperado, linha
+
+    # A grade passa pelas duas travas
+    assert {0, 1000} <= set(lote.dropna().tolist())
+
+
+def test_valores_invalidos_ficam_sem_score():
+    df = pd.DataFrame({
+        "renda_mensal": ["3000", "abc", "3000", "3000"],
+        "despesas_fixas": ["500", "500", "-1", "500"],
+        "tipo_emprego": ["formal"] * 4,
+        "dependentes": ["1", "1", "1", "x"],
+        "tem_dividas": ["sim", "não", "nao", "talvez"],
+    })
+    assert score_batch(df).isna().tolist() == [False, True, True, True]
+    assert score_batch(df).iloc[0] == calcular_score(3000.0, 500.0, "formal", 1, True)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import servico
+
+LOGIN = "98765432100 1985-05-15"
+
+
+@pytest.fixture
+def cliente():
+    from bench.llm_falso import ChatFalso
+    from src import nodes
+
+    nodes.runnables.configurar(ChatFalso(), ChatFalso())
+    with TestClient(servico.api) as cliente:
+        yield cliente
+
+
+def test_enviar_e_listar_mensagens(cliente):
+    resposta = cliente.post("/sessoes/api-a/mensagens", json={"texto": LOGIN})
+    assert resposta.status_code == 200
+    corpo = resposta.json()
+    assert corpo["sessao"] == "api-a" and corpo["resposta"].startswith("Prontinho")
+
+    cliente.post("/sessoes/api-a/mensagens", json={"texto": "Qual é o meu limite?"})
+    historico = cliente.get("/sessoes/api-a/mensagens").json()
+    assert historico["autenticado"] is True
+    assert [m["papel"] for m in historico["mensagens"]] == ["user", "assistant", "user", "assistant"]
+    assert historico["mensagens"][2]["conteudo"] == "Qual é o meu limite?"
+
+
+def test_sessao_nova_sem_mensagens(cliente):
+    assert cliente.get("/sessoes/api-vazia/mensagens").json() == {
+        "sessao": "api-vazia", "autenticado": False, "mensagens": []}
+
+
+def test_stream_ndjson(cliente):
+    cliente.post("/sessoes/api-stream/mensagens", json={"texto": LOGIN})
+    with cliente.stream("POST", "/sessoes/api-stream/stream", json={"texto": "Qual é o meu limite?"}) as resposta:
+        assert resposta.headers["content-type"].startswith("application/x-ndjson")
+        eventos = [json.loads(linha) for linha in resposta.iter_lines() if linha]
+
+    tipos = [evento["tipo"] for evento in eventos]
+    assert tipos[-1] == "fim" and tipos.count("fim") == 1
+    assert "etapa" in tipos
+    assert eventos[-1]["ultimo_agente"] == "credito"
+    assert "limite" in eventos[-1]["resposta"].lower()
+
+
+def test_websocket_um_turno_por_mensagem(cliente):
+    with cliente.websocket_connect("/sessoes/api-ws/ws") as ws:
+        for texto in (LOGIN, "Qual é o meu limite?"):
+            ws.send_json({"texto": texto})
+            eventos = []
+            while not eventos or eventos[-1]["tipo"] not in ("fim", "erro"):
+                eventos.append(ws.receive_json())
+            assert eventos[-1]["tipo"] == "fim"
+    assert eventos[-1]["ultimo_agente"] == "credito"
+
+
+def test_turnos_da_mesma_sessao_sao_serializados(cliente, monkeypatch):
+    original = servico.aexecutar_turno
+    ativos, maximo = {"api-lock": 0, "api-outra": 0}, {"api-lock": 0, "api-outra": 0}
+
+    async def turno_contado(app, sessao, texto):
+        ativos[sessao] += 1
+        maximo[sessao] = max(maximo[sessao], ativos[sessao])
+        try:
+            await asyncio.sleep(0.05)  # segura o turno para os envios se sobreporem
+            async for evento in original(app, sessao, texto):
+                yield evento
+        finally:
+            ativos[sessao] -= 1
+
+    monkeypatch.setattr(servico, "aexecutar_turno", turno_contado)
+    envios = [("api-lock", f"mensagem {i}") for i in range(4)] + [("api-outra", "oi")]
+    with ThreadPoolExecutor(len(envios)) as executor:
+        respostas = list(executor.map(
+            lambda envio: cliente.post(f"/sessoes/{envio[0]}/mensagens", json={"texto": envio[1]}), envios))
+
+    assert all(r.status_code == 200 for r in respostas)
+    assert maximo["api-lock"] == 1
+    # Cada turno leu o checkpoint do anterior: nenhuma fala se perdeu
+    falas = [m["conteudo"] for m in cliente.get("/sessoes/api-lock/mensagens").json()["mensagens"] if m["papel"] == "user"]
+    assert sorted(falas) == [f"mensagem {i}" for i in range(4)]
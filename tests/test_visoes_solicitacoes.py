@@ -0,0 +1,56 @@
+import pandas as pd
+
+from src.politica import politica_limite
+from src.registro_solicitacoes import RegistroSolicitacoes
+from src.repositorio import RepositorioClientes
+from src.visoes_solicitacoes import VisoesSolicitacoes
+
+
+def _pedido(cpf, status, valor, data="2025-01-02T10:00:00"):
+    return {"cpf_cliente": cpf, "data_hora_solicitacao": data, "limite_atual": "1000.0",
+            "novo_limite_solicitado": str(valor), "status_pedido": status}
+
+
+def _visoes(tmp_path):
+    base = tmp_path / "clientes.csv"
+    pd.DataFrame({
+        "cpf": ["12345678900", "98765432100"], "nome": ["João", "Maria"],
+        "data_nascimento": ["1990-01-01", "1985-05-15"], "score_atual": ["500", "800"],
+        "renda_mensal": ["3000.0", "8000.0"], "limite_atual": ["1000.0", "5000.0"],
+    }).to_csv(base, index=False)
+    registro = RegistroSolicitacoes(str(tmp_path / "solicitacoes.csv"))
+    visoes = VisoesSolicitacoes(str(tmp_path / "visoes.db"), registro, RepositorioClientes(str(base)), politica_limite)
+    return registro, visoes
+
+
+def test_visoes_incrementais_contam_cada_linha_uma_vez(tmp_path):
+    registro, visoes = _visoes(tmp_path)
+    registro.registrar_lote([_pedido("12345678900", "aprovado", 1500), _pedido("12345678900", "rejeitado", 9000)])
+    assert visoes.consultar("cpf", "12345678900") == {
+        "chave": "12345678900", "pedidos": 2, "aprovados": 1, "taxa_aprovacao": 0.5, "media_solicitada": 5250.0,
+    }
+
+    registro.registrar(_pedido("98765432100", "aprovado", 6000, data="2025-01-03T09:00:00"))
+    visoes.atualizar()
+    assert visoes.consultar("cpf", "12345678900")["pedidos"] == 2
+    assert [linha["chave"] for linha in visoes.listar("dia")] == ["2025-01-02", "2025-01-03"]
+
+
+def test_visoes_continuam_depois_da_rotacao(tmp_path):
+    registro, visoes = _visoes(tmp_path)
+    registro.registrar(_pedido("12345678900", "aprovado", 1500))
+    visoes.atualizar()
+
+    registro.registrar(_pedido("12345678900", "aprovado", 1600))
+    registro.rotacionar()
+    registro.registrar(_pedido("12345678900", "rejeitado", 9000))
+    assert visoes.consultar("cpf", "12345678900")["pedidos"] == 3
+
+
+def test_linha_parcial_no_fim_do_log_fica_para_depois(tmp_path):
+    registro, visoes = _visoes(tmp_path)
+    registro.registrar(_pedido("12345678900", "aprovado", 1500))
+    with open(registro.caminho, "ab") as arquivo:
+        arquivo.write(b"98765432100,2025-01-02T11:00:00,5000.0,60")
+    assert visoes.consultar("cpf", "98765432100") is None
+    assert visoes.consultar("cpf", "12345678900")["pedidos"] == 1